@@ -0,0 +1,71 @@
+from django.contrib.auth.models import User
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from permissions.permissions import ROLES_CLAIM
+
+
+class LazyTokenUser(TokenUser):
+    """
+    Token-backed user: ``id``, ``username`` and ``roles`` come straight
+    from the access token claims. Any other attribute (``first_name``,
+    ``groups``, ``is_staff``, ...) loads the real ``User`` row on first
+    use and reads it from there.
+    """
+
+    @cached_property
+    def id(self):
+        # the claim is serialized as a string; give callers the real pk type
+        return User._meta.pk.to_python(self.token[jwt_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    @cached_property
+    def roles(self):
+        return self.token.get(ROLES_CLAIM, [])
+
+    @cached_property
+    def user(self):
+        return User.objects.get(pk=self.id)
+
+    @cached_property
+    def is_staff(self):
+        return self.user.is_staff
+
+    @cached_property
+    def is_superuser(self):
+        return self.user.is_superuser
+
+    @property
+    def groups(self):
+        return self.user.groups
+
+    @property
+    def user_permissions(self):
+        return self.user.user_permissions
+
+    def __getattr__(self, attr):
+        # only reached for names TokenUser itself does not define
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.user, attr)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Opt-in JWT authentication that skips the per-request ``User`` lookup.
+
+    Views using it must filter on ``request.user.id`` rather than passing
+    ``request.user`` to the ORM. Deactivating a user takes effect when their
+    access token expires, not immediately.
+    """
+
+    def get_user(self, validated_token):
+        super().get_user(validated_token)  # validates the user id claim
+        return LazyTokenUser(validated_token)
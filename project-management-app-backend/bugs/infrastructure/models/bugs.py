@@ -1,9 +1,11 @@
 from django.db import models
 from django.contrib.auth.models import User
 from projects.infrastructure.models.projects import PROJECT
+from core.infrastructure.models.tracking import LoadedStateMixin
+from core.infrastructure.models.versioning import VersionedMixin
 
 
-class BUG(models.Model):
+class BUG(LoadedStateMixin, VersionedMixin, models.Model):
 
     # -----------------------------
     # STATUS & SEVERITY
@@ -66,6 +68,8 @@ class BUG(models.Model):
     # META
     # -----------------------------
     deleted = models.BooleanField(default=False)
+    # bumped by every write; edits are conditional on it (optimistic locking)
+    version = models.PositiveIntegerField(default=1, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -76,6 +80,31 @@ class BUG(models.Model):
             models.Index(fields=["status"]),
             models.Index(fields=["severity"]),
             models.Index(fields=["project"]),
+            # DevBugListAPIView: assigned_to = ? AND NOT deleted
+            # ORDER BY -created_at, -id
+            models.Index(
+                fields=["assigned_to", "-created_at", "-id"],
+                condition=models.Q(deleted=False),
+                name="bug_assignee_live_idx",
+            ),
+            # PM and QA lists: one branch per project (and the reporter's),
+            # each seeking its own range in page order, merged by a UNION
+            models.Index(
+                fields=["reported_by", "-created_at", "-id"],
+                condition=models.Q(deleted=False),
+                name="bug_reporter_live_idx",
+            ),
+            models.Index(
+                fields=["project", "-created_at", "-id"],
+                condition=models.Q(deleted=False),
+                name="bug_project_live_idx",
+            ),
+            # SyncAPIView: project_id IN (...) AND (updated_at, id) > (?, ?)
+            # ORDER BY updated_at, id -- tombstones included
+            models.Index(
+                fields=["project", "updated_at", "id"],
+                name="bug_project_changes_idx",
+            ),
         ]
 
     def __str__(self):
@@ -1,5 +1,12 @@
 from rest_framework import serializers
+from rest_framework.settings import api_settings
+from core.signals import bulk_saved
+from core.infrastructure.models.versioning import update_if_current
+from core.lean import LeanSerializer, Nested, DateTime, lean_user
+from core.metrics import TimedSerializerMixin
 from django.contrib.auth.models import User
+from django.db.models import Exists, F, OuterRef, Q
+from django.utils import timezone
 from ...infrastructure.models.bugs import BUG
 from projects.infrastructure.models.projects import PROJECT
 
@@ -11,12 +18,14 @@ class SimpleUserSerializer(serializers.ModelSerializer):
         fields = ["id", "username", "name"]
 
 class BugCreateSerializer(serializers.ModelSerializer):
+    ASSIGNEE_ROLE = "Developer"
+
     project = serializers.PrimaryKeyRelatedField(
         queryset=PROJECT.objects.none()
     )
 
     assigned_to = serializers.PrimaryKeyRelatedField(
-        queryset=User.objects.filter(groups__name="Developer"),
+        queryset=User.objects.filter(groups__name=ASSIGNEE_ROLE),
         required=False,
         allow_null=True
     )
@@ -51,13 +60,188 @@ class BugCreateSerializer(serializers.ModelSerializer):
         )
         return bug
 
+class BugChangesSerializer(serializers.Serializer):
+    # the version the client last read; the write only applies to it
+    version = serializers.IntegerField(min_value=1)
+    status = serializers.ChoiceField(choices=BUG.Status.choices, required=False)
+    assigned_to = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        if attrs.keys() == {"version"}:
+            raise serializers.ValidationError("No changes given.")
+        return attrs
+
+
+class BugBulkUpdateSerializer(serializers.Serializer):
+    """
+    Input: {"<bug id>": {"version": ..., "status": ..., "assigned_to": ...}, ...}
+
+    The project's manager and QAs may change both fields (triage), the
+    assigned developer only the status. Permissions for the whole set are
+    checked with one query, assignee eligibility with another, and the
+    changes are applied with a single UPDATE conditional on every bug
+    still being at the version sent; save() raises StaleVersion, writing
+    nothing, when one has moved on. Errors are keyed by bug id.
+    """
+    MAX_ITEMS = 200
+
+    def to_internal_value(self, data):
+        if not isinstance(data, dict):
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    "Expected an object mapping bug ids to changes."
+                ]
+            })
+        if not data or len(data) > self.MAX_ITEMS:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f"Send between 1 and {self.MAX_ITEMS} bugs."
+                ]
+            })
+
+        changes, errors = {}, {}
+        for key, value in data.items():
+            item = BugChangesSerializer(data=value)
+            if not str(key).isdigit():
+                errors[key] = {
+                    api_settings.NON_FIELD_ERRORS_KEY: ["Invalid bug id."]
+                }
+            elif not item.is_valid():
+                errors[key] = item.errors
+            else:
+                changes[int(key)] = item.validated_data
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        user_id = self.context["request"].user.id
+        bugs = BUG.objects.filter(
+            pk__in=changes, deleted=False
+        ).annotate(
+            manager_id=F("project__project_manager_id"),
+            is_project_qa=Exists(
+                PROJECT.qas.through.objects.filter(
+                    project_id=OuterRef("project_id"), user_id=user_id
+                )
+            ),
+        ).filter(
+            Q(manager_id=user_id) | Q(is_project_qa=True) | Q(assigned_to_id=user_id)
+        )
+        bugs = {bug.pk: bug for bug in bugs}
+        eligible_assignees = set(
+            User.objects.filter(
+                id__in={
+                    change["assigned_to"] for change in changes.values()
+                    if change.get("assigned_to") is not None
+                },
+                groups__name=BugCreateSerializer.ASSIGNEE_ROLE,
+            ).values_list("id", flat=True)
+        )
+
+        does_not_exist = serializers.PrimaryKeyRelatedField.default_error_messages[
+            "does_not_exist"
+        ]
+        for pk, change in changes.items():
+            bug = bugs.get(pk)
+            if bug is None:
+                errors[str(pk)] = {
+                    api_settings.NON_FIELD_ERRORS_KEY: ["Not found."]
+                }
+                continue
+            if "assigned_to" not in change:
+                continue
+            assignee = change["assigned_to"]
+            if bug.manager_id != user_id and not bug.is_project_qa:
+                errors[str(pk)] = {
+                    "assigned_to": ["Only the project's PM or QA can reassign a bug."]
+                }
+            elif assignee is not None and assignee not in eligible_assignees:
+                errors[str(pk)] = {
+                    "assigned_to": [does_not_exist.format(pk_value=assignee)]
+                }
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return [(bugs[pk], change) for pk, change in changes.items()]
+
+    def save(self):
+        now = timezone.now()
+        fields = {"updated_at"}
+        bugs = []
+
+        for bug, change in self.validated_data:
+            bug.version = change["version"]
+            if "status" in change:
+                bug.status = change["status"]
+                fields.add("status")
+            if "assigned_to" in change:
+                bug.assigned_to_id = change["assigned_to"]
+                fields.add("assigned_to")
+            # queryset.update() skips auto_now
+            bug.updated_at = now
+            bugs.append(bug)
+
+        update_if_current(bugs, sorted(fields))
+        bulk_saved.send(sender=BUG, instances=bugs, created=False)
+        return bugs
+
+
+class BugUpdateSerializer(serializers.ModelSerializer):
+    """
+    PATCH one bug. ``version`` is the one the client read: the save is
+    conditional on it and raises StaleVersion when the bug has moved on.
+    The project's manager and QAs may change every field, the assigned
+    developer only the status. Expects the instance annotated with
+    ``manager_id`` and ``is_project_qa``.
+    """
+    ASSIGNEE_FIELDS = {"status"}
+
+    version = serializers.IntegerField(min_value=1)
+    assigned_to = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.filter(groups__name=BugCreateSerializer.ASSIGNEE_ROLE),
+        required=False,
+        allow_null=True
+    )
+
+    class Meta:
+        model = BUG
+        fields = [
+            "title",
+            "description",
+            "status",
+            "severity",
+            "assigned_to",
+            "version",
+        ]
+
+    def validate(self, attrs):
+        # required even though the edit is partial
+        if "version" not in attrs:
+            raise serializers.ValidationError({
+                "version": [self.fields["version"].error_messages["required"]]
+            })
+        changes = attrs.keys() - {"version"}
+        if not changes:
+            raise serializers.ValidationError("No changes given.")
+        bug = self.instance
+        triage = bug.manager_id == self.context["request"].user.id or bug.is_project_qa
+        if not triage and changes - self.ASSIGNEE_FIELDS:
+            raise serializers.ValidationError(
+                "The assigned developer can only change the status."
+            )
+        return attrs
+
+    def update(self, bug, validated_data):
+        bug.version = validated_data.pop("version")
+        return super().update(bug, validated_data)
+
+
 class BugProjectSerializer(serializers.ModelSerializer):
     class Meta:
         model = PROJECT
         fields = ["id", "title"]
 
 
-class BugListSerializer(serializers.ModelSerializer):
+class BugListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     project = BugProjectSerializer(read_only=True)
     reported_by = SimpleUserSerializer(read_only=True)
     assigned_to = SimpleUserSerializer(read_only=True)
@@ -74,4 +258,27 @@ class BugListSerializer(serializers.ModelSerializer):
             "reported_by",
             "assigned_to",
             "created_at",
+            "version",
         ]
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        # project / reported_by / assigned_to are all to-one: one JOINed query
+        return queryset.select_related("project", "reported_by", "assigned_to")
+
+
+class BugListLeanSerializer(LeanSerializer):
+    """BugListSerializer over values_list() rows, same output."""
+
+    fields = {
+        "id": "id",
+        "title": "title",
+        "description": "description",
+        "status": "status",
+        "severity": "severity",
+        "project": Nested("project_id", {"id": "project_id", "title": "project__title"}),
+        "reported_by": lean_user("reported_by"),
+        "assigned_to": lean_user("assigned_to"),
+        "created_at": DateTime("created_at"),
+        "version": "version",
+    }
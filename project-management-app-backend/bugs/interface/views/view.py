@@ -3,16 +3,32 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q
 
+from authentication.authentication import StatelessJWTAuthentication
 from permissions.permissions import isProjectManager, isQA, isDeveloper
-from ..serializers.serializer import BugCreateSerializer, BugListSerializer
+from pagination.pagination import CreatedAtCursorPagination
+from core.async_views import AsyncListAPIView
+from core.branches import branches, union_of
+from core.conflicts import conflict_response
+from core.infrastructure.models.versioning import StaleVersion
+from core.lean import SparseFieldsMixin
+from core.conditional import conditional_list
+from core.replicas import replica_reads
+from core.response_cache import cached_list
+from ..serializers.serializer import (
+    BugCreateSerializer, BugBulkUpdateSerializer, BugUpdateSerializer,
+    BugListSerializer, BugListLeanSerializer,
+)
 from ...infrastructure.models.bugs import BUG
+from projects.infrastructure.models.projects import PROJECT
 
 class BugCreateAPIView(APIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, isQA]
 
+    @transaction.atomic
     def post(self, request):
         serializer = BugCreateSerializer(
             data=request.data,
@@ -26,40 +42,185 @@ class BugCreateAPIView(APIView):
         )
 
 
-class QABugListAPIView(APIView):
-    authentication_classes = [JWTAuthentication]
+class BugBulkUpdateAPIView(APIView):
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @transaction.atomic
+    def patch(self, request):
+        serializer = BugBulkUpdateSerializer(
+            data=request.data,
+            context={"request": request},
+        )
+        serializer.is_valid(raise_exception=True)
+        try:
+            bugs = serializer.save()
+        except StaleVersion as stale:
+            return conflict_response(
+                BugListSerializer, BUG.objects.filter(deleted=False), stale.pks
+            )
+
+        updated = BugListSerializer.setup_eager_loading(
+            BUG.objects.filter(pk__in=[bug.pk for bug in bugs])
+        ).order_by("id")
+        return Response(
+            BugListSerializer(updated, many=True).data,
+            status=status.HTTP_200_OK,
+        )
+
+
+class BugUpdateAPIView(APIView):
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @transaction.atomic
+    def patch(self, request, pk):
+        # like bulk-update: the project's PM and QAs, or the assignee
+        user_id = request.user.id
+        bug = BUG.objects.filter(pk=pk, deleted=False).annotate(
+            manager_id=F("project__project_manager_id"),
+            is_project_qa=Exists(
+                PROJECT.qas.through.objects.filter(
+                    project_id=OuterRef("project_id"), user_id=user_id
+                )
+            ),
+        ).filter(
+            Q(manager_id=user_id) | Q(is_project_qa=True) | Q(assigned_to_id=user_id)
+        ).first()
+        if bug is None:
+            return Response(
+                {"detail": "Bug not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        serializer = BugUpdateSerializer(
+            bug,
+            data=request.data,
+            partial=True,
+            context={"request": request},
+        )
+        serializer.is_valid(raise_exception=True)
+        try:
+            bug = serializer.save()
+        except StaleVersion as stale:
+            return conflict_response(
+                BugListSerializer, BUG.objects.filter(deleted=False), stale.pks
+            )
+
+        updated = BugListSerializer.setup_eager_loading(
+            BUG.objects.filter(pk=bug.pk)
+        ).get()
+        return Response(
+            BugListSerializer(updated).data,
+            status=status.HTTP_200_OK,
+        )
+
+
+class QABugListAPIView(SparseFieldsMixin, APIView):
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated, isQA]
+    serializer_class = BugListLeanSerializer
+
+    def get_scope(self):
+        return BUG.objects.filter(deleted=False).filter(
+            Q(reported_by_id=self.request.user.id) |
+            # a subquery instead of a join, so a bug is never repeated once
+            # per QA on its project
+            Q(project__in=self.qa_projects())
+        )
+
+    def qa_projects(self):
+        return PROJECT.qas.through.objects.filter(
+            user_id=self.request.user.id
+        ).values_list("project_id", flat=True)
 
+    def get_queryset(self):
+        # the reporter's bugs and each project's, every branch seeking its
+        # own index in page order; UNION drops a bug found by two of them
+        bugs = self.get_serializer_class().project(BUG.objects.filter(deleted=False))
+        return union_of([
+            bugs.filter(reported_by_id=self.request.user.id),
+            *branches(bugs, "project_id", self.qa_projects()),
+        ])
+
+    @replica_reads
+    @cached_list("bugs")
+    @conditional_list
     def get(self, request):
-        bugs = BUG.objects.filter(
-            deleted=False
-        ).filter(
-            Q(reported_by=request.user) |
-            Q(project__qas=request.user)
+        paginator = CreatedAtCursorPagination()
+        page = paginator.paginate_queryset(
+            self.get_queryset(), request, view=self
+        )
+        return paginator.get_paginated_response(
+            self.get_serializer_class().serialize(page)
         )
-        return Response(BugListSerializer(bugs, many=True).data)
 
 
 
-class PMBugListAPIView(APIView):
-    authentication_classes = [JWTAuthentication]
+class PMBugListAPIView(SparseFieldsMixin, APIView):
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated, isProjectManager]
+    serializer_class = BugListLeanSerializer
+
+    def get_scope(self):
+        return BUG.objects.filter(project__in=self.managed_projects(), deleted=False)
 
+    def managed_projects(self):
+        return PROJECT.objects.filter(
+            project_manager_id=self.request.user.id
+        ).values_list("pk", flat=True)
+
+    def get_queryset(self):
+        # one branch per project, each seeking bug_project_live_idx in
+        # page order, merged
+        bugs = self.get_serializer_class().project(BUG.objects.filter(deleted=False))
+        return union_of(branches(bugs, "project_id", self.managed_projects()))
+
+    @replica_reads
+    @cached_list("bugs")
+    @conditional_list
     def get(self, request):
-        bugs = BUG.objects.filter(
-            project__project_manager=request.user,
-            deleted=False
+        paginator = CreatedAtCursorPagination()
+        page = paginator.paginate_queryset(
+            self.get_queryset(), request, view=self
+        )
+        return paginator.get_paginated_response(
+            self.get_serializer_class().serialize(page)
         )
-        return Response(BugListSerializer(bugs, many=True).data)
 
 
-class DevBugListAPIView(APIView):
-    authentication_classes = [JWTAuthentication]
+class DevBugListAPIView(SparseFieldsMixin, APIView):
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated, isDeveloper]
+    serializer_class = BugListLeanSerializer
 
-    def get(self, request):
-        bugs = BUG.objects.filter(
-            assigned_to=request.user,
+    def get_scope(self):
+        return BUG.objects.filter(
+            assigned_to_id=self.request.user.id,
             deleted=False
         )
-        return Response(BugListSerializer(bugs, many=True).data)
+
+    @replica_reads
+    @cached_list("bugs")
+    @conditional_list
+    def get(self, request):
+        paginator = CreatedAtCursorPagination()
+        page = paginator.paginate_queryset(
+            self.get_queryset(), request, view=self
+        )
+        return paginator.get_paginated_response(
+            self.get_serializer_class().serialize(page)
+        )
+
+
+# ---------- ASYNC LIST VIEWS (ASGI, settings.ASYNC_LIST_VIEWS) ----------
+
+class AsyncQABugListAPIView(AsyncListAPIView, QABugListAPIView):
+    cache_scope = "bugs"
+
+
+class AsyncPMBugListAPIView(AsyncListAPIView, PMBugListAPIView):
+    cache_scope = "bugs"
+
+
+class AsyncDevBugListAPIView(AsyncListAPIView, DevBugListAPIView):
+    cache_scope = "bugs"
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bugs', '0001_initial'),
+        ('projects', '0002_list_endpoint_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bug',
+            index=models.Index(condition=models.Q(('deleted', False)), fields=['assigned_to', '-created_at', '-id'], name='bug_assignee_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bug',
+            index=models.Index(condition=models.Q(('deleted', False)), fields=['reported_by', '-created_at', '-id'], name='bug_reporter_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bug',
+            index=models.Index(condition=models.Q(('deleted', False)), fields=['project', '-created_at', '-id'], name='bug_project_live_idx'),
+        ),
+    ]
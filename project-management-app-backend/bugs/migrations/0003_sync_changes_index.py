@@ -0,0 +1,20 @@
+# Generated by Django 6.0.1 on 2026-10-18 14:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bugs', '0002_list_endpoint_indexes'),
+        ('projects', '0004_project_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bug',
+            index=models.Index(fields=['project', 'updated_at', 'id'], name='bug_project_changes_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bugs', '0005_live_order_indexes'),
+        ('projects', '0006_scope_order_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='bug',
+            name='bug_live_idx',
+        ),
+        migrations.AddIndex(
+            model_name='bug',
+            index=models.Index(condition=models.Q(('deleted', False)), fields=['reported_by', '-created_at', '-id'], name='bug_reporter_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bug',
+            index=models.Index(condition=models.Q(('deleted', False)), fields=['project', '-created_at', '-id'], name='bug_project_live_idx'),
+        ),
+    ]
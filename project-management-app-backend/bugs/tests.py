@@ -0,0 +1,104 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from core.testing import LeanParityMixin, ListQueryCountMixin, client_for, make_user
+from projects.infrastructure.models.projects import PROJECT
+from bugs.infrastructure.models.bugs import BUG
+from bugs.interface.serializers.serializer import BugListLeanSerializer, BugListSerializer
+
+
+class BugListQueryCountTests(ListQueryCountMixin, TestCase):
+    def setUp(self):
+        self.pm = make_user("pm", "ProjectManager")
+        self.dev = make_user("dev", "Developer")
+        self.qa = make_user("qa", "QA")
+        self.project = PROJECT.objects.create(
+            title="Project", project_code="P", project_description="d", project_manager=self.pm,
+        )
+        self.project.qas.add(self.qa)
+
+    def add_bugs(self, count):
+        for n in range(count):
+            BUG.objects.create(
+                title=f"Bug {n}", project=self.project,
+                reported_by=self.qa, assigned_to=self.dev,
+            )
+
+    def test_qa_list(self):
+        self.assertListQueriesConstant(client_for(self.qa), "/api/bugs/qa/", self.add_bugs)
+
+    def test_pm_list(self):
+        self.assertListQueriesConstant(client_for(self.pm), "/api/bugs/pm/", self.add_bugs)
+
+    def test_developer_list(self):
+        self.assertListQueriesConstant(client_for(self.dev), "/api/bugs/dev/", self.add_bugs)
+
+
+class BugLeanParityTests(LeanParityMixin, TestCase):
+    def test_same_json(self):
+        pm = make_user("pm", "ProjectManager")
+        qa = make_user("qa", "QA")
+        project = PROJECT.objects.create(
+            title="Projekt \u00e9", project_code="P", project_description="d", project_manager=pm,
+        )
+        BUG.objects.create(
+            title='Quoted "bug"', description="line\nbreak", project=project,
+            reported_by=qa, assigned_to=make_user("dev", "Developer"),
+        )
+        # unassigned, reported by a user without a role
+        BUG.objects.create(
+            title="Unassigned", project=project,
+            reported_by=User.objects.create_user(username="plain"),
+        )
+        self.assertLeanMatches(BugListLeanSerializer, BugListSerializer, BUG.objects.all())
+
+
+class BugVersionConflictTests(TestCase):
+    def setUp(self):
+        self.pm = make_user("pm", "ProjectManager")
+        self.dev = make_user("dev", "Developer")
+        self.qa = make_user("qa", "QA")
+        self.project = PROJECT.objects.create(
+            title="Project", project_code="P", project_description="d", project_manager=self.pm,
+        )
+        self.project.qas.add(self.qa)
+        self.bug = BUG.objects.create(
+            title="Bug", project=self.project, reported_by=self.qa, assigned_to=self.dev,
+        )
+
+    def test_edit(self):
+        qa = client_for(self.qa)
+        response = qa.patch(
+            f"/api/bugs/{self.bug.pk}/update/", {"version": 1, "severity": "HIGH"}, format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["version"], 2)
+
+        # the developer still holds version 1
+        response = client_for(self.dev).patch(
+            f"/api/bugs/{self.bug.pk}/update/", {"version": 1, "status": "RESOLVED"}, format="json",
+        )
+        self.assertEqual(response.status_code, 409)
+        current = response.json()["current"][str(self.bug.pk)]
+        self.assertEqual((current["severity"], current["version"]), ("HIGH", 2))
+        self.bug.refresh_from_db()
+        self.assertEqual((self.bug.status, self.bug.version), ("NEW", 2))
+
+    def test_developer_only_changes_status(self):
+        response = client_for(self.dev).patch(
+            f"/api/bugs/{self.bug.pk}/update/", {"version": 1, "severity": "LOW"}, format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_update(self):
+        response = client_for(self.qa).patch("/api/bugs/bulk-update/", {
+            str(self.bug.pk): {"version": 1, "status": "IN_PROGRESS"},
+        }, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+
+        response = client_for(self.dev).patch("/api/bugs/bulk-update/", {
+            str(self.bug.pk): {"version": 1, "status": "RESOLVED"},
+        }, format="json")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["current"][str(self.bug.pk)]["status"], "IN_PROGRESS")
+        self.assertEqual(BUG.objects.get(pk=self.bug.pk).status, "IN_PROGRESS")
@@ -1,13 +1,26 @@
+from django.conf import settings
 from django.urls import path
 from .interface.views.view import (
     BugCreateAPIView,
+    BugBulkUpdateAPIView,
+    BugUpdateAPIView,
     QABugListAPIView,
     PMBugListAPIView,
     DevBugListAPIView,
+    AsyncQABugListAPIView,
+    AsyncPMBugListAPIView,
+    AsyncDevBugListAPIView,
 )
 
+if settings.ASYNC_LIST_VIEWS:
+    QABugListAPIView = AsyncQABugListAPIView
+    PMBugListAPIView = AsyncPMBugListAPIView
+    DevBugListAPIView = AsyncDevBugListAPIView
+
 urlpatterns = [
     path("create/", BugCreateAPIView.as_view()),
+    path("bulk-update/", BugBulkUpdateAPIView.as_view()),
+    path("<int:pk>/update/", BugUpdateAPIView.as_view()),
     path("qa/", QABugListAPIView.as_view()),
     path("pm/", PMBugListAPIView.as_view()),
     path("dev/", DevBugListAPIView.as_view()),
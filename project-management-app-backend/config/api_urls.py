@@ -11,4 +11,8 @@ urlpatterns = [
     path("projects/", include("projects.urls")),
     path("tasks/", include("tasks.urls")),
     path("bugs/", include("bugs.urls")),
+    path("events/", include("events.urls")),
+    path("search/", include("search.urls")),
+    path("sync/", include("sync.urls")),
+    path("", include("core.urls")),
 ]
\ No newline at end of file
@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 """
 Django settings for config project.
@@ -45,10 +46,17 @@ INSTALLED_APPS = [
     "user_management",
     "projects",
     "tasks",
-    "bugs"
+    "bugs",
+    "core",
+    "events",
+    "search",
+    "sync",
 ]
 
 MIDDLEWARE = [
+    # first, so its total covers every other middleware
+    'core.metrics.MetricsMiddleware',
+    'core.replicas.StickyPrimaryMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -81,14 +89,128 @@ WSGI_APPLICATION = 'config.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+#
+# SQLite set up for concurrent requests (compare with Django's defaults
+# using `manage.py bench_concurrency`):
+# - WAL lets reads go on while a write commits. synchronous=NORMAL is
+#   safe in WAL mode: a power loss can drop the last commits, but never
+#   corrupts the database.
+# - busy_timeout makes a writer wait for the lock instead of failing.
+# - IMMEDIATE takes the write lock when a transaction.atomic() block
+#   starts. A deferred transaction that reads and then writes cannot wait
+#   for it and fails with "database is locked" at once. Write endpoints
+#   run in one transaction.atomic() each.
+# - Persistent connections keep the pragmas and the page cache between
+#   requests. Under ASGI Django closes connections after each request
+#   anyway; set CONN_MAX_AGE=0 there.
+# PRAGMAS is not a Django setting: core.sqlite applies it per connection.
 
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': int(os.environ.get("CONN_MAX_AGE", 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+        },
+        'PRAGMAS': {
+            'journal_mode': 'wal',
+            'synchronous': 'normal',
+            'busy_timeout': 10000,      # ms
+            'cache_size': -20000,       # KiB, per connection
+            'mmap_size': 134217728,     # 128 MiB
+        },
     }
 }
 
+# Read replicas for the role-scoped list views (core.replicas);
+# everything else reads from and writes to default. SQLITE_REPLICAS lists
+# replica files, comma separated, and `manage.py replicate` copies the
+# primary onto them as a stand-in for real replication. After a write the
+# client reads from the primary for STICKY_SECONDS, which has to cover
+# the replication lag; cross-origin clients only send the cookie with
+# credentials, so the window is also kept per user in the default cache.
+READ_REPLICAS = {
+    "ALIASES": [],
+    "STICKY_SECONDS": 10,
+    "COOKIE": "read_primary",
+}
+for number, name in enumerate(filter(None, os.environ.get("SQLITE_REPLICAS", "").split(","))):
+    alias = f"replica_{number + 1}"
+    DATABASES[alias] = {**DATABASES['default'], 'NAME': name, 'TEST': {'MIRROR': 'default'}}
+    READ_REPLICAS["ALIASES"].append(alias)
+
+DATABASE_ROUTERS = ['core.replicas.PrimaryReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+#
+# "responses" holds per-user list responses (core.response_cache). Local
+# memory is per process; point both aliases at a shared backend such as
+# django.core.cache.backends.filebased.FileBasedCache when running several
+# workers, so invalidations reach every process.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'default',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'responses',
+        'TIMEOUT': 300,
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    # Current roles of users whose groups changed (user_management.signals).
+    # Role checks only trust the "roles" claim of access tokens when this
+    # cache is shared by every worker, so a revocation reaches them all;
+    # on a per-process backend (local memory) they query the database
+    # instead. The file-based default is shared by the workers of one
+    # host; across hosts set ROLE_CACHE_BACKEND/ROLE_CACHE_LOCATION to e.g.
+    # django.core.cache.backends.redis.RedisCache and a redis:// URL.
+    'roles': {
+        'BACKEND': os.environ.get(
+            'ROLE_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'
+        ),
+        'LOCATION': os.environ.get('ROLE_CACHE_LOCATION', str(BASE_DIR / 'cache' / 'roles')),
+    },
+}
+
+# core.testing.TestRunner: file-based caches outlive the test database,
+# so every run gets its own empty ones
+TEST_RUNNER = 'core.testing.TestRunner'
+
+# Serve the role-scoped list endpoints with their async views
+# (core.async_views). Only worth it under an ASGI server such as uvicorn;
+# compare with `manage.py bench_list_views`.
+ASYNC_LIST_VIEWS = os.environ.get("ASYNC_LIST_VIEWS") == "1"
+
+# Live change feed (/api/events/). The database broker shares events
+# through the events table, so every worker's streams see them all;
+# InProcessBroker is for a single worker (and skips the table).
+EVENT_STREAM = {
+    "BROKER": "events.infrastructure.broker.DatabaseBroker",
+    "BUFFER_SIZE": 1000,    # events kept for Last-Event-ID resume
+    "MAX_PENDING": 1000,    # per-stream queue before the client is reset
+    "POLL_INTERVAL": 0.5,   # seconds between reads of the events table
+    "MEMBERSHIP_REFRESH": 30,  # seconds between re-reads of a stream's projects
+    "HEARTBEAT": 15,        # seconds between keep-alive comments
+    "RETRY_MS": 3000,       # EventSource reconnect delay
+    "TOKEN_LIFETIME": timedelta(seconds=60),  # ?token= stream tokens
+}
+
+# Delta sync (/api/sync/). Rows younger than SETTLE_SECONDS are held back
+# so a transaction that stamped updated_at earlier but commits later is
+# not skipped by a cursor that already moved past it.
+SYNC = {
+    "PAGE_SIZE": 500,       # changed rows per kind per response
+    "MAX_PAGE_SIZE": 2000,
+    "SETTLE_SECONDS": 1,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -140,17 +262,54 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_PERMISSION_CLASSES": [
          "rest_framework.permissions.IsAuthenticated",
-    ]
+    ],
+    # Role-scoped list endpoints are cursor paginated; clients may ask for
+    # a different size with ?page_size= (capped by the pagination class).
+    "DEFAULT_PAGINATION_CLASS": "pagination.pagination.CreatedAtCursorPagination",
+    "PAGE_SIZE": 50,
+    # JSONRenderer that reports its time to core.metrics
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.metrics.TimedJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+}
+
+# Statements slower than THRESHOLD_MS (None disables the check) are
+# written with their origin and query plan to FILE, see core.slow_queries
+# and `manage.py slow_query_report`. The directory is created on the
+# first slow query, not here.
+SLOW_QUERY_LOG = {
+    "THRESHOLD_MS": 100,
+    "EXPLAIN": True,
+    "FILE": Path(os.environ.get("SLOW_QUERY_LOG_FILE", BASE_DIR / "logs" / "slow_queries.log")),
 }
 
 LOGGING = {
     "version": 1,
     "disable_existing_loggers" : False,
-    "handler": {
+    "formatters": {
+        "message": {"format": "%(message)s"},
+    },
+    "handlers": {
         "console": {"class": "logging.StreamHandler"},
+        "slow_queries": {
+            "class": "core.log_files.RotatingFileHandler",
+            "filename": SLOW_QUERY_LOG["FILE"],
+            "maxBytes": 10 * 1024 * 1024,
+            "backupCount": 5,
+            "formatter": "message",   # one JSON record per line
+            "delay": True,
+        },
+    },
+    "loggers": {
+        "slow_queries": {
+            "handlers": ["slow_queries"],
+            "level": "WARNING",
+            "propagate": False,
+        },
     },
     "root": {
-        "handler": ["console"],
+        "handlers": ["console"],
         "level": "INFO",
     }
 }
@@ -159,6 +318,10 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
 ]
 
+# Pagination cursors are returned in the Link header, request timings in
+# Server-Timing (core.metrics)
+CORS_EXPOSE_HEADERS = ["Link", "Server-Timing"]
+
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=6),   # 👈 change as needed
@@ -171,4 +334,8 @@ SIMPLE_JWT = {
 
     # Optional but recommended
     "UPDATE_LAST_LOGIN": True,
+
+    # Embed the user's roles in access tokens (see permissions.permissions)
+    "TOKEN_OBTAIN_SERIALIZER": "user_management.interface.serializers.serializer.RoleTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "user_management.interface.serializers.serializer.RoleTokenRefreshSerializer",
 }
\ No newline at end of file
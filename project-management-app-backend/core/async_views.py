@@ -0,0 +1,102 @@
+import inspect
+
+from asgiref.sync import sync_to_async
+from rest_framework.views import APIView
+
+from pagination.pagination import CreatedAtCursorPagination
+
+from .conditional import conditional_list
+from .replicas import replica_reads
+from .response_cache import cached_list
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are coroutines, for ASGI deployments.
+
+    Authentication runs inline on the event loop, so only database-free
+    authenticators belong here (StatelessJWTAuthentication). Permissions
+    that define ``ahas_permission()`` are awaited; the rest must not touch
+    the database either (IsAuthenticated, AllowAny).
+    """
+
+    view_is_async = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        # APIView.initial() with an awaited permission check
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        self.perform_authentication(request)
+        await self.acheck_permissions(request)
+        self.check_throttles(request)
+
+    async def acheck_permissions(self, request):
+        for permission in self.get_permissions():
+            check = getattr(permission, "ahas_permission", None)
+            if check is not None:
+                allowed = await check(request, self)
+            else:
+                allowed = permission.has_permission(request, self)
+            if not allowed:
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, "message", None),
+                    code=getattr(permission, "code", None),
+                )
+
+
+class AsyncListAPIView(AsyncAPIView):
+    """
+    Async counterpart of a role-scoped list view. Mix it in ahead of the
+    sync view to reuse its get_queryset(), authentication and permissions:
+
+        class AsyncPMTaskListAPIView(AsyncListAPIView, PMTaskListAPIView):
+            cache_scope = "tasks"
+
+    Bodies and Link headers are the sync view's. ETags and response cache
+    entries are keyed on the URL route, not the class, so switching
+    settings.ASYNC_LIST_VIEWS keeps clients' validators and cached pages.
+    """
+
+    cache_scope = None
+
+    async def get(self, request, *args, **kwargs):
+        handler = replica_reads(cached_list(self.cache_scope)(
+            conditional_list(AsyncListAPIView.page_response)
+        ))
+        return await handler(self, request, *args, **kwargs)
+
+    async def page_response(self, request, *args, **kwargs):
+        paginator = CreatedAtCursorPagination()
+        # branched views read the caller's project ids to build it
+        queryset = await sync_to_async(self.get_queryset)()
+        page = await paginator.apaginate_queryset(queryset, request, view=self)
+        return paginator.get_paginated_response(
+            await self.get_serializer_class().aserialize(page)
+        )
@@ -0,0 +1,82 @@
+from django.db import NotSupportedError
+
+# SQLite caps a compound SELECT at 500 terms; past this, one
+# ``IN (...)`` branch seeks every value and sorts the matches instead
+MAX_BRANCHES = 100
+
+
+class ScopeUnion:
+    """
+    A list queryset split into branches that each seek their own index
+    (one per project, one for the reporter, ...), read as their UNION.
+    The cursor paginator uses it like a queryset: order_by(), filter()
+    and values_list() apply to every branch, and slicing or iterating
+    runs one compound SELECT, which SQLite merges in index order without
+    a sort and stops after the page.
+    """
+
+    def __init__(self, branches, ordering=()):
+        self.branches = list(branches)
+        self.ordering = ordering
+        self.model = self.branches[0].model
+
+    def _each(self, method, *args, **kwargs):
+        return ScopeUnion(
+            [getattr(branch, method)(*args, **kwargs) for branch in self.branches],
+            self.ordering,
+        )
+
+    def filter(self, *args, **kwargs):
+        return self._each("filter", *args, **kwargs)
+
+    def values_list(self, *fields, **kwargs):
+        return self._each("values_list", *fields, **kwargs)
+
+    def prefetch_related(self, *lookups):
+        return self._each("prefetch_related", *lookups)
+
+    def order_by(self, *fields):
+        # ordered as a whole: SQLite refuses ORDER BY inside a compound
+        union = self._each("order_by")
+        union.ordering = fields
+        return union
+
+    def aggregate(self, *args, **kwargs):
+        raise NotSupportedError(
+            "Aggregate the view's scope queryset, not its branches."
+        )
+
+    def combined(self):
+        first, *rest = self.branches
+        queryset = first.union(*rest)
+        return queryset.order_by(*self.ordering) if self.ordering else queryset
+
+    def __getitem__(self, key):
+        return self.combined()[key]
+
+    def __iter__(self):
+        return iter(self.combined())
+
+    def aiterator(self, chunk_size=2000):
+        return self.combined().aiterator(chunk_size=chunk_size)
+
+    def explain(self, **options):
+        return self.combined().explain(**options)
+
+
+def branches(queryset, lookup, values):
+    """``queryset`` narrowed to each of ``values`` of ``lookup``, one branch each."""
+    values = sorted(set(values))
+    if not values:
+        return [queryset.none()]
+    if len(values) > MAX_BRANCHES:
+        return [queryset.filter(**{f"{lookup}__in": values})]
+    return [queryset.filter(**{lookup: value}) for value in values]
+
+
+def union_of(querysets):
+    """The one queryset, or a ScopeUnion of several; empty branches are dropped."""
+    querysets = list(querysets)
+    # an empty arm would still be compiled, as a scan of the whole table
+    querysets = [qs for qs in querysets if not qs.query.is_empty()] or querysets[:1]
+    return querysets[0] if len(querysets) == 1 else ScopeUnion(querysets)
@@ -0,0 +1,20 @@
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def conflict_response(serializer_class, queryset, pks):
+    """
+    409 for a write rejected by update_if_current(): the current state of
+    the rows that had moved on, keyed by id (null once soft-deleted), so
+    the client can merge and retry with their versions.
+    """
+    rows = serializer_class.setup_eager_loading(queryset.filter(pk__in=pks))
+    current = {str(pk): None for pk in pks}
+    current.update({str(row["id"]): row for row in serializer_class(rows, many=True).data})
+    return Response(
+        {
+            "detail": "Changed by someone else since you loaded it.",
+            "current": current,
+        },
+        status=status.HTTP_409_CONFLICT,
+    )
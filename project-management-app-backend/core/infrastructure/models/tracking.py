@@ -0,0 +1,26 @@
+class LoadedStateMixin:
+    """
+    Keeps the field values an instance was loaded (or last saved) with in
+    ``_loaded_values``, so post_save receivers can tell what a save
+    changed without re-reading the row.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # every receiver has seen the change; it is the new baseline
+        self._loaded_values = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+
+
+def loaded_values(instance):
+    """The tracked state of ``instance``, or None if it was never loaded."""
+    return getattr(instance, "_loaded_values", None)
@@ -0,0 +1,106 @@
+from django.db import models, router, transaction
+from django.db.models import Case, Q, Value, When
+
+
+class StaleVersion(Exception):
+    """A conditional write found rows that had moved on; ``pks`` lists them."""
+
+    def __init__(self, pks):
+        super().__init__(f"Stale version for {sorted(pks)}.")
+        self.pks = pks
+
+
+class VersionedMixin:
+    """
+    For models with a ``version`` field counting the writes to a row, so
+    an edit can be made conditional on the row being as the client last
+    saw it. save() of an existing row is itself conditional: it writes
+    ``UPDATE ... WHERE id = ? AND version = <self.version>`` and bumps the
+    version, or raises StaleVersion, writing nothing, when the row has
+    moved on. Batches go through update_if_current().
+    """
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+
+        expected = self.version
+        self.version = expected + 1
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "version"}
+        self._expected_version = expected
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        try:
+            # a savepoint, so a stale save leaves the caller's transaction usable
+            with transaction.atomic(using=using):
+                super().save(*args, **kwargs)
+        except StaleVersion:
+            self.version = expected
+            raise
+        finally:
+            del self._expected_version
+
+    def _do_update(self, base_qs, using, pk_val, values, *args, **kwargs):
+        expected = getattr(self, "_expected_version", None)
+        if expected is None:
+            return super()._do_update(base_qs, using, pk_val, values, *args, **kwargs)
+        updated = super()._do_update(
+            base_qs.filter(version=expected), using, pk_val, values, *args, **kwargs
+        )
+        # no match on a row that exists: someone else wrote it first (a
+        # missing row falls through to Django's usual insert)
+        if not updated and base_qs.filter(pk=pk_val).exists():
+            raise StaleVersion([pk_val])
+        return updated
+
+
+def update_if_current(instances, fields):
+    """
+    Write ``fields`` of ``instances`` with one
+    ``UPDATE ... WHERE (id = ? AND version = ?) OR ...``, where each
+    instance's ``version`` is the one the client read, and bump it.
+
+    No row is locked up front: if any row has moved on, the whole batch
+    is rolled back to a savepoint and StaleVersion names the rows whose
+    version no longer matches. Like bulk_update(), skips save() and its
+    signals; the caller sends bulk_saved.
+    """
+    model = type(instances[0])
+    match = Q()
+    for instance in instances:
+        match |= Q(pk=instance.pk, version=instance.version)
+
+    values = {}
+    for name in fields:
+        field = model._meta.get_field(name)
+        if len(instances) == 1:
+            values[field.attname] = Value(getattr(instances[0], field.attname), output_field=field)
+        else:
+            values[field.attname] = Case(
+                *[
+                    When(pk=instance.pk, then=Value(getattr(instance, field.attname), output_field=field))
+                    for instance in instances
+                ],
+                output_field=field,
+            )
+
+    try:
+        with transaction.atomic():
+            updated = model._base_manager.filter(match).update(
+                version=models.F("version") + 1, **values
+            )
+            if updated != len(instances):
+                raise StaleVersion([])
+    except StaleVersion:
+        current = dict(
+            model._base_manager.filter(pk__in=[instance.pk for instance in instances])
+            .values_list("pk", "version")
+        )
+        raise StaleVersion([
+            instance.pk for instance in instances
+            if current.get(instance.pk) != instance.version
+        ])
+
+    for instance in instances:
+        instance.version += 1
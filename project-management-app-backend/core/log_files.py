@@ -0,0 +1,14 @@
+import logging.handlers
+import os
+
+
+class RotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    logging.handlers.RotatingFileHandler that creates the log's directory
+    when the file is first opened, not when settings are imported. With
+    ``delay`` that is the first record written.
+    """
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
@@ -0,0 +1,356 @@
+import json
+import platform
+import statistics
+import time
+from importlib import import_module
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver
+from django.utils import timezone
+
+from projects.infrastructure.models.projects import PROJECT
+from tasks.infrastructure.models.tasks import TASK
+from bugs.infrastructure.models.bugs import BUG
+from user_management.infrastructure.tokens import RoleRefreshToken
+
+from .bench_list_views import percentile
+
+PM, DEV, QA, ADMIN, ANONYMOUS = "ProjectManager", "Developer", "QA", "admin", "anonymous"
+MEMBERS = (PM, DEV, QA)
+
+# role -> reverse accessor counted to pick that role's busiest user
+MEMBERSHIPS = {PM: "managed_projects", DEV: "dev_projects", QA: "qa_projects"}
+
+BATCH = 50  # rows sent to the bulk endpoints
+
+# View class name -> (method, roles, build(fixture, role) -> (path, body)).
+# Paths are relative to /api/. Writes run inside a rolled back transaction.
+SCENARIOS = {
+    "TokenObtainPairView": ("post", MEMBERS, lambda f, role: (
+        "auth/login/", {"username": f.users[role].username, "password": f.password},
+    )),
+    "TokenRefreshView": ("post", MEMBERS, lambda f, role: (
+        "auth/refresh/", {"refresh": str(RoleRefreshToken.for_user(f.users[role]))},
+    )),
+    "RegisterAPIView": ("post", (ANONYMOUS,), lambda f, role: (
+        "users/register/", {"name": "Bench", "username": "bench-register",
+                            "password": "bench-password", "role": DEV},
+    )),
+    "MeAPIView": ("get", MEMBERS, lambda f, role: ("users/me/", None)),
+    "DevelopersListView": ("get", (PM,), lambda f, role: ("users/developers/", None)),
+    "QAsListAPIView": ("get", (PM,), lambda f, role: ("users/qas/", None)),
+
+    "ProjectCreateAPIView": ("post", (PM,), lambda f, role: (
+        "projects/create/", {"title": "Bench project", "project_description": "bench",
+                             "developers": f.developers[:3], "qas": f.qas[:2]},
+    )),
+    "PMProjectListAPIView": ("get", (PM,), lambda f, role: ("projects/pm/", None)),
+    "DeveloperProjectListAPIView": ("get", (DEV,), lambda f, role: ("projects/dev/", None)),
+    "QAProjectListAPIView": ("get", (QA,), lambda f, role: ("projects/qa/", None)),
+    "PMProjectStatsAPIView": ("get", (PM,), lambda f, role: ("projects/pm/stats/", None)),
+    "ProjectStatsAPIView": ("get", MEMBERS, lambda f, role: (
+        f"projects/{f.projects[role]}/stats/", None,
+    )),
+    "ProjectAssignAPIView": ("patch", (PM,), lambda f, role: (
+        f"projects/{f.projects[PM]}/assign/", {"developers": f.developers, "qas": f.qas},
+    )),
+    "ProjectExportAPIView": ("get", (PM,), lambda f, role: (
+        f"projects/{f.projects[PM]}/export/tasks.csv", None,
+    )),
+
+    "TaskCreateAPIView": ("post", (PM,), lambda f, role: (
+        "tasks/create/", {"title": "Bench task", "project": f.projects[PM],
+                          "assignee": f.developers[0]},
+    )),
+    "TaskBulkCreateAPIView": ("post", (PM,), lambda f, role: (
+        "tasks/bulk-create/", [
+            {"title": f"Bench task {n}", "project": f.projects[PM],
+             "assignee": f.developers[n % len(f.developers)]}
+            for n in range(BATCH)
+        ],
+    )),
+    "TaskBulkUpdateAPIView": ("patch", (PM,), lambda f, role: (
+        "tasks/bulk-update/", {
+            str(pk): {"version": version, "status": "IN_REVIEW"}
+            for pk, version in f.versions["task"].items()
+        },
+    )),
+    "TaskUpdateAPIView": ("patch", (PM,), lambda f, role: (
+        f"tasks/{f.tasks[0]}/update/", {"version": f.versions["task"][f.tasks[0]],
+                                       "priority": "HIGH"},
+    )),
+    "PMTaskListAPIView": ("get", (PM,), lambda f, role: ("tasks/list/", None)),
+    "TaskSoftDeleteAPIView": ("delete", (PM,), lambda f, role: (
+        f"tasks/{f.tasks[0]}/delete/", None,
+    )),
+    "TaskBoardAPIView": ("get", MEMBERS, lambda f, role: (
+        f"tasks/board/{f.projects[role]}/", None,
+    )),
+    "TaskMoveAPIView": ("patch", (PM,), lambda f, role: (
+        f"tasks/{f.tasks[0]}/move/", {"status": "IN_PROGRESS", "after": None,
+                                     "version": f.versions["task"][f.tasks[0]]},
+    )),
+
+    "BugCreateAPIView": ("post", (QA,), lambda f, role: (
+        "bugs/create/", {"title": "Bench bug", "description": "bench",
+                         "severity": "HIGH", "project": f.projects[QA]},
+    )),
+    "BugBulkUpdateAPIView": ("patch", (QA,), lambda f, role: (
+        "bugs/bulk-update/", {
+            str(pk): {"version": version, "status": "IN_PROGRESS"}
+            for pk, version in f.versions["bug"].items()
+        },
+    )),
+    "BugUpdateAPIView": ("patch", (QA,), lambda f, role: (
+        f"bugs/{f.bugs[0]}/update/", {"version": f.versions["bug"][f.bugs[0]],
+                                     "severity": "HIGH"},
+    )),
+    "QABugListAPIView": ("get", (QA,), lambda f, role: ("bugs/qa/", None)),
+    "PMBugListAPIView": ("get", (PM,), lambda f, role: ("bugs/pm/", None)),
+    "DevBugListAPIView": ("get", (DEV,), lambda f, role: ("bugs/dev/", None)),
+
+    "SearchAPIView": ("get", MEMBERS, lambda f, role: ("search/?q=search", None)),
+    "SyncAPIView": ("get", MEMBERS, lambda f, role: ("sync/", None)),
+    "ResponseCacheStatsAPIView": ("get", (ADMIN,), lambda f, role: ("cache/stats/", None)),
+    "MetricsAPIView": ("get", (ADMIN,), lambda f, role: ("metrics/", None)),
+}
+
+# never finishes on its own; load it with clients that hold connections
+SKIPPED = {"EventStreamView": "long-lived event stream"}
+
+
+def iter_routes(patterns, prefix=""):
+    """Yield (route, view class) for every URL under ``patterns``."""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(pattern.url_patterns, prefix + str(pattern.pattern))
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, "view_class", None)
+            if view_class is not None:
+                yield prefix + str(pattern.pattern), view_class
+
+
+def scenario_name(view_class):
+    # async list views run their sync parent's scenario
+    for klass in view_class.__mro__:
+        if klass.__name__ in SCENARIOS or klass.__name__ in SKIPPED:
+            return klass.__name__
+    return None
+
+
+class Fixture:
+    """The callers and objects the scenarios point at, read once."""
+
+    def __init__(self, password):
+        self.password = password
+        self.users = {
+            role: User.objects.filter(groups__name=role)
+            .annotate(memberships=Count(relation, distinct=True))
+            .order_by("-memberships", "pk")
+            .first()
+            for role, relation in MEMBERSHIPS.items()
+        }
+        self.users[ADMIN] = User.objects.filter(is_staff=True).order_by("pk").first()
+        missing = [role for role, user in self.users.items() if user is None]
+        if missing:
+            raise CommandError(
+                f"No user for role(s) {', '.join(missing)}; run manage.py seed_perf first."
+            )
+
+        pm = self.users[PM]
+        self.projects = {
+            PM: PROJECT.objects.filter(project_manager=pm)
+            .order_by("-open_task_count", "pk").values_list("pk", flat=True).first(),
+            DEV: self.users[DEV].dev_projects.order_by("pk").values_list("pk", flat=True).first(),
+            QA: self.users[QA].qa_projects.order_by("pk").values_list("pk", flat=True).first(),
+        }
+        project = PROJECT.objects.get(pk=self.projects[PM]) if self.projects[PM] else None
+        self.developers = list(project.developers.values_list("pk", flat=True)) if project else []
+        self.qas = list(project.qas.values_list("pk", flat=True)) if project else []
+        # id -> version, which the edit endpoints require
+        self.versions = {
+            "task": dict(
+                TASK.objects.filter(project__project_manager=pm, is_deleted=False)
+                .order_by("pk").values_list("pk", "version")[:BATCH]
+            ),
+            "bug": dict(
+                BUG.objects.filter(project__qas=self.users[QA], deleted=False)
+                .order_by("pk").values_list("pk", "version")[:BATCH]
+            ),
+        }
+        self.tasks = list(self.versions["task"])
+        self.bugs = list(self.versions["bug"])
+
+
+class Command(BaseCommand):
+    help = (
+        "Call every route in config/api_urls.py as each role that uses it "
+        "and report p50/p95/p99 latency, queries per request and payload "
+        "size. Writes are rolled back. Save a baseline with --save and "
+        "check a later run against it with --compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=30,
+                            help="Timed requests per route and role.")
+        parser.add_argument("--warmup", type=int, default=3,
+                            help="Untimed requests per route and role first.")
+        parser.add_argument("--password", default="perf-password",
+                            help="Password of the seeded users (login route).")
+        parser.add_argument("--only", nargs="+", metavar="VIEW",
+                            help="Limit the run to these view class names.")
+        parser.add_argument(
+            "--warm-cache", action="store_true",
+            help="Let repeated GETs hit the response cache; by default every "
+                 "request has a unique query string.",
+        )
+        parser.add_argument("--save", metavar="PATH", help="Write the results as baseline JSON.")
+        parser.add_argument("--compare", metavar="PATH", help="Baseline JSON to compare against.")
+        parser.add_argument(
+            "--tolerance", type=float, default=0.25,
+            help="Allowed relative p95 growth over the baseline (default 0.25).",
+        )
+
+    def handle(self, *args, **options):
+        fixture = Fixture(options["password"])
+        # a failing route shows up as a 500 in the report instead of aborting
+        client = Client(SERVER_NAME="localhost", raise_request_exception=False)
+        tokens = {
+            role: f"Bearer {RoleRefreshToken.for_user(user).access_token}"
+            for role, user in fixture.users.items()
+        }
+
+        results = {}
+        api_urls = import_module("config.api_urls")
+        for route, view_class in iter_routes(api_urls.urlpatterns, "/api/"):
+            name = scenario_name(view_class)
+            if name in SKIPPED:
+                self.stdout.write(f"skip  {route}  ({SKIPPED[name]})")
+                continue
+            if name is None:
+                self.stdout.write(self.style.WARNING(f"skip  {route}  (no scenario for {view_class.__name__})"))
+                continue
+            if options["only"] and name not in options["only"]:
+                continue
+
+            method, roles, build = SCENARIOS[name]
+            for role in roles:
+                try:
+                    path, body = build(fixture, role)
+                except (IndexError, TypeError):
+                    self.stdout.write(self.style.WARNING(f"skip  {route} as {role}  (no fixture data)"))
+                    continue
+                # keyed by scenario, so baselines survive other data and
+                # the sync/async switch
+                key = f"{name} [{role}]"
+                results[key] = {
+                    "request": f"{method.upper()} /api/{path}",
+                    **self.measure(client, method, f"/api/{path}", body, tokens.get(role), options),
+                }
+                self.report(key, results[key])
+
+        if options["save"]:
+            with open(options["save"], "w") as handle:
+                json.dump({"meta": self.meta(options), "results": results}, handle, indent=2)
+            self.stdout.write(f"Baseline written to {options['save']}.")
+        if options["compare"]:
+            self.compare(results, options["compare"], options["tolerance"])
+
+    def measure(self, client, method, path, body, token, options):
+        headers = {"HTTP_AUTHORIZATION": token} if token else {}
+        data = json.dumps(body) if body is not None else ""
+        latencies, queries, sizes, statuses = [], [], [], set()
+
+        total = options["warmup"] + options["requests"]
+        for n in range(total):
+            url = path
+            if method == "get" and not options["warm_cache"]:
+                url = f"{path}{'&' if '?' in path else '?'}bench={n}"
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    response = client.generic(
+                        method.upper(), url, data, content_type="application/json", **headers
+                    )
+                    content = (
+                        b"".join(response.streaming_content)
+                        if response.streaming else response.content
+                    )
+                    elapsed = time.perf_counter() - started
+                # every scenario leaves the database as it found it
+                transaction.set_rollback(True)
+            if n < options["warmup"]:
+                continue
+            latencies.append(elapsed)
+            queries.append(len(captured))
+            sizes.append(len(content))
+            statuses.add(response.status_code)
+
+        return {
+            "status": sorted(statuses),
+            "p50_ms": round(statistics.median(latencies) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "queries": statistics.median_high(queries),
+            "bytes": statistics.median_high(sizes),
+        }
+
+    def report(self, key, result):
+        line = (
+            f"{key:<45} {'/'.join(map(str, result['status'])):>7}  "
+            f"p50 {result['p50_ms']:7.1f}  p95 {result['p95_ms']:7.1f}  "
+            f"p99 {result['p99_ms']:7.1f} ms  {result['queries']:3d} q  "
+            f"{result['bytes']:8d} B  {result['request']}"
+        )
+        ok = all(200 <= status < 300 for status in result["status"])
+        self.stdout.write(line if ok else self.style.ERROR(line))
+
+    def meta(self, options):
+        return {
+            "date": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "requests": options["requests"],
+            "rows": {
+                "users": User.objects.count(),
+                "projects": PROJECT.objects.count(),
+                "tasks": TASK.objects.count(),
+                "bugs": BUG.objects.count(),
+            },
+        }
+
+    def compare(self, results, path, tolerance):
+        with open(path) as handle:
+            baseline = json.load(handle)["results"]
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Against {path}"))
+        regressions = 0
+        for key, result in results.items():
+            before = baseline.get(key)
+            if before is None:
+                self.stdout.write(f"{key:<45} new")
+                continue
+            problems = []
+            if result["status"] != before["status"]:
+                problems.append(f"status {before['status']} -> {result['status']}")
+            if result["queries"] > before["queries"]:
+                problems.append(f"queries {before['queries']} -> {result['queries']}")
+            if result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+                problems.append(f"p95 {before['p95_ms']} -> {result['p95_ms']} ms")
+            change = (result["p95_ms"] / before["p95_ms"] - 1) * 100 if before["p95_ms"] else 0
+            line = f"{key:<45} p95 {change:+6.1f}%  bytes {result['bytes'] - before['bytes']:+d}"
+            if problems:
+                regressions += 1
+                self.stdout.write(self.style.ERROR(f"{line}  REGRESSION: {'; '.join(problems)}"))
+            else:
+                self.stdout.write(line)
+        for key in baseline.keys() - results.keys():
+            self.stdout.write(f"{key:<45} not run")
+
+        if regressions:
+            raise CommandError(f"{regressions} route(s) regressed against {path}.")
@@ -0,0 +1,199 @@
+import logging
+import multiprocessing
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client
+
+from projects.infrastructure.models.projects import PROJECT
+from user_management.infrastructure.tokens import RoleRefreshToken
+
+from .bench_list_views import percentile
+
+MODES = ("defaults", "configured")
+
+
+def mode_settings(mode, configured, path):
+    if mode == "defaults":
+        # Django's SQLite out of the box: rollback journal, deferred
+        # transactions, a connection per request
+        return {**configured, "NAME": path, "CONN_MAX_AGE": 0,
+                "CONN_HEALTH_CHECKS": False, "OPTIONS": {}, "PRAGMAS": {}}
+    return {**configured, "NAME": path}
+
+
+def copy_database(source, target, mode):
+    src, dst = sqlite3.connect(source), sqlite3.connect(target)
+    try:
+        src.backup(dst)
+        if mode == "defaults":
+            # the copy keeps the source's journal mode, which may be WAL
+            dst.execute("PRAGMA journal_mode = delete")
+    finally:
+        src.close()
+        dst.close()
+
+
+def use_database(settings_dict):
+    connections.close_all()
+    connections.settings[DEFAULT_DB_ALIAS] = settings_dict
+    try:
+        # the next access builds a new connection from settings_dict
+        del connections[DEFAULT_DB_ALIAS]
+    except AttributeError:  # not opened in this thread since the last switch
+        pass
+
+
+def run_worker(fixture, threads, writers, seconds, results):
+    """One process of --threads request loops; sends back its samples."""
+    logging.getLogger("django.request").setLevel(logging.CRITICAL)  # locked-db 500s
+    samples = []  # (kind, seconds, status)
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def loop(index):
+        client = Client(SERVER_NAME="localhost", raise_request_exception=False)
+        kind = "write" if index < writers else "read"
+        local, n = [], 0
+        while time.monotonic() < deadline:
+            n += 1
+            started = time.perf_counter()
+            if kind == "write" and n % 2:
+                response = client.post(
+                    "/api/tasks/create/",
+                    {"title": f"Bench task {index}-{n}", "project": fixture["project"]},
+                    content_type="application/json", HTTP_AUTHORIZATION=fixture["pm"],
+                )
+            elif kind == "write":
+                response = client.post(
+                    "/api/bugs/create/",
+                    {"title": f"Bench bug {index}-{n}", "description": "bench",
+                     "severity": "LOW", "project": fixture["project"]},
+                    content_type="application/json", HTTP_AUTHORIZATION=fixture["qa"],
+                )
+            elif n % 2:
+                # a unique query string misses the response cache
+                response = client.get(f"/api/tasks/list/?bench={index}-{n}",
+                                      HTTP_AUTHORIZATION=fixture["pm"])
+            else:
+                response = client.get(f"/api/bugs/qa/?bench={index}-{n}",
+                                      HTTP_AUTHORIZATION=fixture["qa"])
+            local.append((kind, time.perf_counter() - started, response.status_code))
+        connections.close_all()
+        with lock:
+            samples.extend(local)
+
+    workers = [threading.Thread(target=loop, args=(index,)) for index in range(threads)]
+    try:
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    finally:
+        results.put(samples)  # the parent blocks on one put per process
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer a copy of the database with concurrent task/bug creation "
+        "and list reads, first with Django's default SQLite setup and then "
+        "with the one in settings.DATABASES (WAL, pragmas, IMMEDIATE "
+        "transactions, persistent connections), and compare throughput and "
+        "errors. The real database is only read."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=4,
+                            help="Worker processes, like server workers.")
+        parser.add_argument("--threads", type=int, default=4,
+                            help="Request loops per process.")
+        parser.add_argument("--writers", type=int, default=2,
+                            help="How many of each process's loops write; the rest read.")
+        parser.add_argument("--seconds", type=float, default=10, help="Duration per mode.")
+        parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+
+    def handle(self, *args, **options):
+        configured = dict(connections.settings[DEFAULT_DB_ALIAS])
+        if configured["ENGINE"] != "django.db.backends.sqlite3":
+            raise CommandError("The default database is not SQLite.")
+        if not 0 <= options["writers"] <= options["threads"]:
+            raise CommandError("--writers must be between 0 and --threads.")
+        fixture = self.fixture()
+        # the slow-query log would EXPLAIN every request stuck behind a lock
+        slow_query_log = settings.SLOW_QUERY_LOG
+        settings.SLOW_QUERY_LOG = {**slow_query_log, "THRESHOLD_MS": None}
+
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                for mode in options["modes"]:
+                    path = str(Path(directory) / f"{mode}.sqlite3")
+                    copy_database(str(configured["NAME"]), path, mode)
+                    use_database(mode_settings(mode, configured, path))
+                    self.report(mode, self.load(fixture, options))
+        finally:
+            use_database(configured)
+            settings.SLOW_QUERY_LOG = slow_query_log
+
+    def fixture(self):
+        # a project with a QA, so both of its members can write to it
+        project = (
+            PROJECT.objects.filter(qas__isnull=False)
+            .select_related("project_manager").order_by("id").first()
+        )
+        if project is None:
+            raise CommandError("No project with a QA; run `manage.py seed_perf` first.")
+        qa = project.qas.order_by("id").first()
+        return {
+            "project": project.pk,
+            "pm": f"Bearer {RoleRefreshToken.for_user(project.project_manager).access_token}",
+            "qa": f"Bearer {RoleRefreshToken.for_user(qa).access_token}",
+        }
+
+    def load(self, fixture, options):
+        # forked after the connections were closed, so each worker opens its own
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        started = time.perf_counter()
+        processes = [
+            context.Process(target=run_worker, args=(
+                fixture, options["threads"], options["writers"], options["seconds"], results,
+            ))
+            for _ in range(options["processes"])
+        ]
+        for process in processes:
+            process.start()
+        samples = [sample for _ in processes for sample in results.get()]
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - started
+
+        report = {}
+        for kind in ("write", "read"):
+            latencies = [seconds for sample_kind, seconds, _ in samples if sample_kind == kind]
+            if not latencies:
+                continue
+            statuses = [status for sample_kind, _, status in samples if sample_kind == kind]
+            report[kind] = {
+                "requests": len(latencies),
+                "errors": sum(not 200 <= status < 300 for status in statuses),
+                "throughput": sum(200 <= status < 300 for status in statuses) / elapsed,
+                "p50": statistics.median(latencies),
+                "p95": percentile(latencies, 0.95),
+            }
+        return report
+
+    def report(self, mode, result):
+        self.stdout.write(self.style.MIGRATE_HEADING(mode))
+        for kind, row in result.items():
+            self.stdout.write(
+                f"  {kind:>5}: {row['throughput']:8.1f} ok/s  "
+                f"p50 {row['p50'] * 1000:7.1f} ms  p95 {row['p95'] * 1000:7.1f} ms  "
+                f"({row['requests']} requests, {row['errors']} failed)"
+            )
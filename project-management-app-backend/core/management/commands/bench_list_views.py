@@ -0,0 +1,131 @@
+import http.client
+import importlib.util
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from user_management.infrastructure.tokens import RoleRefreshToken
+
+MODES = {"sync": "0", "async": "1"}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise CommandError(f"uvicorn did not start listening on port {port}.")
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve the API under uvicorn with the sync and then the async list "
+        "views (ASYNC_LIST_VIEWS=0/1) and compare throughput of concurrent "
+        "GETs against one list endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", required=True,
+                            help="User whose list is requested (token minted locally).")
+        parser.add_argument("--path", default="/api/tasks/list/",
+                            help="List endpoint to request.")
+        parser.add_argument("--requests", type=int, default=2000,
+                            help="Requests per mode.")
+        parser.add_argument("--concurrency", type=int, default=50,
+                            help="Concurrent client connections.")
+        parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+        parser.add_argument(
+            "--warm-cache", action="store_true",
+            help="Let repeated requests hit the response cache; by default "
+                 "every request has a unique query string and reaches the database.",
+        )
+
+    def handle(self, *args, **options):
+        if importlib.util.find_spec("uvicorn") is None:
+            raise CommandError("uvicorn is required: pip install uvicorn")
+
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user named {options['username']!r}.")
+        token = str(RoleRefreshToken.for_user(user).access_token)
+
+        for mode in options["modes"]:
+            port = free_port()
+            server = subprocess.Popen(
+                [
+                    sys.executable, "-m", "uvicorn", "config.asgi:application",
+                    "--port", str(port), "--log-level", "warning", "--no-access-log",
+                ],
+                cwd=settings.BASE_DIR,
+                env={**os.environ, "ASYNC_LIST_VIEWS": MODES[mode]},
+            )
+            try:
+                wait_for_port(port)
+                self.report(mode, self.load(port, token, options))
+            finally:
+                server.terminate()
+                server.wait(timeout=10)
+
+    def load(self, port, token, options):
+        total, concurrency = options["requests"], options["concurrency"]
+        separator = "&" if "?" in options["path"] else "?"
+
+        def worker(index):
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            latencies, errors = [], 0
+            for n in range(index, total, concurrency):
+                path = options["path"]
+                if not options["warm_cache"]:
+                    path = f"{path}{separator}bench={n}"
+                started = time.perf_counter()
+                connection.request("GET", path, headers={"Authorization": f"Bearer {token}"})
+                response = connection.getresponse()
+                response.read()
+                latencies.append(time.perf_counter() - started)
+                errors += response.status != 200
+            connection.close()
+            return latencies, errors
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(worker, range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        latencies = [sample for samples, _ in results for sample in samples]
+        return {
+            "requests": len(latencies),
+            "errors": sum(errors for _, errors in results),
+            "throughput": len(latencies) / elapsed,
+            "p50": statistics.median(latencies),
+            "p95": percentile(latencies, 0.95),
+        }
+
+    def report(self, mode, result):
+        self.stdout.write(
+            f"{mode:>5}: {result['throughput']:8.1f} req/s  "
+            f"p50 {result['p50'] * 1000:7.1f} ms  p95 {result['p95'] * 1000:7.1f} ms  "
+            f"({result['requests']} requests, {result['errors']} non-200)"
+        )
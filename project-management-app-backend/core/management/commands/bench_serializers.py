@@ -0,0 +1,112 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import Group, User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from projects.infrastructure.models.projects import PROJECT
+from tasks.infrastructure.models.tasks import TASK
+from bugs.infrastructure.models.bugs import BUG
+from projects.interface.serializers.serializer import (
+    ProjectListSerializer, ProjectListLeanSerializer,
+)
+from tasks.interface.serializer.serializer import TaskListSerializer, TaskListLeanSerializer
+from bugs.interface.serializers.serializer import BugListSerializer, BugListLeanSerializer
+
+# name -> (model, ModelSerializer, LeanSerializer)
+SUBJECTS = {
+    "tasks": (TASK, TaskListSerializer, TaskListLeanSerializer),
+    "bugs": (BUG, BugListSerializer, BugListLeanSerializer),
+    "projects": (PROJECT, ProjectListSerializer, ProjectListLeanSerializer),
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Serialize the same rows with the list ModelSerializers and their "
+        "values_list() counterparts, check the rendered JSON is identical and "
+        "compare timings. Synthetic rows are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000,
+                            help="Rows serialized per run (one big page).")
+        parser.add_argument("--repeat", type=int, default=7,
+                            help="Timed runs per serializer; the median is reported.")
+        parser.add_argument("--subjects", nargs="+", choices=SUBJECTS, default=list(SUBJECTS))
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.fill(options["rows"], random.Random(options["seed"]))
+                for name in options["subjects"]:
+                    self.compare(name, options["rows"], options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def fill(self, rows, rng):
+        groups = [Group.objects.get_or_create(name=name)[0]
+                  for name in ("ProjectManager", "Developer", "QA")]
+        users = User.objects.bulk_create(
+            User(username=f"bench-serializers-{n}", first_name=f"User {n}")
+            for n in range(30)
+        )
+        for n, user in enumerate(users):
+            user.groups.add(groups[n % 3])
+        managers, developers, qas = users[0::3], users[1::3], users[2::3]
+
+        projects = PROJECT.objects.bulk_create(
+            PROJECT(title=f"Project {n}", project_code=f"B{n}", project_description="benchmark",
+                    project_manager=rng.choice(managers))
+            for n in range(rows)
+        )
+        for project in projects:
+            project.developers.add(*rng.sample(developers, 3))
+            project.qas.add(*rng.sample(qas, 2))
+
+        TASK.objects.bulk_create(
+            TASK(title=f"Task {n}", description="benchmark", project=rng.choice(projects),
+                 assignee=rng.choice(developers + [None]), created_by=rng.choice(managers))
+            for n in range(rows)
+        )
+        BUG.objects.bulk_create(
+            BUG(title=f"Bug {n}", description="benchmark", project=rng.choice(projects),
+                reported_by=rng.choice(qas), assigned_to=rng.choice(developers + [None]))
+            for n in range(rows)
+        )
+
+    def compare(self, name, rows, repeat):
+        model, drf, lean = SUBJECTS[name]
+        queryset = model.objects.order_by("-created_at", "-id")
+        runs = {
+            "ModelSerializer": lambda: drf(drf.setup_eager_loading(queryset)[:rows], many=True).data,
+            "lean": lambda: lean.serialize(list(lean.project(queryset)[:rows])),
+        }
+
+        rendered, medians = {}, {}
+        for label, run in runs.items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                data = run()
+                timings.append(time.perf_counter() - started)
+            rendered[label] = JSONRenderer().render(data)
+            medians[label] = statistics.median(timings)
+
+        if len(set(rendered.values())) != 1:
+            raise CommandError(f"{name}: the lean serializer's output differs.")
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{name} ({rows} rows, identical JSON)"))
+        for label, median in medians.items():
+            self.stdout.write(f"  {label:>15}: {median * 1000:8.1f} ms")
+        self.stdout.write(
+            f"  {'speedup':>15}: {medians['ModelSerializer'] / medians['lean']:8.1f}x"
+        )
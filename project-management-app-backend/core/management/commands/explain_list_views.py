@@ -0,0 +1,118 @@
+import re
+from types import SimpleNamespace
+
+from django.core.exceptions import EmptyResultSet
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+
+from core.conditional import VALIDATOR_AGGREGATES
+from pagination.pagination import CreatedAtCursorPagination
+
+# "SEARCH t USING INDEX i (col=?)" seeks a range. Any "SCAN t" reads the
+# whole table, and "SCAN t USING [COVERING] INDEX i" the whole index: a
+# full scan either way, only in a different order.
+FULL_SCAN = re.compile(r"\bSCAN (?!CONSTANT ROW)(\S+)")
+TEMP_SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+
+def defines_scope(view_class):
+    # our own list views (core.lean.SparseFieldsMixin); async list views
+    # inherit get_scope() from their sync counterpart
+    return any("get_scope" in vars(klass) for klass in view_class.__mro__)
+
+
+def iter_list_views(patterns, prefix=""):
+    """Yield (route, view class) for every URL whose view defines get_scope()."""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_list_views(
+                pattern.url_patterns, prefix + str(pattern.pattern)
+            )
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, "view_class", None)
+            if view_class is not None and defines_scope(view_class):
+                yield prefix + str(pattern.pattern), view_class
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN QUERY PLAN on the first-page query and the ETag "
+        "validator aggregate of every list view, and flag full scans "
+        "and temporary sorts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user-id", type=int, default=1,
+            help="request.user.id to build the role-scoped querysets with.",
+        )
+        parser.add_argument(
+            "--strict", action="store_true",
+            help="Exit with an error if any full scan or temporary sort is found.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("EXPLAIN QUERY PLAN output is SQLite specific.")
+
+        request = SimpleNamespace(
+            user=SimpleNamespace(id=options["user_id"]), query_params={},
+        )
+        page_size = CreatedAtCursorPagination.page_size
+        ordering = CreatedAtCursorPagination.ordering
+        scans = sorts = 0
+
+        for route, view_class in iter_list_views(get_resolver().url_patterns):
+            view = view_class()
+            view.request, view.args, view.kwargs = request, (), {}
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{route}  ({view_class.__name__})"
+            ))
+            page = view.get_queryset().order_by(*ordering)[:page_size + 1]
+            validators = self.aggregate_sql(view.get_scope())
+            for label, plan in (
+                ("page", self.explain(page.explain)),
+                ("validators", self.explain(self.plan_of, validators)),
+            ):
+                self.stdout.write(f"  {label}:")
+                for line in plan:
+                    if FULL_SCAN.search(line):
+                        scans += 1
+                        self.stdout.write(self.style.ERROR(f"  FULL SCAN  {line}"))
+                    elif TEMP_SORT in line:
+                        # the whole match set is read and sorted before the
+                        # first row of the page comes back
+                        sorts += 1
+                        self.stdout.write(self.style.ERROR(f"  SORT       {line}"))
+                    else:
+                        self.stdout.write(f"             {line}")
+
+        summary = f"{scans} full scan(s), {sorts} temporary sort(s) found."
+        if (scans or sorts) and options["strict"]:
+            raise CommandError(summary)
+        self.stdout.write(summary)
+
+    @staticmethod
+    def explain(method, *args):
+        try:
+            return method(*args).splitlines() or ["(no query)"]
+        except EmptyResultSet:
+            # nothing in scope: Django answers without a query
+            return ["(no query)"]
+
+    @staticmethod
+    def aggregate_sql(scope):
+        """The SQL list_validators() runs for ``scope``, as executed."""
+        with CaptureQueriesContext(connection) as queries:
+            scope.aggregate(**VALIDATOR_AGGREGATES)
+        return queries.captured_queries[-1]["sql"] if queries.captured_queries else None
+
+    @staticmethod
+    def plan_of(sql):
+        if sql is None:
+            raise EmptyResultSet
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return "\n".join(row[-1] for row in cursor.fetchall())
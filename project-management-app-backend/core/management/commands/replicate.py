@@ -0,0 +1,51 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+
+def copy(source, target):
+    src, dst = sqlite3.connect(source), sqlite3.connect(target)
+    try:
+        # a consistent snapshot of the primary, even while it is written to
+        src.backup(dst)
+    finally:
+        src.close()
+        dst.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database onto every read replica "
+        "(READ_REPLICAS). A stand-in for replication when trying the "
+        "replica router locally; with --interval it keeps copying, so the "
+        "replicas lag behind the primary by up to that many seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float,
+                            help="Seconds between copies; copy once without it.")
+
+    def handle(self, *args, **options):
+        databases = settings.DATABASES
+        aliases = settings.READ_REPLICAS["ALIASES"]
+        if not aliases:
+            raise CommandError("No read replicas configured; set SQLITE_REPLICAS.")
+        if any(databases[alias]["ENGINE"] != "django.db.backends.sqlite3"
+               for alias in [DEFAULT_DB_ALIAS, *aliases]):
+            raise CommandError("replicate only copies SQLite databases.")
+
+        source = str(databases[DEFAULT_DB_ALIAS]["NAME"])
+        while True:
+            started = time.perf_counter()
+            for alias in aliases:
+                copy(source, str(databases[alias]["NAME"]))
+            self.stdout.write(
+                f"Copied the primary to {', '.join(aliases)} "
+                f"in {(time.perf_counter() - started) * 1000:.0f} ms."
+            )
+            if options["interval"] is None:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,288 @@
+import datetime
+import itertools
+import random
+import time
+from collections import Counter, defaultdict
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from projects.infrastructure.counters import COUNTER_FIELDS, bug_counters, task_counters
+from projects.infrastructure.models.projects import PROJECT
+from tasks.infrastructure import ranking
+from tasks.infrastructure.models.tasks import TASK
+from bugs.infrastructure.models.bugs import BUG
+
+ROLES = ("Developer", "QA", "ProjectManager")
+
+# relative frequencies of the generated choices
+TASK_STATUSES = {"BACKLOG": 4, "IN_PROGRESS": 3, "IN_REVIEW": 1, "DONE": 6}
+TASK_PRIORITIES = {"LOW": 3, "MEDIUM": 5, "HIGH": 2, "CRITICAL": 1}
+BUG_STATUSES = {"NEW": 3, "IN_PROGRESS": 2, "RESOLVED": 4, "CLOSED": 4}
+BUG_SEVERITIES = {"LOW": 3, "MEDIUM": 5, "HIGH": 2, "CRITICAL": 1}
+
+WORDS = (
+    "api auth board bug build cache client config crash dashboard data deploy "
+    "docs email error export filter form image import index layout login "
+    "migration mobile modal network notification page payment performance "
+    "permission profile query report search server session settings signup "
+    "sync table test timeout token upload user validation view"
+).split()
+
+
+def weighted(rng, table, k):
+    return rng.choices(list(table), weights=list(table.values()), k=k)
+
+
+def zipf_weights(count, skew):
+    # item i weighs 1 / (i + 1) ** skew: a few big projects, a long tail
+    return list(itertools.accumulate(1 / (rank + 1) ** skew for rank in range(count)))
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-create synthetic users, projects (with developer/QA "
+        "memberships), tasks and bugs for load testing. Every generated "
+        "username starts with --prefix; --flush removes a previous run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=300)
+        parser.add_argument(
+            "--role-mix", default="60,25,15",
+            help="Developer,QA,ProjectManager shares of --users (relative weights).",
+        )
+        parser.add_argument("--projects", type=int, default=100)
+        parser.add_argument("--developers-per-project", type=int, default=6,
+                            help="Mean; each project gets between half and 1.5x.")
+        parser.add_argument("--qas-per-project", type=int, default=2,
+                            help="Mean; each project gets between half and 1.5x.")
+        parser.add_argument("--tasks", type=int, default=20000, help="Total tasks.")
+        parser.add_argument("--bugs", type=int, default=5000, help="Total bugs.")
+        parser.add_argument(
+            "--skew", type=float, default=1.0,
+            help="Zipf exponent for spreading tasks/bugs over projects and "
+                 "assignees; 0 spreads them evenly.",
+        )
+        parser.add_argument("--deleted-ratio", type=float, default=0.05,
+                            help="Share of tasks and bugs soft-deleted.")
+        parser.add_argument("--unassigned-ratio", type=float, default=0.15,
+                            help="Share of tasks and bugs without an assignee.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--prefix", default="perf")
+        parser.add_argument("--password", default="perf-password",
+                            help="Password of every generated user (for the login route).")
+        parser.add_argument("--flush", action="store_true",
+                            help="Delete the data of a previous run with the same prefix first.")
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        existing = User.objects.filter(username__startswith=f"{prefix}-")
+        if existing.exists():
+            if not options["flush"]:
+                raise CommandError(
+                    f"Users named {prefix}-* already exist; pass --flush to replace them."
+                )
+            self.flush(existing)
+
+        try:
+            mix = [float(share) for share in options["role_mix"].split(",")]
+        except ValueError:
+            mix = []
+        if len(mix) != len(ROLES) or not all(share >= 0 for share in mix) or not any(mix):
+            raise CommandError("--role-mix takes three non-negative weights, e.g. 60,25,15.")
+
+        rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        started = time.perf_counter()
+        with transaction.atomic():
+            users = self.create_users(rng, options, mix)
+            projects = self.create_projects(rng, options, users)
+            counters = defaultdict(Counter)
+            self.create_tasks(rng, options, projects, counters)
+            self.create_bugs(rng, options, projects, counters)
+            self.store_counters(projects, counters)
+            self.rank_tasks(projects)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {sum(map(len, users.values())) + 1} users, {len(projects)} projects, "
+            f"{options['tasks']} tasks and {options['bugs']} bugs "
+            f"in {time.perf_counter() - started:.1f}s."
+        ))
+
+    def flush(self, users):
+        with transaction.atomic():
+            # tasks and bugs go with their projects (CASCADE)
+            deleted = PROJECT.objects.filter(project_manager__in=users).delete()[0]
+            deleted += users.delete()[0]
+        self.stdout.write(f"Flushed a previous run ({deleted} rows).")
+
+    # -----------------------------
+    # USERS & PROJECTS
+    # -----------------------------
+    def create_users(self, rng, options, mix):
+        prefix, total = options["prefix"], options["users"]
+        password = make_password(options["password"])  # hashed once, shared
+        groups = {name: Group.objects.get_or_create(name=name)[0] for name in ROLES}
+        roles = rng.choices(ROLES, weights=mix, k=total)
+        # at least one user per role so every role-scoped route has a caller
+        roles[:len(ROLES)] = ROLES
+
+        User.objects.bulk_create(
+            [
+                User(
+                    username=f"{prefix}-{role.lower()}-{n}",
+                    first_name=f"{rng.choice(WORDS).title()} {n}",
+                    email=f"{prefix}-{n}@example.com",
+                    password=password,
+                )
+                for n, role in enumerate(roles)
+            ],
+            batch_size=self.batch_size,
+        )
+        # bulk_create only returns primary keys on some backends
+        by_username = {
+            user.username: user
+            for user in User.objects.filter(username__startswith=f"{prefix}-")
+        }
+
+        users = {role: [] for role in ROLES}
+        memberships = []
+        for n, role in enumerate(roles):
+            user = by_username[f"{prefix}-{role.lower()}-{n}"]
+            users[role].append(user)
+            memberships.append(User.groups.through(user_id=user.pk, group_id=groups[role].pk))
+        User.groups.through.objects.bulk_create(memberships, batch_size=self.batch_size)
+        # staff caller for the admin-only routes
+        User.objects.create(username=f"{prefix}-admin", is_staff=True, password=password)
+        return users
+
+    def create_projects(self, rng, options, users):
+        today = timezone.localdate()
+        PROJECT.objects.bulk_create(
+            [
+                PROJECT(
+                    title=f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {n}",
+                    project_code=f"P{n}"[:10],
+                    project_description=" ".join(rng.choices(WORDS, k=20)),
+                    project_manager=rng.choice(users["ProjectManager"]),
+                    due_date=today + datetime.timedelta(days=rng.randint(-30, 365)),
+                )
+                for n in range(options["projects"])
+            ],
+            batch_size=self.batch_size,
+        )
+        managers = [user.pk for user in users["ProjectManager"]]
+        projects = list(
+            PROJECT.objects.filter(project_manager_id__in=managers).order_by("pk")
+        )
+
+        for field, role, mean in (
+            ("developers", "Developer", options["developers_per_project"]),
+            ("qas", "QA", options["qas_per_project"]),
+        ):
+            through = getattr(PROJECT, field).through
+            pool = users[role]
+            rows = []
+            for project in projects:
+                size = min(len(pool), rng.randint(mean - mean // 2, mean + mean // 2))
+                rows.extend(
+                    through(project_id=project.pk, user_id=user.pk)
+                    for user in rng.sample(pool, size)
+                )
+            through.objects.bulk_create(rows, batch_size=self.batch_size)
+
+        project_ids = [project.pk for project in projects]
+        self.members = {
+            field: {project_id: [] for project_id in project_ids}
+            for field in ("developers", "qas")
+        }
+        for field, members in self.members.items():
+            for project_id, user_id in getattr(PROJECT, field).through.objects.filter(
+                project_id__in=project_ids
+            ).values_list("project_id", "user_id"):
+                members[project_id].append(user_id)
+        return projects
+
+    # -----------------------------
+    # TASKS & BUGS
+    # -----------------------------
+    def pick(self, rng, options, candidates):
+        if not candidates or rng.random() < options["unassigned_ratio"]:
+            return None
+        # the first members of a project carry most of its work
+        weights = zipf_weights(len(candidates), options["skew"])
+        return rng.choices(candidates, cum_weights=weights)[0]
+
+    def generate(self, rng, options, projects, total, build):
+        weights = zipf_weights(len(projects), options["skew"])
+        for offset in range(0, total, self.batch_size):
+            count = min(self.batch_size, total - offset)
+            yield [
+                build(project)
+                for project in rng.choices(projects, cum_weights=weights, k=count)
+            ]
+
+    def create_tasks(self, rng, options, projects, counters):
+        today = timezone.localdate()
+
+        def build(project):
+            return TASK(
+                title=" ".join(rng.choices(WORDS, k=rng.randint(3, 8))),
+                description=" ".join(rng.choices(WORDS, k=rng.randint(0, 60))),
+                status=weighted(rng, TASK_STATUSES, 1)[0],
+                priority=weighted(rng, TASK_PRIORITIES, 1)[0],
+                project_id=project.pk,
+                assignee_id=self.pick(rng, options, self.members["developers"][project.pk]),
+                created_by_id=project.project_manager_id,
+                is_deleted=rng.random() < options["deleted_ratio"],
+                due_date=(
+                    today + datetime.timedelta(days=rng.randint(-60, 120))
+                    if rng.random() < 0.7 else None
+                ),
+            )
+
+        for batch in self.generate(rng, options, projects, options["tasks"], build):
+            TASK.objects.bulk_create(batch)
+            for task in batch:
+                counters[task.project_id].update(
+                    task_counters({"is_deleted": task.is_deleted, "status": task.status})
+                )
+
+    def create_bugs(self, rng, options, projects, counters):
+        def build(project):
+            return BUG(
+                title=" ".join(rng.choices(WORDS, k=rng.randint(3, 8))),
+                description=" ".join(rng.choices(WORDS, k=rng.randint(5, 80))),
+                status=weighted(rng, BUG_STATUSES, 1)[0],
+                severity=weighted(rng, BUG_SEVERITIES, 1)[0],
+                project_id=project.pk,
+                reported_by_id=self.pick(rng, {**options, "unassigned_ratio": 0},
+                                         self.members["qas"][project.pk]),
+                assigned_to_id=self.pick(rng, options, self.members["developers"][project.pk]),
+                deleted=rng.random() < options["deleted_ratio"],
+            )
+
+        for batch in self.generate(rng, options, projects, options["bugs"], build):
+            BUG.objects.bulk_create(batch)
+            for bug in batch:
+                counters[bug.project_id].update(bug_counters({
+                    "deleted": bug.deleted, "status": bug.status, "severity": bug.severity,
+                }))
+
+    def store_counters(self, projects, counters):
+        # bulk_create bypasses the incremental counter signals
+        for project in projects:
+            for field in COUNTER_FIELDS:
+                setattr(project, field, counters[project.pk][field])
+        PROJECT.objects.bulk_update(projects, COUNTER_FIELDS, batch_size=self.batch_size)
+
+    def rank_tasks(self, projects):
+        # bulk_create leaves ranks empty; lay out every board column
+        for project in projects:
+            for status in TASK.Status.values:
+                ranking.rebalance(project.pk, status, batch_size=self.batch_size)
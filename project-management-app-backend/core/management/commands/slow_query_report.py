@@ -0,0 +1,96 @@
+import json
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+class Offender:
+    def __init__(self, record):
+        self.sql = record["sql"]
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.origins = Counter()
+        self.latest = record
+
+    def add(self, record):
+        self.count += 1
+        self.total_ms += record["duration_ms"]
+        self.max_ms = max(self.max_ms, record["duration_ms"])
+        self.origins[(record.get("view"), record.get("serializer"))] += 1
+        if record["time"] >= self.latest["time"]:
+            self.latest = record
+
+
+class Command(BaseCommand):
+    help = (
+        "Summarize the slow-query log (settings.SLOW_QUERY_LOG) by SQL "
+        "fingerprint: the top offenders by total time, where they come "
+        "from and their latest query plan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=10)
+        parser.add_argument("--file", help="Log to read; rotated backups next to it are read too.")
+        parser.add_argument("--since", help="Only records at or after this ISO datetime.")
+
+    def handle(self, *args, **options):
+        path = Path(options["file"] or settings.SLOW_QUERY_LOG["FILE"])
+        since = None
+        if options["since"]:
+            since = parse_datetime(options["since"])
+            if since is None:
+                raise CommandError("--since takes an ISO datetime, e.g. 2026-10-18T09:00.")
+            if timezone.is_naive(since):
+                # records carry an offset; a bare datetime is local time
+                since = timezone.make_aware(since)
+
+        # oldest first: the highest numbered backup, ..., .1, then the log
+        files = sorted(
+            (backup for backup in path.parent.glob(f"{path.name}.*")
+             if backup.suffix[1:].isdigit()),
+            key=lambda backup: int(backup.suffix[1:]), reverse=True,
+        )
+        if path.exists():
+            files.append(path)
+        if not files:
+            raise CommandError(f"No slow-query log at {path}.")
+
+        offenders, skipped = {}, 0
+        for log in files:
+            with open(log) as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                        if since and parse_datetime(record["time"]) < since:
+                            continue
+                        offender = offenders.setdefault(record["fingerprint"], Offender(record))
+                        offender.add(record)
+                    except (ValueError, KeyError, TypeError):
+                        skipped += 1
+
+        ranked = sorted(offenders.items(), key=lambda item: item[1].total_ms, reverse=True)
+        total = sum(offender.count for offender in offenders.values())
+        self.stdout.write(
+            f"{total} slow queries, {len(offenders)} fingerprints"
+            + (f", {skipped} unreadable lines skipped" if skipped else "")
+        )
+        for rank, (fingerprint, offender) in enumerate(ranked[:options["top"]], 1):
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"\n#{rank} {fingerprint}: {offender.total_ms:.1f} ms total, "
+                f"{offender.count} x, mean {offender.total_ms / offender.count:.1f} ms, "
+                f"max {offender.max_ms:.1f} ms"
+            ))
+            self.stdout.write(f"  {offender.sql[:300]}")
+            for (view, serializer), count in offender.origins.most_common(3):
+                self.stdout.write(f"  {count:>5} x  {view or '-'}  {serializer or ''}".rstrip())
+            latest = offender.latest
+            if latest.get("caller"):
+                self.stdout.write(f"  at {latest['caller']}")
+            for line in latest.get("explain") or []:
+                style = self.style.ERROR if " SCAN " in f" {line} " and "USING" not in line else str
+                self.stdout.write(style(f"  | {line}"))
@@ -0,0 +1,239 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from rest_framework.renderers import JSONRenderer
+
+# Request metrics are kept per process, like the in-process event broker:
+# with several workers each /api/metrics/ scrape sees one worker, so
+# scrape every worker (or put them behind a Prometheus multiprocess setup).
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+# name -> (help, buckets)
+HISTOGRAMS = {
+    "http_request_duration_seconds": ("Total time spent in the Django stack.", DURATION_BUCKETS),
+    "http_request_db_duration_seconds": ("Time spent executing SQL.", DURATION_BUCKETS),
+    "http_request_db_queries": ("SQL statements executed.", QUERY_BUCKETS),
+    "http_request_serialize_duration_seconds": (
+        "Time spent building and rendering response bodies, SQL excluded.", DURATION_BUCKETS,
+    ),
+}
+
+
+class RequestMetrics:
+    __slots__ = ("request", "db_queries", "db_time", "serialize_time")
+
+    def __init__(self, request):
+        self.request = request
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+
+
+# the metrics of the request being handled; sync_to_async copies the
+# context, so ORM calls in worker threads add to the same object
+current = contextvars.ContextVar("request_metrics", default=None)
+
+# set inside a timed_serialization() block, so nested ones (a serializer
+# per list item, then the renderer) are not counted twice
+serializing = contextvars.ContextVar("serializing", default=False)
+
+
+# -----------------------------
+# COLLECTION
+# -----------------------------
+def record_query(execute, sql, params, many, context):
+    metrics = current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - started
+        metrics.db_queries += 1
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    # connection_created fires again on every reconnect of the same wrapper
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def timed_serialization():
+    """Count the block as serialization, less the SQL it runs (that is db)."""
+    metrics = current.get()
+    if metrics is None or serializing.get():
+        yield
+        return
+    token = serializing.set(True)
+    started, db_time = time.perf_counter(), metrics.db_time
+    try:
+        yield
+    finally:
+        serializing.reset(token)
+        metrics.serialize_time += (
+            time.perf_counter() - started - (metrics.db_time - db_time)
+        )
+
+
+class TimedSerializerMixin:
+    """
+    For ModelSerializers that build response bodies: to_representation()
+    counts as serialization, per item under many=True.
+    """
+
+    def to_representation(self, instance):
+        with timed_serialization():
+            return super().to_representation(instance)
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSONRenderer whose time counts as serialization."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed_serialization():
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+# -----------------------------
+# AGGREGATION
+# -----------------------------
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)  # per bucket, made cumulative on export
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}  # (name, labels) -> Histogram
+
+    def observe(self, labels, values):
+        with self.lock:
+            for name, value in values.items():
+                key = (name, labels)
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = Histogram(HISTOGRAMS[name][1])
+                histogram.observe(value)
+
+    def exposition(self):
+        """The histograms in the Prometheus text format (version 0.0.4)."""
+        with self.lock:
+            series = sorted(
+                (name, labels, list(histogram.counts), histogram.sum, histogram.count,
+                 histogram.buckets)
+                for (name, labels), histogram in self.histograms.items()
+            )
+        lines, described = [], set()
+        for name, labels, counts, total, count, buckets in series:
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {HISTOGRAMS[name][0]}")
+                lines.append(f"# TYPE {name} histogram")
+            label_text = ",".join(f'{key}="{escape(value)}"' for key, value in labels)
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{label_text},le="+Inf"}} {count}')
+            lines.append(f"{name}_sum{{{label_text}}} {total}")
+            lines.append(f"{name}_count{{{label_text}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+registry = Registry()
+
+
+# -----------------------------
+# MIDDLEWARE
+# -----------------------------
+def route_of(request):
+    # the URL pattern, not the path, so ids do not explode the label set
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.route or match.view_name
+
+
+def finish(request, response, metrics, started):
+    total = time.perf_counter() - started
+    labels = (("method", request.method), ("route", route_of(request)))
+    registry.observe(labels, {
+        "http_request_duration_seconds": total,
+        "http_request_db_duration_seconds": metrics.db_time,
+        "http_request_db_queries": metrics.db_queries,
+        "http_request_serialize_duration_seconds": metrics.serialize_time,
+    })
+    # for streamed bodies this covers the time to the first byte
+    response.headers["Server-Timing"] = ", ".join([
+        f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.db_queries} queries"',
+        f"serialize;dur={metrics.serialize_time * 1000:.1f}",
+        f"total;dur={total * 1000:.1f}",
+    ])
+    return response
+
+
+class MetricsMiddleware:
+    """
+    Times every request: SQL count and time, serialization time and total
+    time. They go out in a Server-Timing header and into per-route
+    histograms served at /api/metrics/. Belongs at the top of MIDDLEWARE
+    so the total covers the rest of the stack.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics(request)
+        token = current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current.reset(token)
+        return finish(request, response, metrics, started)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics(request)
+        token = current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current.reset(token)
+        return finish(request, response, metrics, started)
@@ -0,0 +1,135 @@
+import contextvars
+import inspect
+import random
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+# the replica the list request being handled reads from; None is the primary
+replica = contextvars.ContextVar("read_replica", default=None)
+
+
+# -----------------------------
+# ROUTING
+# -----------------------------
+class PrimaryReplicaRouter:
+    """
+    Writes, and reads outside of replica_reads() views, go to the primary
+    (default). Replicas are copies of it and are never migrated.
+    """
+
+    def db_for_read(self, model, **hints):
+        return replica.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.READ_REPLICAS["ALIASES"]
+
+
+def sticky_key(user_id):
+    return f"read-primary:{user_id}"
+
+
+def choose_replica(request):
+    """
+    A replica for this request, or None while the user's own recent
+    writes may not have reached the replicas yet.
+    """
+    config = settings.READ_REPLICAS
+    if not config["ALIASES"] or config["COOKIE"] in request.COOKIES:
+        return None
+    # for clients that drop cookies; needs a cache shared by the workers
+    if request.user.is_authenticated and cache.get(sticky_key(request.user.id)):
+        return None
+    return random.choice(config["ALIASES"])
+
+
+def replica_reads(method):
+    """
+    Decorate a list view's get() so its queries run on a read replica,
+    one per request so the ETag aggregate and the page agree. Goes above
+    cached_list/conditional_list. Works on both sync and async handlers.
+    """
+    if inspect.iscoroutinefunction(method):
+        @wraps(method)
+        async def async_wrapper(self, request, *args, **kwargs):
+            # sync_to_async copies the context, so ORM threads see the alias
+            token = replica.set(await sync_to_async(choose_replica)(request))
+            try:
+                return await method(self, request, *args, **kwargs)
+            finally:
+                replica.reset(token)
+
+        return async_wrapper
+
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        token = replica.set(choose_replica(request))
+        try:
+            return method(self, request, *args, **kwargs)
+        finally:
+            replica.reset(token)
+
+    return wrapper
+
+
+# -----------------------------
+# STICKINESS
+# -----------------------------
+def stick_to_primary(request, response):
+    config = settings.READ_REPLICAS
+    response.set_cookie(
+        config["COOKIE"], "1", max_age=config["STICKY_SECONDS"], httponly=True, samesite="Lax",
+    )
+    # DRF puts the authenticated user on the underlying request too
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        cache.set(sticky_key(user.id), True, config["STICKY_SECONDS"])
+
+
+def wrote(request, response):
+    return (
+        bool(settings.READ_REPLICAS["ALIASES"])
+        and request.method not in SAFE_METHODS
+        and response.status_code < 400
+    )
+
+
+class StickyPrimaryMiddleware:
+    """
+    After a successful write, keep the writer's list reads on the primary
+    for READ_REPLICAS["STICKY_SECONDS"], so they see their own changes
+    while the replicas catch up. Tracked by a cookie, and per user in the
+    default cache for clients that do not keep cookies.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if wrote(request, response):
+            stick_to_primary(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if wrote(request, response):
+            await sync_to_async(stick_to_primary)(request, response)
+        return response
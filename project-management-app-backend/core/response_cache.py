@@ -0,0 +1,162 @@
+import hashlib
+import inspect
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+from . import replicas
+from .conditional import view_key
+
+RESPONSE_CACHE = "responses"
+
+# Scopes a cached list response can depend on. Signal receivers in
+# core.signals evict a scope for exactly the users a change is visible to.
+SCOPES = ("projects", "tasks", "bugs")
+
+CACHED_HEADERS = ("ETag", "Last-Modified", "Cache-Control", "Link")
+
+
+def generation_key(scope, user_id):
+    return f"resp-gen:{scope}:{user_id}"
+
+
+def stats_key(scope, outcome):
+    return f"resp-stats:{scope}:{outcome}"
+
+
+def current_generation(cache, scope, user_id):
+    key = generation_key(scope, user_id)
+    generation = cache.get(key)
+    if generation is None:
+        generation = time.time_ns()
+        if not cache.add(key, generation, timeout=None):
+            generation = cache.get(key, generation)
+    return generation
+
+
+def invalidate(scope, user_ids):
+    """
+    Evict every cached ``scope`` response of the given users by moving
+    them to a new generation; the orphaned entries age out on their own.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+
+    def evict():
+        generation = time.time_ns()
+        caches[RESPONSE_CACHE].set_many(
+            {generation_key(scope, user_id): generation for user_id in user_ids},
+            timeout=None,
+        )
+
+    # on commit: a list read before it still sees the old rows and would
+    # cache them under the new generation
+    transaction.on_commit(evict)
+
+
+def record(cache, scope, outcome):
+    key = stats_key(scope, outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def stats():
+    cache = caches[RESPONSE_CACHE]
+    counters = cache.get_many(
+        [stats_key(scope, outcome) for scope in SCOPES for outcome in ("hit", "miss")]
+    )
+    result = {}
+    for scope in SCOPES:
+        hits = counters.get(stats_key(scope, "hit"), 0)
+        misses = counters.get(stats_key(scope, "miss"), 0)
+        result[scope] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+        }
+    return result
+
+
+def lookup(scope, view, request):
+    """(cache key, cached entry or None) for a list request; counts the outcome."""
+    cache = caches[RESPONSE_CACHE]
+    user_id = request.user.id
+    generation = current_generation(cache, scope, user_id)
+    query = hashlib.md5(
+        request.META.get("QUERY_STRING", "").encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    key = f"resp:{scope}:{user_id}:{generation}:{view_key(view, request)}:{query}"
+
+    entry = cache.get(key)
+    record(cache, scope, "miss" if entry is None else "hit")
+    return key, entry
+
+
+def store(key, response):
+    if response.status_code == 200:
+        # a replica may not have the change that opened this generation yet
+        timeout = (
+            settings.READ_REPLICAS["STICKY_SECONDS"] if replicas.replica.get()
+            else DEFAULT_TIMEOUT
+        )
+        caches[RESPONSE_CACHE].set(key, {
+            "data": response.data,
+            "headers": {
+                header: response[header]
+                for header in CACHED_HEADERS if header in response
+            },
+        }, timeout)
+
+
+def cached_response(request, entry):
+    response = Response(entry["data"], headers=entry["headers"])
+    return get_conditional_response(
+        request, etag=entry["headers"].get("ETag"), response=response
+    )
+
+
+def cached_list(scope):
+    """
+    Cache a list view's successful responses per user and query string.
+    A hit skips the view entirely, including the conditional-GET aggregate;
+    a matching If-None-Match is answered from the cached ETag. Async
+    handlers do each cache round trip in one sync_to_async call.
+    """
+
+    def decorator(method):
+        if inspect.iscoroutinefunction(method):
+            @wraps(method)
+            async def async_wrapper(self, request, *args, **kwargs):
+                key, entry = await sync_to_async(lookup)(scope, self, request)
+                if entry is not None:
+                    return cached_response(request, entry)
+
+                response = await method(self, request, *args, **kwargs)
+                await sync_to_async(store)(key, response)
+                return response
+
+            return async_wrapper
+
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            key, entry = lookup(scope, self, request)
+            if entry is not None:
+                return cached_response(request, entry)
+
+            response = method(self, request, *args, **kwargs)
+            store(key, response)
+            return response
+
+        return wrapper
+
+    return decorator
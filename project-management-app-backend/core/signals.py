@@ -0,0 +1,129 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from bugs.infrastructure.models.bugs import BUG
+from projects.infrastructure.models.projects import PROJECT
+from tasks.infrastructure.models.tasks import TASK
+
+from . import response_cache
+from .infrastructure.models.tracking import loaded_values
+
+# Sent once per batch by write paths that bypass Model.save()
+# (bulk_create, bulk_update, queryset.update()), with keyword arguments
+# ``instances`` and ``created``. Receivers that keep derived state in sync
+# listen to it next to post_save.
+bulk_saved = Signal()
+
+
+def project_audience(project_ids):
+    """(project managers, QAs) of the given projects, in one query."""
+    managers, qas = set(), set()
+    rows = PROJECT.objects.filter(pk__in=project_ids).values_list(
+        "project_manager_id", "qas"
+    )
+    for manager_id, qa_id in rows:
+        managers.add(manager_id)
+        qas.add(qa_id)
+    return managers, qas
+
+
+def project_members(project_ids):
+    """Managers, developers and QAs of the given projects, in three queries."""
+    members = set(
+        PROJECT.objects.filter(pk__in=project_ids).values_list(
+            "project_manager_id", flat=True
+        )
+    )
+    for through in (PROJECT.developers.through, PROJECT.qas.through):
+        members.update(
+            through.objects.filter(project_id__in=project_ids).values_list(
+                "user_id", flat=True
+            )
+        )
+    return members
+
+
+def invalidate_projects(project_ids):
+    # project fields show up in every role's project, task and bug lists
+    members = project_members(project_ids)
+    for scope in response_cache.SCOPES:
+        response_cache.invalidate(scope, members)
+
+
+# -----------------------------
+# RESPONSE CACHE INVALIDATION
+# -----------------------------
+def invalidate_tasks(tasks):
+    # PMTaskListAPIView is scoped by created_by
+    response_cache.invalidate("tasks", {task.created_by_id for task in tasks})
+
+
+def invalidate_bugs(bugs):
+    managers, qas = project_audience({bug.project_id for bug in bugs})
+    users = managers | qas
+    for bug in bugs:
+        users.add(bug.reported_by_id)
+        users.add(bug.assigned_to_id)
+        # a reassigned bug also leaves its previous assignee's list
+        users.add((loaded_values(bug) or {}).get("assigned_to_id"))
+    response_cache.invalidate("bugs", users)
+
+
+@receiver(post_save, sender=TASK)
+@receiver(post_delete, sender=TASK)
+def task_changed(sender, instance, **kwargs):
+    invalidate_tasks([instance])
+
+
+@receiver(post_save, sender=BUG)
+@receiver(post_delete, sender=BUG)
+def bug_changed(sender, instance, **kwargs):
+    invalidate_bugs([instance])
+
+
+@receiver(bulk_saved, sender=TASK)
+def tasks_bulk_saved(sender, instances, **kwargs):
+    invalidate_tasks(instances)
+
+
+@receiver(bulk_saved, sender=BUG)
+def bugs_bulk_saved(sender, instances, **kwargs):
+    invalidate_bugs(instances)
+
+
+@receiver(post_save, sender=PROJECT)
+def project_changed(sender, instance, **kwargs):
+    invalidate_projects([instance.pk])
+
+
+@receiver(bulk_saved, sender=PROJECT)
+def projects_bulk_saved(sender, instances, **kwargs):
+    invalidate_projects([project.pk for project in instances])
+
+
+@receiver(m2m_changed, sender=PROJECT.developers.through)
+@receiver(m2m_changed, sender=PROJECT.qas.through)
+def project_membership_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and not reverse:
+        # project.<members>.clear() does not report which users it removes
+        instance._cleared_member_ids = list(
+            sender.objects.filter(project_id=instance.pk).values_list(
+                "user_id", flat=True
+            )
+        )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if reverse:
+        # user.dev_projects / user.qa_projects: the user is the member
+        users = {instance.pk}
+    elif action == "post_clear":
+        users = set(instance.__dict__.pop("_cleared_member_ids", []))
+    else:
+        users = set(pk_set)
+
+    response_cache.invalidate("projects", users)
+    if sender is PROJECT.qas.through:
+        # QABugListAPIView is scoped by project membership too
+        response_cache.invalidate("bugs", users)
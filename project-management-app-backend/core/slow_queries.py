@@ -0,0 +1,153 @@
+import contextvars
+import hashlib
+import json
+import logging
+import re
+import sys
+import time
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.utils import timezone
+from django.views import View
+from rest_framework.serializers import BaseSerializer
+
+from . import metrics
+from .lean import LeanSerializer
+
+logger = logging.getLogger("slow_queries")
+
+# set while the EXPLAIN of a slow query runs, so it is not recorded itself
+explaining = contextvars.ContextVar("explaining_slow_query", default=False)
+
+
+# -----------------------------
+# FINGERPRINTS
+# -----------------------------
+STRING = re.compile(r"'(?:[^']|'')*'")
+NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(sql):
+    """
+    The shape of a statement: literals and placeholders become ?, IN
+    lists of any length become (...), whitespace is collapsed.
+    """
+    sql = STRING.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = NUMBER.sub("?", sql)
+    sql = PLACEHOLDER_LIST.sub("(...)", sql)
+    return WHITESPACE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized):
+    return hashlib.md5(normalized.encode(), usedforsecurity=False).hexdigest()[:12]
+
+
+# -----------------------------
+# ORIGIN
+# -----------------------------
+# the wrappers' own frames are not where a query comes from
+WRAPPER_FILES = {__file__, metrics.__file__}
+
+
+def dotted(klass):
+    return f"{klass.__module__}.{klass.__qualname__}"
+
+
+def origin():
+    """
+    The view and serializer on the stack of the slow query, and the
+    innermost frame of project code. Only walked for slow queries.
+    """
+    view = serializer = caller = None
+    frame = sys._getframe(2)
+    while frame is not None and not (view and serializer and caller):
+        owner = frame.f_locals.get("self", frame.f_locals.get("cls"))
+        if view is None and isinstance(owner, View):
+            view = dotted(type(owner))
+        elif serializer is None and isinstance(owner, BaseSerializer):
+            serializer = dotted(type(owner))
+        elif (serializer is None and isinstance(owner, type)
+              and issubclass(owner, LeanSerializer)):
+            serializer = dotted(owner)
+        filename = frame.f_code.co_filename
+        if (caller is None and filename.startswith(str(settings.BASE_DIR))
+                and "site-packages" not in filename and filename not in WRAPPER_FILES):
+            caller = f"{filename[len(str(settings.BASE_DIR)) + 1:]}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+
+    # async views run their ORM calls in a worker thread, off the view's stack
+    request = getattr(metrics.current.get(), "request", None)
+    match = getattr(request, "resolver_match", None)
+    if view is None and match is not None:
+        view = match._func_path
+    return {
+        "view": view,
+        "serializer": serializer,
+        "caller": caller,
+        "route": match.route if match is not None else None,
+    }
+
+
+# -----------------------------
+# EXPLAIN
+# -----------------------------
+def explain(connection, sql, params):
+    if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+    token = explaining.set(True)
+    # nor counted in the request's Server-Timing
+    metrics_token = metrics.current.set(None)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+            return [" ".join(str(column) for column in row) for row in cursor.fetchall()]
+    except Exception as exc:  # the record is still useful without a plan
+        return [f"EXPLAIN failed: {exc}"]
+    finally:
+        metrics.current.reset(metrics_token)
+        explaining.reset(token)
+
+
+# -----------------------------
+# WRAPPER
+# -----------------------------
+def record_slow_query(execute, sql, params, many, context):
+    if explaining.get():
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration = time.perf_counter() - started
+
+    config = settings.SLOW_QUERY_LOG
+    if duration * 1000 >= config["THRESHOLD_MS"]:
+        connection = context["connection"]
+        normalized = normalize(sql)
+        record = {
+            "time": timezone.now().isoformat(),
+            "duration_ms": round(duration * 1000, 2),
+            "database": connection.alias,
+            "fingerprint": fingerprint(normalized),
+            "sql": normalized,
+            "many": many,
+            **origin(),
+            # statements only: parameters may carry user data
+            "explain": (
+                explain(connection, sql, params)
+                if config["EXPLAIN"] and not many else None
+            ),
+        }
+        logger.warning(json.dumps(record))
+    return result
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    if settings.SLOW_QUERY_LOG["THRESHOLD_MS"] is None:
+        return
+    if record_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_slow_query)
@@ -0,0 +1,15 @@
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def apply_pragmas(sender, connection, **kwargs):
+    """
+    Run the PRAGMAS of a SQLite entry in DATABASES on every new
+    connection; apart from journal_mode they last as long as the connection.
+    """
+    if connection.vendor != "sqlite":
+        return
+    for name, value in connection.settings_dict.get("PRAGMAS", {}).items():
+        # on the raw connection, so they are not counted as request queries
+        connection.connection.execute(f"PRAGMA {name} = {value}")
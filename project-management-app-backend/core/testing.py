@@ -0,0 +1,96 @@
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.cache import caches
+from django.db import connection
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from user_management.infrastructure.tokens import RoleRefreshToken
+
+
+# -----------------------------
+# HELPERS FOR THE APPS' TESTS
+# -----------------------------
+def make_user(username, role):
+    user = User.objects.create_user(username=username, first_name=username)
+    user.groups.add(Group.objects.get_or_create(name=role)[0])
+    return user
+
+
+def client_for(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {RoleRefreshToken.for_user(user).access_token}"
+    )
+    return client
+
+
+def clear_caches():
+    for alias in settings.CACHES:
+        caches[alias].clear()
+
+
+class ListQueryCountMixin:
+    """For TestCases: a list endpoint's query count must not grow with its rows."""
+
+    def assertListQueriesConstant(self, client, path, add_rows, rows=5):
+        add_rows(1)
+        clear_caches()  # a cached list would answer without querying
+        with CaptureQueriesContext(connection) as one_row:
+            response = client.get(path)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(len(response.json()), 1)
+
+        add_rows(rows - 1)
+        clear_caches()
+        with self.assertNumQueries(len(one_row)):
+            response = client.get(path)
+        self.assertEqual(len(response.json()), rows)
+
+
+class LeanParityMixin:
+    """For TestCases: a LeanSerializer must render what its ModelSerializer renders."""
+
+    def assertLeanMatches(self, lean, serializer_class, queryset):
+        queryset = queryset.order_by("id")
+        model_data = serializer_class(
+            serializer_class.setup_eager_loading(queryset), many=True
+        ).data
+        lean_data = lean.serialize(list(lean.project(queryset)))
+        self.assertTrue(model_data)
+        self.assertEqual(JSONRenderer().render(lean_data), JSONRenderer().render(model_data))
+
+
+# -----------------------------
+# TEST RUNNER
+# -----------------------------
+FILE_BASED_CACHE = "django.core.cache.backends.filebased.FileBasedCache"
+
+
+class TestRunner(DiscoverRunner):
+    """
+    DiscoverRunner with every file-based cache (the shared "roles" cache)
+    moved to a temporary directory. Its entries are keyed by user id and
+    would otherwise leak between runs, and into the development server.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.cache_directory = tempfile.TemporaryDirectory()
+        self.cache_settings = override_settings(CACHES={
+            alias: (
+                {**config, "LOCATION": f"{self.cache_directory.name}/{alias}"}
+                if config["BACKEND"] == FILE_BASED_CACHE else config
+            )
+            for alias, config in settings.CACHES.items()
+        })
+        self.cache_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.cache_settings.disable()
+        self.cache_directory.cleanup()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,593 @@
+import json
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.utils import ConnectionHandler
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path
+from django.utils.connection import ConnectionDoesNotExist
+
+from bugs.infrastructure.models.bugs import BUG
+from core import metrics, replicas, response_cache, slow_queries
+from core.management.commands.explain_list_views import FULL_SCAN
+from core.signals import bulk_saved
+from core.testing import clear_caches, client_for, make_user
+from projects.infrastructure.models.projects import PROJECT
+from tasks.infrastructure.models.tasks import TASK
+from tasks.interface.serializer.serializer import TaskListLeanSerializer, TaskListSerializer
+from tasks.interface.views.view import AsyncPMTaskListAPIView
+
+# the task list served by its async view, as under ASYNC_LIST_VIEWS
+urlpatterns = [
+    path("api/tasks/list/", AsyncPMTaskListAPIView.as_view()),
+    path("api/", include("config.api_urls")),
+]
+
+
+class ExplainListViewsTests(TestCase):
+    def test_no_scans_or_sorts(self):
+        # PM of two projects, developer and QA on two more: every branched
+        # list has several branches to merge
+        user = make_user("pm", "ProjectManager")
+        other = make_user("other", "ProjectManager")
+        for n in range(4):
+            project = PROJECT.objects.create(
+                title=f"P{n}", project_code=f"P{n}", project_description="d",
+                project_manager=user if n < 2 else other,
+            )
+            if n >= 2:
+                project.developers.add(user)
+                project.qas.add(user)
+            BUG.objects.create(title="Bug", project=project, reported_by=other)
+
+        # --strict raises CommandError on a full scan or a temporary sort
+        out = StringIO()
+        call_command("explain_list_views", "--strict", "--user-id", user.id, stdout=out)
+        self.assertIn("MERGE (UNION)", out.getvalue())
+        self.assertIn("0 full scan(s), 0 temporary sort(s) found.", out.getvalue())
+
+    def test_index_walk_is_a_full_scan(self):
+        self.assertTrue(FULL_SCAN.search("SCAN bugs_bug USING INDEX bug_live_idx"))
+        self.assertTrue(FULL_SCAN.search("SCAN t USING COVERING INDEX i"))
+        self.assertFalse(FULL_SCAN.search("SEARCH t USING INDEX i (project_id=?)"))
+
+
+# bench_api calls the routes as "localhost", allowed while DEBUG is on
+@override_settings(ALLOWED_HOSTS=["localhost"])
+class BenchmarkTests(TestCase):
+    def seed(self, *args):
+        call_command(
+            "seed_perf", "--users", "12", "--projects", "3", "--tasks", "40", "--bugs", "10",
+            *args, stdout=StringIO(),
+        )
+
+    def test_seed_and_bench(self):
+        self.seed()
+        self.seed("--flush")
+        self.assertEqual(PROJECT.objects.count(), 3)
+        self.assertEqual((TASK.objects.count(), BUG.objects.count()), (40, 10))
+        # counters were written from the generated rows
+        out = StringIO()
+        call_command("recount", stdout=out)
+        self.assertIn("0 with drift corrected.", out.getvalue())
+
+        with tempfile.NamedTemporaryFile(suffix=".json") as baseline:
+            options = {"requests": 1, "warmup": 0, "stdout": StringIO()}
+            call_command("bench_api", save=baseline.name, **options)
+            results = json.load(open(baseline.name))["results"]
+            self.assertTrue(results)
+            failing = {
+                key: result["status"] for key, result in results.items()
+                if not all(200 <= status < 300 for status in result["status"])
+            }
+            self.assertEqual(failing, {})
+            # against its own baseline: nothing to flag
+            call_command("bench_api", compare=baseline.name, tolerance=100, **options)
+
+
+class ConditionalListTests(TestCase):
+    def setUp(self):
+        self.pm = make_user("pm", "ProjectManager")
+        project = PROJECT.objects.create(
+            title="Project", project_code="P", project_description="d", project_manager=self.pm,
+        )
+        self.task = TASK.objects.create(title="Task", project=project, created_by=self.pm)
+        self.client = client_for(self.pm)
+        clear_caches()
+
+    def touch(self, updated_at):
+        # no signals: only the validators see the change
+        TASK.objects.filter(pk=self.task.pk).update(updated_at=updated_at)
+        clear_caches()
+
+    def test_not_modified(self):
+        etag = self.client.get("/api/tasks/list/")["ETag"]
+        clear_caches()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/tasks/list/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        # the validators alone: one aggregate over the scope, no joins
+        [aggregate] = [q["sql"] for q in queries.captured_queries if "tasks_task" in q["sql"]]
+        self.assertIn("MAX(", aggregate)
+        self.assertNotIn("JOIN", aggregate)
+
+    def test_modified_in_the_same_second(self):
+        second = datetime(2026, 10, 18, 12, 0, 0, tzinfo=dt_timezone.utc)
+        self.touch(second + timedelta(microseconds=100_000))
+        first = self.client.get("/api/tasks/list/")
+
+        self.touch(second + timedelta(microseconds=700_000))
+        response = self.client.get(
+            "/api/tasks/list/",
+            HTTP_IF_NONE_MATCH=first["ETag"],
+            HTTP_IF_MODIFIED_SINCE=first["Last-Modified"],
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+
+        # If-Modified-Since alone cannot tell the two apart: not honored
+        clear_caches()
+        response = self.client.get(
+            "/api/tasks/list/", HTTP_IF_MODIFIED_SINCE=first["Last-Modified"],
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        self.pm = make_user("pm", "ProjectManager")
+        self.dev = make_user("dev", "Developer")
+        self.qa = make_user("qa", "QA")
+        self.project = PROJECT.objects.create(
+            title="Project", project_code="P", project_description="d", project_manager=self.pm,
+        )
+        self.project.developers.add(self.dev)
+        self.project.qas.add(self.qa)
+        self.task = TASK.objects.create(title="Task", project=self.project, created_by=self.pm)
+        self.bug = BUG.objects.create(
+            title="Bug", project=self.project, reported_by=self.qa, assigned_to=self.dev,
+        )
+        clear_caches()
+
+    def titles(self, user, path):
+        response = client_for(user).get(path)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row["title"] for row in response.json()]
+
+    def assertCached(self, user, path, expected):
+        # a change made without signals goes unseen while the page is cached
+        self.assertEqual(self.titles(user, path), expected)
+        self.assertEqual(self.titles(user, path), expected)
+
+    def test_task_save_evicts(self):
+        self.assertCached(self.pm, "/api/tasks/list/", ["Task"])
+        TASK.objects.filter(pk=self.task.pk).update(title="Updated")
+        self.assertEqual(self.titles(self.pm, "/api/tasks/list/"), ["Task"])
+
+        self.task.refresh_from_db()
+        self.task.title = "Saved"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.save()
+        self.assertEqual(self.titles(self.pm, "/api/tasks/list/"), ["Saved"])
+
+    def test_bug_save_evicts_every_audience(self):
+        paths = {self.pm: "/api/bugs/pm/", self.qa: "/api/bugs/qa/", self.dev: "/api/bugs/dev/"}
+        for user, path in paths.items():
+            self.assertCached(user, path, ["Bug"])
+        BUG.objects.filter(pk=self.bug.pk).update(title="Updated")
+
+        self.bug.refresh_from_db()
+        self.bug.title = "Saved"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bug.save()
+        for user, path in paths.items():
+            self.assertEqual(self.titles(user, path), ["Saved"])
+
+    def test_project_save_evicts(self):
+        self.assertCached(self.dev, "/api/projects/dev/", ["Project"])
+        self.project.title = "Saved"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.save()
+        self.assertEqual(self.titles(self.dev, "/api/projects/dev/"), ["Saved"])
+
+    def test_membership_change_evicts(self):
+        other = PROJECT.objects.create(
+            title="Other", project_code="O", project_description="d", project_manager=self.pm,
+        )
+        BUG.objects.create(title="Other bug", project=other, reported_by=self.pm)
+        self.assertCached(self.dev, "/api/projects/dev/", ["Project"])
+        self.assertCached(self.qa, "/api/bugs/qa/", ["Bug"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other.developers.add(self.dev)
+            other.qas.add(self.qa)
+        self.assertEqual(
+            sorted(self.titles(self.dev, "/api/projects/dev/")), ["Other", "Project"]
+        )
+        self.assertEqual(sorted(self.titles(self.qa, "/api/bugs/qa/")), ["Bug", "Other bug"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other.developers.clear()
+        self.assertEqual(self.titles(self.dev, "/api/projects/dev/"), ["Project"])
+
+    def test_bulk_saved_evicts(self):
+        self.assertCached(self.pm, "/api/tasks/list/", ["Task"])
+        self.assertCached(self.qa, "/api/bugs/qa/", ["Bug"])
+        TASK.objects.filter(pk=self.task.pk).update(title="Updated task")
+        BUG.objects.filter(pk=self.bug.pk).update(title="Updated bug")
+
+        self.task.refresh_from_db()
+        self.bug.refresh_from_db()
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_saved.send(sender=TASK, instances=[self.task], created=False)
+            bulk_saved.send(sender=BUG, instances=[self.bug], created=False)
+        self.assertEqual(self.titles(self.pm, "/api/tasks/list/"), ["Updated task"])
+        self.assertEqual(self.titles(self.qa, "/api/bugs/qa/"), ["Updated bug"])
+
+    def test_never_shared_between_users(self):
+        other_pm = make_user("other-pm", "ProjectManager")
+        other = PROJECT.objects.create(
+            title="Other", project_code="O", project_description="d", project_manager=other_pm,
+        )
+        TASK.objects.create(title="Other task", project=other, created_by=other_pm)
+
+        # same view, same query string
+        self.assertCached(self.pm, "/api/tasks/list/?fields=title", ["Task"])
+        self.assertCached(other_pm, "/api/tasks/list/?fields=title", ["Other task"])
+
+    def test_counters(self):
+        before = response_cache.stats()["tasks"]
+        self.titles(self.pm, "/api/tasks/list/")
+        self.titles(self.pm, "/api/tasks/list/")
+        self.titles(self.pm, "/api/tasks/list/")
+        after = response_cache.stats()["tasks"]
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 2)
+        self.assertEqual(response_cache.stats()["bugs"]["hit_ratio"], None)
+
+
+@override_settings(READ_REPLICAS={
+    "ALIASES": ["replica_1"], "STICKY_SECONDS": 10, "COOKIE": "read_primary",
+})
+class ReplicaRoutingTests(TestCase):
+    def setUp(self):
+        self.pm = make_user("pm", "ProjectManager")
+        self.project = PROJECT.objects.create(
+            title="Project", project_code="P", project_description="d", project_manager=self.pm,
+        )
+        clear_caches()
+
+    def list_request(self, user, **cookies):
+        request = RequestFactory().get("/api/tasks/list/")
+        request.user = user
+        request.COOKIES.update(cookies)
+        return request
+
+    def test_reads_go_to_a_replica(self):
+        self.assertEqual(replicas.choose_replica(self.list_request(self.pm)), "replica_1")
+        # the list view's queries go there (the alias has no database here)
+        with self.assertLogs("django.request", "ERROR"):
+            with self.assertRaisesMessage(ConnectionDoesNotExist, "replica_1"):
+                client_for(self.pm).get("/api/tasks/list/")
+
+    def test_reads_after_a_write_stay_on_the_primary(self):
+        client = client_for(self.pm)
+        response = client.post(
+            "/api/tasks/create/", {"title": "Task", "project": self.project.pk}, format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        cookie = response.cookies["read_primary"]
+        self.assertEqual(cookie["max-age"], 10)
+
+        # by cookie, and by user for a client that dropped it
+        with mock.patch("core.replicas.choose_replica", wraps=replicas.choose_replica) as choose:
+            self.assertEqual(client.get("/api/tasks/list/").status_code, 200)
+            client.cookies.clear()
+            self.assertEqual(client.get("/api/tasks/list/").status_code, 200)
+        self.assertEqual(
+            [call.args[0].COOKIES.get("read_primary") for call in choose.call_args_list],
+            ["1", None],
+        )
+
+        self.assertIsNone(replicas.choose_replica(self.list_request(self.pm, read_primary="1")))
+        self.assertIsNone(replicas.choose_replica(self.list_request(self.pm)))
+        # once the window is over
+        clear_caches()
+        self.assertEqual(replicas.choose_replica(self.list_request(self.pm)), "replica_1")
+        # other users are not held on the primary
+        other = make_user("other", "ProjectManager")
+        self.assertEqual(replicas.choose_replica(self.list_request(other)), "replica_1")
+
+    def test_failed_writes_do_not_stick(self):
+        response = client_for(self.pm).post("/api/tasks/create/", {}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("read_primary", response.cookies)
+        self.assertEqual(replicas.choose_replica(self.list_request(self.pm)), "replica_1")
+
+    def test_writes_never_go_to_a_replica(self):
+        router = replicas.PrimaryReplicaRouter()
+        token = replicas.replica.set("replica_1")
+        try:
+            self.assertEqual(router.db_for_read(TASK), "replica_1")
+            self.assertEqual(router.db_for_write(TASK), "default")
+        finally:
+            replicas.replica.reset(token)
+        self.assertIsNone(router.db_for_read(TASK))
+        self.assertFalse(router.allow_migrate("replica_1", "tasks"))
+
+        # write views never choose a replica, not even outside the window
+        with mock.patch("core.replicas.choose_replica", return_value="replica_1") as choose:
+            response = client_for(self.pm).post(
+                "/api/tasks/create/", {"title": "Task", "project": self.project.pk},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+        choose.assert_not_called()
+
+
+class AsyncListViewTests(TestCase):
+    def test_same_validators_as_sync_view(self):
+        client = client_for(make_user("pm", "ProjectManager"))
+        etag = client.get("/api/tasks/list/")["ETag"]
+        with override_settings(ROOT_URLCONF="core.tests"):
+            response = client.get("/api/tasks/list/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+
+class MetricsTests(TestCase):
+    SERIES = 'http_request_db_queries_count{method="GET",route="api/tasks/list/"}'
+
+    def setUp(self):
+        self.pm = make_user("pm", "ProjectManager")
+        self.admin = make_user("admin", "ProjectManager")
+        self.admin.is_staff = True
+        self.admin.save()
+        clear_caches()
+
+    def scrape(self):
+        response = client_for(self.admin).get("/api/metrics/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        return response.content.decode()
+
+    def count_of(self, exposition):
+        for line in exposition.splitlines():
+            if line.startswith(self.SERIES):
+                return int(line.split()[-1])
+        return 0
+
+    def test_server_timing(self):
+        client = client_for(self.pm)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get("/api/tasks/list/")
+        db, serialize, total = response["Server-Timing"].split(", ")
+        self.assertIn(f'desc="{len(queries)} queries"', db)
+        self.assertTrue(serialize.startswith("serialize;dur="))
+        self.assertTrue(total.startswith("total;dur="))
+
+    def test_requests_are_counted_per_route(self):
+        before = self.count_of(self.scrape())
+        client = client_for(self.pm)
+        client.get("/api/tasks/list/")
+        client.get("/api/tasks/list/?fields=id")
+        exposition = self.scrape()
+        self.assertEqual(self.count_of(exposition), before + 2)
+        self.assertIn("# TYPE http_request_duration_seconds histogram", exposition)
+
+    def test_scrape_needs_an_admin(self):
+        self.assertEqual(client_for(self.pm).get("/api/metrics/").status_code, 403)
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = metrics.Registry()
+        labels = (("method", "GET"), ("route", 'a"b'))
+        for value in (0, 3, 500):
+            registry.observe(labels, {"http_request_db_queries": value})
+        lines = registry.exposition().splitlines()
+        self.assertIn('http_request_db_queries_bucket{method="GET",route="a\\"b",le="0"} 1', lines)
+        self.assertIn('http_request_db_queries_bucket{method="GET",route="a\\"b",le="5"} 2', lines)
+        self.assertIn('http_request_db_queries_bucket{method="GET",route="a\\"b",le="200"} 2', lines)
+        self.assertIn('http_request_db_queries_bucket{method="GET",route="a\\"b",le="+Inf"} 3', lines)
+        self.assertIn('http_request_db_queries_sum{method="GET",route="a\\"b"} 503.0', lines)
+
+
+class SparseFieldsTests(TestCase):
+    def setUp(self):
+        self.pm = make_user("pm", "ProjectManager")
+        project = PROJECT.objects.create(
+            title="Project", project_code="P", project_description="d", project_manager=self.pm,
+        )
+        project.developers.add(make_user("dev", "Developer"))
+        TASK.objects.create(title="Task", project=project, created_by=self.pm, assignee=self.pm)
+        self.client = client_for(self.pm)
+        clear_caches()
+
+    def get(self, path):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json(), [q["sql"] for q in queries.captured_queries]
+
+    def test_subset_in_declared_order(self):
+        rows, _ = self.get("/api/tasks/list/?fields=title,id")
+        self.assertEqual([list(row) for row in rows], [["id", "title"]])
+        rows, _ = self.get("/api/tasks/list/?fields=")
+        self.assertEqual(list(rows[0]), list(TaskListLeanSerializer.fields))
+
+    def test_query_is_pruned(self):
+        _, queries = self.get("/api/tasks/list/?fields=id,title")
+        [page] = [sql for sql in queries if "LIMIT" in sql]
+        self.assertNotIn("JOIN", page)
+        self.assertNotIn('"description"', page)
+
+        _, queries = self.get("/api/tasks/list/?fields=id,assignee")
+        [page] = [sql for sql in queries if "LIMIT" in sql]
+        self.assertIn('"auth_user"', page)
+
+    def test_member_queries_skipped(self):
+        _, queries = self.get("/api/projects/pm/?fields=id,title")
+        self.assertFalse([sql for sql in queries if "projects_project_developers" in sql])
+        rows, queries = self.get("/api/projects/pm/?fields=id,developers")
+        self.assertTrue([sql for sql in queries if "projects_project_developers" in sql])
+        self.assertEqual(rows[0]["developers"][0]["username"], "dev")
+
+    def test_unknown_field(self):
+        response = self.client.get("/api/tasks/list/?fields=id,secret")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"fields": ["Unknown field: secret."]})
+
+    def test_subsets_compiled_once(self):
+        self.assertIs(
+            TaskListLeanSerializer.sparse("id,title"), TaskListLeanSerializer.sparse(" title ,id")
+        )
+        self.assertIs(TaskListLeanSerializer.sparse(""), TaskListLeanSerializer)
+
+
+class SerializationTimingTests(TestCase):
+    def test_model_serializer_data(self):
+        pm = make_user("pm", "ProjectManager")
+        project = PROJECT.objects.create(
+            title="Project", project_code="P", project_description="d", project_manager=pm,
+        )
+        for n in range(3):
+            TASK.objects.create(title=f"Task {n}", project=project, created_by=pm)
+
+        request_metrics = metrics.RequestMetrics(None)
+        token = metrics.current.set(request_metrics)
+        try:
+            started = time.perf_counter()
+            # no select_related: every row loads its project and creator
+            TaskListSerializer(TASK.objects.all(), many=True).data
+            elapsed = time.perf_counter() - started
+        finally:
+            metrics.current.reset(token)
+
+        self.assertGreater(request_metrics.serialize_time, 0)
+        self.assertGreater(request_metrics.db_queries, 1)
+        # the lazy loads count as db time only
+        self.assertLessEqual(
+            request_metrics.serialize_time + request_metrics.db_time, elapsed
+        )
+
+
+class SlowQueryTests(TestCase):
+    def test_fingerprint_ignores_literals_and_list_lengths(self):
+        short = slow_queries.normalize("SELECT * FROM t WHERE a = 'it''s' AND b IN (%s, %s) AND c = 10")
+        long = slow_queries.normalize("SELECT *\n FROM t WHERE a = 'x' AND b IN (%s,%s,%s) AND c = 2")
+        self.assertEqual(short, "SELECT * FROM t WHERE a = ? AND b IN (...) AND c = ?")
+        self.assertEqual(slow_queries.fingerprint(short), slow_queries.fingerprint(long))
+
+    @override_settings(SLOW_QUERY_LOG={"THRESHOLD_MS": 0, "EXPLAIN": True, "FILE": None})
+    def test_records_origin_and_plan(self):
+        pm = make_user("pm", "ProjectManager")
+        client = client_for(pm)
+        clear_caches()
+        with self.assertLogs("slow_queries", "WARNING") as logs:
+            client.get("/api/tasks/list/")
+        records = [json.loads(message.split(":", 2)[2]) for message in logs.output]
+        [page] = [record for record in records if "LIMIT" in record["sql"]]
+        self.assertEqual(page["view"], "tasks.interface.views.view.PMTaskListAPIView")
+        self.assertEqual(page["route"], "api/tasks/list/")
+        self.assertTrue(page["explain"])
+        # the EXPLAIN is not itself recorded
+        self.assertFalse([r for r in records if "QUERY PLAN" in r["sql"].upper()])
+
+    def write(self, path, records):
+        path.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+    def record(self, caller, time="2026-10-18T10:00:00+00:00", duration=150.0):
+        return {
+            "time": time, "duration_ms": duration, "fingerprint": "abc", "sql": "SELECT ?",
+            "view": "View", "serializer": None, "caller": caller, "explain": ["SCAN t"],
+        }
+
+    def report(self, *args):
+        out = StringIO()
+        call_command("slow_query_report", *args, stdout=out)
+        return out.getvalue()
+
+    def test_report_reads_backups_oldest_first(self):
+        with tempfile.TemporaryDirectory() as directory:
+            log = Path(directory) / "slow.log"
+            # same time: the record read last, from the newer file, is the latest
+            self.write(Path(f"{log}.10"), [self.record("oldest.py:1")])
+            self.write(Path(f"{log}.2"), [self.record("newer.py:1")])
+            self.write(log, [self.record("newest.py:1", time="2026-10-18T09:00:00+00:00")])
+            Path(f"{log}.old").write_text("not a backup\n")
+
+            out = self.report("--file", str(log))
+            self.assertIn("3 slow queries, 1 fingerprints", out)
+            self.assertIn("450.0 ms total, 3 x, mean 150.0 ms", out)
+            self.assertIn("at newer.py:1", out)
+            self.assertIn("| SCAN t", out)
+
+            out = self.report("--file", str(log), "--since", "2026-10-18T09:30")
+            self.assertIn("2 slow queries", out)
+
+    def test_report_skips_unreadable_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            log = Path(directory) / "slow.log"
+            log.write_text(json.dumps(self.record("a.py:1")) + "\n{truncated\n")
+            self.assertIn(
+                "1 slow queries, 1 fingerprints, 1 unreadable lines skipped",
+                self.report("--file", str(log)),
+            )
+            with self.assertRaisesMessage(CommandError, "No slow-query log"):
+                self.report("--file", str(Path(directory) / "missing.log"))
+
+
+class SQLitePragmaTests(TestCase):
+    """The configured default database, opened on a file of its own."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = f"{directory.name}/db.sqlite3"
+        config = settings.DATABASES["default"]
+        handler = ConnectionHandler({"default": {
+            key: config[key] for key in ("ENGINE", "OPTIONS", "PRAGMAS")
+        } | {"NAME": self.path}})
+        self.db = handler["default"]
+        self.addCleanup(self.db.close)
+
+    def pragma(self, name):
+        with self.db.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied_per_connection(self):
+        with CaptureQueriesContext(self.db) as queries:
+            self.db.ensure_connection()
+        # on the raw connection: not counted as queries
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(self.pragma("journal_mode"), "wal")
+        self.assertEqual(self.pragma("synchronous"), 1)  # NORMAL
+        self.assertEqual(self.pragma("busy_timeout"), 10000)
+        self.assertEqual(self.pragma("cache_size"), -20000)
+        self.assertEqual(self.pragma("mmap_size"), 134217728)
+
+    def test_atomic_takes_the_write_lock_at_once(self):
+        with self.db.cursor() as cursor:
+            cursor.execute("CREATE TABLE t (id integer)")
+        other = sqlite3.connect(self.path, timeout=0)
+        self.addCleanup(other.close)
+
+        # atomic() on this connection rather than the test database's
+        with mock.patch.object(transaction, "get_connection", return_value=self.db), \
+                transaction.atomic():
+            # a read only, yet another writer is already locked out
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT count(*) FROM t")
+            with self.assertRaisesMessage(sqlite3.OperationalError, "locked"):
+                other.execute("BEGIN IMMEDIATE")
+        other.execute("BEGIN IMMEDIATE")
+        other.rollback()
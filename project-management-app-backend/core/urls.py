@@ -0,0 +1,7 @@
+from django.urls import path
+from .interface.views.view import ResponseCacheStatsAPIView, MetricsAPIView
+
+urlpatterns = [
+    path("cache/stats/", ResponseCacheStatsAPIView.as_view()),  # GET (admin)
+    path("metrics/", MetricsAPIView.as_view()),                 # GET (admin), Prometheus
+]
@@ -0,0 +1,270 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import Max, Min
+from django.utils.module_loading import import_string
+
+from .models.events import EVENT
+
+logger = logging.getLogger(__name__)
+
+# DatabaseBroker trims the table to BUFFER_SIZE rows every this many events
+PRUNE_EVERY = 100
+
+
+class Event:
+    """One change notification. ``id`` grows monotonically across restarts."""
+
+    __slots__ = ("id", "type", "project_id", "data")
+
+    def __init__(self, id, type, project_id, data):
+        self.id = id
+        self.type = type
+        self.project_id = project_id
+        self.data = data
+
+
+class Subscription:
+    """
+    A stream's view of the broker: an asyncio queue fed from any thread,
+    filtered to ``project_ids`` (which the stream may refresh in place).
+    """
+
+    def __init__(self, loop, project_ids, max_pending, position):
+        self.loop = loop
+        # id of the newest event published when the subscription started
+        self.position = position
+        self.project_ids = set(project_ids)
+        self.queue = asyncio.Queue(maxsize=max_pending)
+        # set when the client fell too far behind and events were dropped
+        self.overflowed = False
+
+    def deliver(self, event):
+        # runs on the subscriber's event loop
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class BaseBroker:
+    """
+    The event streams of this process. A subscription sees the events of
+    its projects published after ``subscription.position``; fan_out()
+    hands each one to the subscriber's event loop. Subclasses keep the
+    events for ``Last-Event-ID`` resume and decide how they reach every
+    worker.
+    """
+
+    def __init__(self, buffer_size=1000, max_pending=1000, poll_interval=0.5):
+        self.buffer_size = buffer_size
+        self.max_pending = max_pending
+        self.poll_interval = poll_interval
+        self.subscriptions = set()
+        self.lock = threading.Lock()
+
+    def add_subscription(self, loop, project_ids, position):
+        # callers hold self.lock
+        subscription = Subscription(loop, project_ids, self.max_pending, position)
+        self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscriptions.discard(subscription)
+
+    def fan_out(self, events):
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+        for sub in subscriptions:
+            for event in events:
+                if event.id <= sub.position or event.project_id not in sub.project_ids:
+                    continue
+                try:
+                    sub.loop.call_soon_threadsafe(sub.deliver, event)
+                except RuntimeError:
+                    # loop already closed; the stream is gone
+                    self.unsubscribe(sub)
+                    break
+
+
+class InProcessBroker(BaseBroker):
+    """
+    Single-worker broker: a bounded ring buffer of recent events for
+    ``Last-Event-ID`` resume, delivered straight to this process's
+    streams. Event ids are a per-process counter, so with several workers
+    a stream would miss the others' events; use DatabaseBroker there.
+    """
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.buffer = deque(maxlen=self.buffer_size)
+        # seeded from a microsecond clock, so ids keep growing over a restart
+        # and a Last-Event-ID from a previous process reads as too old
+        self.last_id = time.time_ns() // 1000
+
+    def publish(self, type, project_id, data):
+        return self.publish_many([(type, project_id, data)])[0]
+
+    def publish_many(self, changes):
+        """Publish each (type, project_id, data) in order."""
+        with self.lock:
+            events = []
+            for type, project_id, data in changes:
+                self.last_id += 1
+                events.append(Event(self.last_id, type, project_id, data))
+            self.buffer.extend(events)
+        self.fan_out(events)
+        return events
+
+    def subscribe(self, project_ids, last_event_id=None, loop=None):
+        """
+        Returns (subscription, backlog): the buffered events after
+        ``last_event_id``, or None when some of them are no longer
+        buffered and the client has to refetch.
+        """
+        with self.lock:
+            sub = self.add_subscription(
+                loop or asyncio.get_running_loop(), project_ids, self.last_id
+            )
+            if last_event_id is None:
+                return sub, []
+            oldest = self.buffer[0].id if self.buffer else self.last_id + 1
+            if last_event_id < oldest - 1:
+                return sub, None
+            return sub, [
+                event for event in self.buffer
+                if event.id > last_event_id and event.project_id in sub.project_ids
+            ]
+
+
+class DatabaseBroker(BaseBroker):
+    """
+    Broker for any number of workers. Events are rows of the EVENT table,
+    so every worker sees the same ids, and resume reads the table. While
+    a worker has streams open, a poller thread reads the rows published
+    since its last poll every ``poll_interval`` seconds and fans them out.
+
+    Ids are read in order, so they must commit in order: true of SQLite,
+    whose writes are serialized, and of publish()'s single-row autocommit
+    inserts elsewhere only as long as no two commit at the same instant.
+    """
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        # id of the newest row fanned out; None while no stream is open
+        self.last_seen = None
+        self.poller = None
+
+    def publish(self, type, project_id, data):
+        return self.publish_many([(type, project_id, data)])[0]
+
+    def publish_many(self, changes):
+        """Publish each (type, project_id, data) in order: one INSERT."""
+        rows = EVENT.objects.bulk_create([
+            EVENT(type=type, project_id=project_id, data=data)
+            for type, project_id, data in changes
+        ])
+        newest = rows[-1].id if rows else 0
+        if newest // PRUNE_EVERY != (newest - len(rows)) // PRUNE_EVERY:
+            EVENT.objects.filter(id__lte=newest - self.buffer_size).delete()
+        return [self.event_from(row) for row in rows]
+
+    def subscribe(self, project_ids, last_event_id=None, loop=None):
+        """
+        InProcessBroker.subscribe(), reading the table. It queries, so
+        async callers run it in a thread and pass their ``loop``.
+        """
+        with self.lock:
+            if self.last_seen is None:
+                # nobody was listening: start from now
+                self.last_seen = EVENT.objects.aggregate(newest=Max("id"))["newest"] or 0
+            sub = self.add_subscription(
+                loop or asyncio.get_running_loop(), project_ids, self.last_seen
+            )
+            if self.poller is None:
+                self.poller = self.start_poller()
+
+        if last_event_id is None:
+            return sub, []
+        oldest = EVENT.objects.aggregate(oldest=Min("id"))["oldest"]
+        if last_event_id < (oldest or sub.position + 1) - 1:
+            return sub, None
+        rows = EVENT.objects.filter(
+            id__gt=last_event_id, id__lte=sub.position, project_id__in=sub.project_ids,
+        ).order_by("id")
+        return sub, [self.event_from(row) for row in rows]
+
+    def poll(self):
+        """Fan out the rows published since the last poll: one query."""
+        with self.lock:
+            after = self.last_seen
+        if after is None:
+            return
+        events = [
+            self.event_from(row)
+            for row in EVENT.objects.filter(id__gt=after).order_by("id")
+        ]
+        if events:
+            with self.lock:
+                self.last_seen = max(self.last_seen or 0, events[-1].id)
+            self.fan_out(events)
+
+    def start_poller(self):
+        poller = threading.Thread(
+            target=self.run_poller, name="event-broker-poller", daemon=True
+        )
+        poller.start()
+        return poller
+
+    def run_poller(self):
+        try:
+            while True:
+                time.sleep(self.poll_interval)
+                with self.lock:
+                    if not self.subscriptions:
+                        # the next subscription starts a new poller, from then on
+                        self.poller = self.last_seen = None
+                        return
+                close_old_connections()
+                try:
+                    self.poll()
+                except Exception:
+                    # keep serving the streams; the next poll retries
+                    logger.exception("Polling the event table failed.")
+        finally:
+            connection.close()
+
+    @staticmethod
+    def event_from(row):
+        return Event(row.id, row.type, row.project_id, row.data)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """The process-wide broker configured by ``EVENT_STREAM["BROKER"]``."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                options = dict(settings.EVENT_STREAM)
+                broker_class = import_string(options.pop("BROKER"))
+                _broker = broker_class(
+                    buffer_size=options.get("BUFFER_SIZE", 1000),
+                    max_pending=options.get("MAX_PENDING", 1000),
+                    poll_interval=options.get("POLL_INTERVAL", 0.5),
+                )
+    return _broker
@@ -0,0 +1,18 @@
+from django.db import models
+
+
+class EVENT(models.Model):
+    """
+    The change feed shared by every worker (events.infrastructure.broker.
+    DatabaseBroker): one row per published event, its id the event id a
+    client resumes from. Only the newest BUFFER_SIZE rows are kept.
+    """
+
+    type = models.CharField(max_length=40)
+    # no foreign key: a project's deletion is itself announced here
+    project_id = models.BigIntegerField()
+    data = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.id} {self.type}"
@@ -0,0 +1,15 @@
+from django.conf import settings
+from rest_framework_simplejwt.tokens import Token
+
+
+class StreamToken(Token):
+    """
+    Token that opens the event stream and nothing else. EventSource cannot
+    send headers, so it travels in the URL, and URLs end up in access
+    logs: it expires within seconds and the API, which accepts access
+    tokens only, rejects it. Only the connection is checked, a stream
+    outlives its token; a client reconnecting later fetches a new one.
+    """
+
+    token_type = "stream"
+    lifetime = settings.EVENT_STREAM["TOKEN_LIFETIME"]
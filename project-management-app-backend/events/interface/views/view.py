@@ -0,0 +1,161 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import TokenError
+
+from authentication.authentication import StatelessJWTAuthentication
+from projects.infrastructure.models.projects import PROJECT
+
+from ...infrastructure.broker import get_broker
+from ...infrastructure.tokens import StreamToken
+
+
+def format_event(type, data, id=None):
+    lines = [f"id: {id}"] if id is not None else []
+    lines.append(f"event: {type}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def member_project_ids(user_id):
+    projects = PROJECT.objects.filter(
+        Q(project_manager_id=user_id) | Q(developers=user_id) | Q(qas=user_id)
+    ).values_list("pk", flat=True).distinct()
+    return {pk async for pk in projects}
+
+
+async def refresh_membership(subscription, user_id, every):
+    """
+    Re-read the user's projects every ``every`` seconds, however busy or
+    quiet the stream is, so added members start and removed ones stop
+    receiving a project's events.
+    """
+    while True:
+        await asyncio.sleep(every)
+        subscription.project_ids = await member_project_ids(user_id)
+
+
+# ---------- STREAM TOKEN ----------
+
+class EventStreamTokenAPIView(APIView):
+    """A StreamToken for the caller, for EventSource's ``?token=``."""
+
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        token = StreamToken.for_user(request.user)
+        return Response(
+            {"token": str(token), "expires_in": int(token.lifetime.total_seconds())},
+            status=status.HTTP_201_CREATED,
+        )
+
+
+# ---------- STREAM ----------
+
+class EventStreamView(View):
+    """
+    Server-Sent Events stream of task and bug changes in the caller's
+    projects. Needs an ASGI server (uvicorn config.asgi:application):
+    under WSGI the open-ended response would be buffered and never sent,
+    so it is refused. EventSource cannot send headers, so instead of the
+    access token it may send ``?token=`` with a token from
+    EventStreamTokenAPIView. On reconnect the browser sends the
+    ``Last-Event-ID`` header and missed events are replayed from the
+    broker's buffer, or a ``reset`` event tells the client to refetch.
+    """
+
+    authentication = StatelessJWTAuthentication()
+
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(
+                {"detail": "The event stream needs an ASGI server."},
+                status=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+        try:
+            user = self.authenticate(request)
+        except (AuthenticationFailed, NotAuthenticated) as exc:
+            detail = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+            return JsonResponse(detail, status=401)
+
+        last_event_id = request.headers.get("Last-Event-ID") or request.GET.get(
+            "last_event_id"
+        )
+        try:
+            last_event_id = int(last_event_id) if last_event_id else None
+        except ValueError:
+            last_event_id = None
+
+        response = StreamingHttpResponse(
+            self.stream(user.id, last_event_id),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        # keep reverse proxies from buffering the stream
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def authenticate(self, request):
+        # token validation is CPU-only (no DB), so it is safe on the loop
+        header = self.authentication.get_header(request)
+        if header:
+            raw_token = self.authentication.get_raw_token(header)
+            if raw_token is None:
+                raise NotAuthenticated()
+            token = self.authentication.get_validated_token(raw_token)
+        else:
+            # never an access token: the URL is logged
+            raw_token = request.GET.get("token")
+            if raw_token is None:
+                raise NotAuthenticated()
+            try:
+                token = StreamToken(raw_token)
+            except TokenError as exc:
+                raise AuthenticationFailed(str(exc))
+        return self.authentication.get_user(token)
+
+    async def stream(self, user_id, last_event_id):
+        options = settings.EVENT_STREAM
+        broker = get_broker()
+        # the database broker queries, so subscribe in a thread
+        subscription, backlog = await sync_to_async(broker.subscribe)(
+            await member_project_ids(user_id), last_event_id,
+            loop=asyncio.get_running_loop(),
+        )
+        refresher = asyncio.create_task(
+            refresh_membership(subscription, user_id, options["MEMBERSHIP_REFRESH"])
+        )
+        try:
+            yield f"retry: {options['RETRY_MS']}\n\n"
+            if backlog is None:
+                yield format_event("reset", {}, id=subscription.position)
+                backlog = []
+            for event in backlog:
+                yield format_event(event.type, event.data, id=event.id)
+
+            while True:
+                try:
+                    event = await subscription.get(options["HEARTBEAT"])
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if subscription.overflowed:
+                    # the client fell behind and events were dropped
+                    yield format_event("reset", {}, id=event.id)
+                    return
+                yield format_event(event.type, event.data, id=event.id)
+        finally:
+            refresher.cancel()
+            broker.unsubscribe(subscription)
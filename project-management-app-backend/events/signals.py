@@ -0,0 +1,92 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from bugs.infrastructure.models.bugs import BUG
+from core.infrastructure.models.tracking import loaded_values
+from core.signals import bulk_saved
+from tasks.infrastructure.models.tasks import TASK
+
+from .infrastructure.broker import get_broker
+
+
+# -----------------------------
+# PAYLOADS
+# -----------------------------
+# Just enough for a client to patch its list in place; anything else is
+# one refetch away.
+def task_payload(task):
+    return {
+        "id": task.pk,
+        "project": task.project_id,
+        "title": task.title,
+        "status": task.status,
+        "priority": task.priority,
+        "assignee": task.assignee_id,
+        "version": task.version,
+    }
+
+
+def bug_payload(bug):
+    return {
+        "id": bug.pk,
+        "project": bug.project_id,
+        "title": bug.title,
+        "status": bug.status,
+        "severity": bug.severity,
+        "assigned_to": bug.assigned_to_id,
+        "version": bug.version,
+    }
+
+
+STREAMS = {
+    TASK: ("task", task_payload, "is_deleted"),
+    BUG: ("bug", bug_payload, "deleted"),
+}
+
+
+def changes(model, instances, created=False, deleted=False):
+    """(type, project_id, payload) for each saved or deleted row."""
+    name, payload, deleted_flag = STREAMS[model]
+    for instance in instances:
+        data = payload(instance)
+        if deleted or getattr(instance, deleted_flag):
+            action = "deleted"
+        else:
+            action = "created" if created else "updated"
+        yield f"{name}.{action}", instance.project_id, data
+
+        previous = (loaded_values(instance) or {}).get("project_id")
+        if not created and previous not in (None, instance.project_id):
+            # moved: the old project's members see it leave
+            yield f"{name}.deleted", previous, data
+
+
+def publish(model, instances, **kwargs):
+    events = list(changes(model, instances, **kwargs))
+    if not events:
+        return
+
+    def send():
+        get_broker().publish_many(events)
+
+    # never announce a change that may still roll back
+    transaction.on_commit(send)
+
+
+@receiver(post_save, sender=TASK)
+@receiver(post_save, sender=BUG)
+def item_saved(sender, instance, created, **kwargs):
+    publish(sender, [instance], created=created)
+
+
+@receiver(post_delete, sender=TASK)
+@receiver(post_delete, sender=BUG)
+def item_deleted(sender, instance, **kwargs):
+    publish(sender, [instance], deleted=True)
+
+
+@receiver(bulk_saved, sender=TASK)
+@receiver(bulk_saved, sender=BUG)
+def items_bulk_saved(sender, instances, created, **kwargs):
+    publish(sender, instances, created=created)
@@ -0,0 +1,116 @@
+import asyncio
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.test import AsyncClient, TestCase
+from rest_framework.test import APIClient
+
+from core.testing import client_for, make_user
+from events.infrastructure import broker as broker_module
+from events.infrastructure.broker import DatabaseBroker, InProcessBroker
+from events.infrastructure.models.events import EVENT
+from events.interface.views.view import EventStreamView
+from projects.infrastructure.models.projects import PROJECT
+
+
+class EventStreamTokenTests(TestCase):
+    def setUp(self):
+        self.pm = make_user("pm", "ProjectManager")
+        self.client = client_for(self.pm)
+
+    def test_refused_under_wsgi(self):
+        response = self.client.get("/api/events/")
+        self.assertEqual(response.status_code, 501)
+
+    def test_stream_token_is_not_an_access_token(self):
+        token = self.client.post("/api/events/token/").json()["token"]
+        api = APIClient()
+        api.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(api.get("/api/projects/pm/").status_code, 401)
+
+    async def test_access_token_not_accepted_in_url(self):
+        access = self.client._credentials["HTTP_AUTHORIZATION"].split()[1]
+        response = await AsyncClient().get("/api/events/", {"token": access})
+        self.assertEqual(response.status_code, 401)
+
+
+class ManualPollBroker(DatabaseBroker):
+    """Polled by the test rather than by a thread."""
+
+    def start_poller(self):
+        return "manual"
+
+
+class DatabaseBrokerTests(TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def received(self, subscription):
+        # run the deliveries fan_out() scheduled on the subscriber's loop
+        self.loop.run_until_complete(asyncio.sleep(0))
+        events = []
+        while not subscription.queue.empty():
+            events.append(subscription.queue.get_nowait())
+        return events
+
+    def test_workers_share_events(self):
+        publisher, worker = DatabaseBroker(), ManualPollBroker()
+        subscription, backlog = worker.subscribe({1}, loop=self.loop)
+        self.assertEqual(backlog, [])
+
+        with self.assertNumQueries(1):
+            published = publisher.publish_many([
+                ("task.updated", 1, {"id": 1}),
+                ("task.updated", 2, {"id": 2}),
+            ])
+        worker.poll()
+        [event] = self.received(subscription)
+        self.assertEqual(event.id, published[0].id)
+        self.assertEqual(event.data, {"id": 1})
+
+        # already fanned out: the next poll finds nothing new
+        worker.poll()
+        self.assertEqual(self.received(subscription), [])
+
+    def test_resume(self):
+        broker = ManualPollBroker(buffer_size=2)
+        first, second, third = broker.publish_many([
+            ("bug.created", 1, {}), ("bug.created", 2, {}), ("bug.created", 1, {}),
+        ])
+        _, backlog = broker.subscribe({1}, last_event_id=first.id, loop=self.loop)
+        self.assertEqual([event.id for event in backlog], [third.id])
+
+        EVENT.objects.filter(id=first.id).delete()  # pruned
+        _, backlog = broker.subscribe({1}, last_event_id=first.id - 1, loop=self.loop)
+        self.assertIsNone(backlog)
+
+    def test_subscription_sees_only_later_events(self):
+        broker = ManualPollBroker()
+        broker.publish("task.created", 1, {})
+        subscription, _ = broker.subscribe({1}, loop=self.loop)
+        broker.poll()
+        self.assertEqual(self.received(subscription), [])
+
+
+class StreamMembershipTests(TestCase):
+    async def test_refreshed_without_traffic(self):
+        pm = await sync_to_async(make_user)("pm", "ProjectManager")
+        developer = await sync_to_async(make_user)("dev", "Developer")
+        project = await PROJECT.objects.acreate(
+            title="P", project_code="P", project_description="d", project_manager=pm,
+        )
+        broker = InProcessBroker()
+        options = {**settings.EVENT_STREAM, "MEMBERSHIP_REFRESH": 0.01, "HEARTBEAT": 60}
+        with self.settings(EVENT_STREAM=options), patch.object(broker_module, "_broker", broker):
+            stream = EventStreamView().stream(developer.id, None)
+            await anext(stream)  # retry:
+            [subscription] = broker.subscriptions
+            self.assertEqual(subscription.project_ids, set())
+
+            await project.developers.aadd(developer)
+            await asyncio.sleep(0.1)
+            self.assertEqual(subscription.project_ids, {project.id})
+            await stream.aclose()
+        self.assertEqual(broker.subscriptions, set())
@@ -0,0 +1,7 @@
+from django.urls import path
+from .interface.views.view import EventStreamTokenAPIView, EventStreamView
+
+urlpatterns = [
+    path("", EventStreamView.as_view()),  # GET text/event-stream
+    path("token/", EventStreamTokenAPIView.as_view()),
+]
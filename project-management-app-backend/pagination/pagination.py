@@ -0,0 +1,144 @@
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+from rest_framework.response import Response
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Opaque-cursor (keyset) pagination over ``(-created_at, -id)``.
+
+    Each page is a ``WHERE (created_at, id) < <cursor>`` range scan, so
+    fetching page N costs the same as fetching page 1. The cursor holds
+    both keys: rows sharing a created_at are told apart by id, in either
+    direction, where DRF's position-and-offset cursor skips some of them
+    when paging back. The response body stays the
+    plain list the frontend already consumes; cursors for the adjacent
+    pages are sent in an RFC 8288 ``Link`` header.
+
+    ``apaginate_queryset()`` is the same pagination for async views: the
+    page is read with ``aiterator()`` instead of ``list()``.
+    """
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        window = self.page_window(queryset, request, view)
+        if window is None:
+            return None
+        return self.set_page(list(window))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        window = self.page_window(queryset, request, view)
+        if window is None:
+            return None
+        return self.set_page([
+            obj async for obj in window.aiterator(chunk_size=self.page_size + 1)
+        ])
+
+    # CursorPagination.paginate_queryset(), split around the one query it
+    # runs so the sync and async paths share everything else.
+    def page_window(self, queryset, request, view=None):
+        """The sliced queryset holding this page plus one lookahead row."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+        self.window = (offset, reverse, current_position)
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            order = self.ordering[0]
+            is_reversed = order.startswith("-")
+            order_attr = order.lstrip("-")
+            try:
+                value, pk = json.loads(current_position)
+            except (TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+
+            # (cursor reversed) XOR (queryset reversed); written as a range
+            # on the first key so the index seeks to it
+            before = self.cursor.reverse != is_reversed
+            start, passed = ("lte", "gte") if before else ("gte", "lte")
+            queryset = queryset.filter(
+                Q(**{f"{order_attr}__{start}": value})
+                & ~Q(**{order_attr: value, f"id__{passed}": pk})
+            )
+
+        return queryset[offset:offset + self.page_size + 1]
+
+    def _get_position_from_instance(self, instance, ordering):
+        # the first key and the id, the last one, which no two rows share
+        position = [super()._get_position_from_instance(instance, ordering)]
+        position.append(instance["id"] if isinstance(instance, dict) else instance.id)
+        return json.dumps(position)
+
+    def set_page(self, results):
+        """Record the fetched window as the current page and its neighbours."""
+        offset, reverse, current_position = self.window
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            # the query ran in reverse; restore the requested order
+            self.page = list(reversed(self.page))
+
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        links = []
+        next_url = self.get_next_link()
+        previous_url = self.get_previous_link()
+
+        if next_url:
+            links.append(f'<{next_url}>; rel="next"')
+        if previous_url:
+            links.append(f'<{previous_url}>; rel="prev"')
+
+        headers = {"Link": ", ".join(links)} if links else None
+        return Response(data, headers=headers)
+
+
+class RankCursorPagination(CreatedAtCursorPagination):
+    """The same keyset pagination over a board column's ``(rank, id)``."""
+    ordering = ("rank", "id")
+    page_size = 25
@@ -1,22 +1,109 @@
+from django.contrib.auth.models import Group
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
 from rest_framework.permissions import BasePermission
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 
+# Access tokens carry the user's group names under this claim (see
+# user_management.infrastructure.tokens), so role checks need no query.
+ROLES_CLAIM = "roles"
+
+# settings.CACHES alias holding the current roles of changed users
+ROLE_CACHE = "roles"
+
+# backends whose entries other worker processes never see
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+def current_roles_key(user_id):
+    return f"roles:{user_id}"
+
+
+def role_cache():
+    return caches[ROLE_CACHE]
+
+
+def claims_trusted():
+    """
+    Whether the roles claim may be used at all. A revocation is recorded
+    in the role cache by whichever process handled it; unless every
+    worker reads that same cache, the others would keep trusting the
+    revoked claim until the token expires. So fail closed: with a
+    per-process cache, every role check goes to the database.
+    """
+    return not isinstance(role_cache(), PROCESS_LOCAL_CACHES)
+
+
+def token_roles(request):
+    """
+    The user's roles without a database query, or None when they have to
+    come from the database: tokens issued before the roles claim existed,
+    or a role cache that is not shared by every worker.
+
+    When group membership changes, user_management.signals caches the new
+    roles for the lifetime of an access token; that entry wins over the
+    (possibly stale) claim of any token issued before the change.
+    """
+    token = request.auth
+    if token is None or ROLES_CLAIM not in token or not claims_trusted():
+        return None
+
+    current = role_cache().get(current_roles_key(token[jwt_settings.USER_ID_CLAIM]))
+    return token[ROLES_CLAIM] if current is None else current
+
+
+async def atoken_roles(request):
+    token = request.auth
+    if token is None or ROLES_CLAIM not in token or not claims_trusted():
+        return None
+
+    current = await role_cache().aget(current_roles_key(token[jwt_settings.USER_ID_CLAIM]))
+    return token[ROLES_CLAIM] if current is None else current
+
+
+def has_role(request, role):
+    if not request.user.is_authenticated:
+        return False
+
+    roles = token_roles(request)
+    if roles is None:
+        # legacy token or unshared role cache: ask the database, by id so
+        # a token user does not load its row first
+        return Group.objects.filter(user=request.user.id, name=role).exists()
+    return role in roles
+
+
+async def ahas_role(request, role):
+    if not request.user.is_authenticated:
+        return False
+
+    roles = await atoken_roles(request)
+    if roles is None:
+        # by id: request.user may be a token user that would load its row
+        return await Group.objects.filter(user=request.user.id, name=role).aexists()
+    return role in roles
+
+
+# ahas_permission() is what core.async_views.AsyncAPIView awaits instead
+# of has_permission(), so role checks never block the event loop.
 class isProjectManager(BasePermission):
     def has_permission(self, request, view):
-        return (
-            request.user.is_authenticated and
-            request.user.groups.filter(name="ProjectManager").exists()
-        )
+        return has_role(request, "ProjectManager")
+
+    async def ahas_permission(self, request, view):
+        return await ahas_role(request, "ProjectManager")
 
 class isQA(BasePermission):
     def has_permission(self, request, view):
-        return (
-            request.user.is_authenticated and
-            request.user.groups.filter(name="QA").exists()
-        )
+        return has_role(request, "QA")
+
+    async def ahas_permission(self, request, view):
+        return await ahas_role(request, "QA")
         
 class isDeveloper(BasePermission):
     def has_permission(self, request, view):
-        return (
-            request.user.is_authenticated and
-            request.user.groups.filter(name="Developer").exists()
-        )
\ No newline at end of file
+        return has_role(request, "Developer")
+
+    async def ahas_permission(self, request, view):
+        return await ahas_role(request, "Developer")
@@ -0,0 +1,180 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from core.infrastructure.models.tracking import loaded_values
+from projects.infrastructure.models.projects import PROJECT
+from tasks.infrastructure.models.tasks import TASK
+from bugs.infrastructure.models.bugs import BUG
+
+COUNTER_FIELDS = ("open_task_count", "open_bug_count", "critical_bug_count")
+
+OPEN_BUG_STATUSES = (BUG.Status.NEW, BUG.Status.IN_PROGRESS)
+
+
+# -----------------------------
+# WHAT EACH ROW CONTRIBUTES
+# -----------------------------
+# A state comes from whichever fields an instance had loaded: with
+# .only()/.defer() some are missing, and None means "unknown".
+def task_counters(state):
+    """Counter contributions of one task state (a dict of attnames)."""
+    is_deleted, status = state.get("is_deleted"), state.get("status")
+    if is_deleted is None or status is None:
+        return None
+    if is_deleted or status == TASK.Status.DONE:
+        return {}
+    return {"open_task_count": 1}
+
+
+def bug_counters(state):
+    """Counter contributions of one bug state (a dict of attnames)."""
+    deleted, status, severity = (
+        state.get("deleted"), state.get("status"), state.get("severity")
+    )
+    if deleted is None or status is None or severity is None:
+        return None
+    if deleted or status not in OPEN_BUG_STATUSES:
+        return {}
+    if severity == BUG.Severity.CRITICAL:
+        return {"open_bug_count": 1, "critical_bug_count": 1}
+    return {"open_bug_count": 1}
+
+
+CONTRIBUTIONS = {TASK: task_counters, BUG: bug_counters}
+
+
+# -----------------------------
+# INCREMENTAL UPDATES
+# -----------------------------
+def _current_state(instance):
+    # deferred fields stay out: reading them would query, or fail on a
+    # deleted row
+    return {
+        field.attname: instance.__dict__[field.attname]
+        for field in instance._meta.concrete_fields
+        if field.attname in instance.__dict__
+    }
+
+
+def _project_ids(model, instance, states):
+    project_ids = {state.get("project_id") for state, _ in states} - {None}
+    if not project_ids:
+        # project_id was deferred too: the saved row still knows it
+        project_ids = set(
+            model._base_manager.filter(pk=instance.pk).values_list("project_id", flat=True)
+        )
+    return project_ids
+
+
+def counter_deltas(model, instances, created=False, deleted=False):
+    """
+    ``(deltas, unknown)`` for a batch of saved or deleted rows: deltas is
+    {project_id: Counter(field -> delta)}, from the difference between
+    their loaded and current state; unknown holds the projects of rows
+    whose state lacks a field the counters depend on, to be recounted
+    instead. Moving a row to another project counts as leaving one and
+    joining the other.
+    """
+    contribution = CONTRIBUTIONS[model]
+    deltas = defaultdict(Counter)
+    unknown = set()
+    for instance in instances:
+        current = _current_state(instance)
+        if deleted:
+            before, after = current, None
+        else:
+            before = None if created else loaded_values(instance)
+            after = current
+        states = [
+            (state, sign) for state, sign in ((before, -1), (after, 1))
+            if state is not None
+        ]
+        contributions = [
+            contribution(state) if "project_id" in state else None
+            for state, _ in states
+        ]
+        if None in contributions:
+            unknown.update(_project_ids(model, instance, states))
+            continue
+        for (state, sign), counts in zip(states, contributions):
+            for field, count in counts.items():
+                deltas[state["project_id"]][field] += sign * count
+    deltas = {
+        project_id: counter
+        for project_id, counter in deltas.items()
+        if any(counter.values()) and project_id not in unknown
+    }
+    return deltas, unknown
+
+
+def apply_deltas(deltas):
+    """One F() UPDATE per affected project; returns the updated project ids."""
+    now = timezone.now()
+    for project_id, counter in deltas.items():
+        PROJECT.objects.filter(pk=project_id).update(
+            # counters are rendered in project lists, so their ETag moves too
+            updated_at=now,
+            **{field: F(field) + delta for field, delta in counter.items() if delta},
+        )
+    return list(deltas)
+
+
+def recount(project_ids):
+    """Store freshly counted counters on these projects; returns their ids."""
+    project_ids = sorted(project_ids)
+    if not project_ids:
+        return []
+    with transaction.atomic():
+        # locked where the backend supports it, like `manage.py recount`
+        projects = list(
+            PROJECT.objects.select_for_update().filter(pk__in=project_ids).only("pk")
+        )
+        expected = expected_counters(project.pk for project in projects)
+        now = timezone.now()
+        for project in projects:
+            project.updated_at = now
+            for field, count in expected[project.pk].items():
+                setattr(project, field, count)
+        PROJECT.objects.bulk_update(projects, [*COUNTER_FIELDS, "updated_at"])
+    return [project.pk for project in projects]
+
+
+# -----------------------------
+# FULL RECOUNT
+# -----------------------------
+def expected_counters(project_ids):
+    """{project_id: {field: count}} recomputed from scratch, two GROUP BYs."""
+    project_ids = list(project_ids)
+    result = {
+        project_id: dict.fromkeys(COUNTER_FIELDS, 0) for project_id in project_ids
+    }
+
+    open_tasks = (
+        TASK.objects.filter(project_id__in=project_ids, is_deleted=False)
+        .exclude(status=TASK.Status.DONE)
+        .values("project_id")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    for row in open_tasks:
+        result[row["project_id"]]["open_task_count"] = row["count"]
+
+    open_bugs = (
+        BUG.objects.filter(
+            project_id__in=project_ids, deleted=False, status__in=OPEN_BUG_STATUSES
+        )
+        .values("project_id")
+        .annotate(
+            count=Count("id"),
+            critical=Count("id", filter=Q(severity=BUG.Severity.CRITICAL)),
+        )
+        .order_by()
+    )
+    for row in open_bugs:
+        result[row["project_id"]]["open_bug_count"] = row["count"]
+        result[row["project_id"]]["critical_bug_count"] = row["critical"]
+
+    return result
@@ -0,0 +1,164 @@
+import csv
+import datetime
+import itertools
+import json
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+
+from tasks.infrastructure.models.tasks import TASK
+from bugs.infrastructure.models.bugs import BUG
+
+# rows fetched per database round trip / rows per yielded chunk
+CHUNK_SIZE = 2000
+
+# export column -> values() lookup
+COLUMNS = {
+    "tasks": {
+        "id": "id",
+        "title": "title",
+        "description": "description",
+        "status": "status",
+        "priority": "priority",
+        "assignee": "assignee__username",
+        "created_by": "created_by__username",
+        "due_date": "due_date",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    },
+    "bugs": {
+        "id": "id",
+        "title": "title",
+        "description": "description",
+        "status": "status",
+        "severity": "severity",
+        "reported_by": "reported_by__username",
+        "assigned_to": "assigned_to__username",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    },
+}
+
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+def export_rows(kind, project_id):
+    """
+    Tuples of the live rows of one project, in id order. values_list()
+    skips model instances and iterator() keeps only one chunk in memory
+    (a server-side cursor on PostgreSQL).
+    """
+    queryset = (
+        TASK.objects.filter(is_deleted=False)
+        if kind == "tasks"
+        else BUG.objects.filter(deleted=False)
+    )
+    return (
+        queryset.filter(project_id=project_id)
+        .order_by("id")
+        .values_list(*COLUMNS[kind].values())
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+
+
+async def aexport_rows(kind, project_id):
+    """
+    export_rows() as an async iterator, for streaming under ASGI: each
+    chunk is fetched in a thread. (values_list().aiterator() would open
+    its cursor on the event loop.)
+    """
+    rows = export_rows(kind, project_id)
+    fetch = sync_to_async(lambda: list(itertools.islice(rows, CHUNK_SIZE)))
+    while chunk := await fetch():
+        for row in chunk:
+            yield row
+
+
+class _Line:
+    """File-like sink for csv.writer: write() hands the line back."""
+
+    def write(self, value):
+        return value
+
+
+def _chunks(lines):
+    lines = iter(lines)
+    # first row on its own, so the client sees bytes as soon as the
+    # query returns; then one write per chunk
+    yield from itertools.islice(lines, 1)
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == CHUNK_SIZE:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+async def _achunks(lines):
+    chunk = None
+    async for line in lines:
+        if chunk is None:
+            yield line
+            chunk = []
+            continue
+        chunk.append(line)
+        if len(chunk) == CHUNK_SIZE:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def _scalar(value):
+    # dates and datetimes formatted the way DRF renders them in the API
+    if isinstance(value, datetime.datetime):
+        value = timezone.localtime(value).isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+def _csv_line(writer, row):
+    return writer.writerow([_scalar(value) for value in row])
+
+
+def _ndjson_line(columns, row):
+    return json.dumps(dict(zip(columns, row)), default=_scalar, separators=(",", ":")) + "\n"
+
+
+def stream_csv(kind, project_id):
+    writer = csv.writer(_Line())
+    # the header goes out before the query runs
+    yield writer.writerow(COLUMNS[kind])
+    yield from _chunks(_csv_line(writer, row) for row in export_rows(kind, project_id))
+
+
+def stream_ndjson(kind, project_id):
+    columns = list(COLUMNS[kind])
+    yield from _chunks(_ndjson_line(columns, row) for row in export_rows(kind, project_id))
+
+
+# The same streams as async iterators. Under ASGI a sync iterator is
+# consumed whole in a thread before the first byte is sent.
+async def astream_csv(kind, project_id):
+    writer = csv.writer(_Line())
+    yield writer.writerow(COLUMNS[kind])
+    async for chunk in _achunks(
+        _csv_line(writer, row) async for row in aexport_rows(kind, project_id)
+    ):
+        yield chunk
+
+
+async def astream_ndjson(kind, project_id):
+    columns = list(COLUMNS[kind])
+    async for chunk in _achunks(
+        _ndjson_line(columns, row) async for row in aexport_rows(kind, project_id)
+    ):
+        yield chunk
+
+
+STREAMS = {"csv": stream_csv, "ndjson": stream_ndjson}
+ASYNC_STREAMS = {"csv": astream_csv, "ndjson": astream_ndjson}
@@ -35,6 +35,25 @@ class PROJECT(models.Model):
     )
     
     created_at = models.DateTimeField(auto_now_add=True)
+    # bumped by assignment changes too; drives list ETags
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # -----------------------------
+    # DENORMALIZED COUNTERS
+    # kept in step by projects.signals, rebuilt by `manage.py recount`
+    # -----------------------------
+    open_task_count = models.PositiveIntegerField(default=0)
+    open_bug_count = models.PositiveIntegerField(default=0)
+    critical_bug_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # PMProjectListAPIView: project_manager = ? ORDER BY -created_at, -id
+            models.Index(
+                fields=["project_manager", "-created_at", "-id"],
+                name="project_pm_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
\ No newline at end of file
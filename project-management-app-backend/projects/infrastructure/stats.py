@@ -0,0 +1,51 @@
+from django.db.models import Count
+
+from tasks.infrastructure.models.tasks import TASK
+from bugs.infrastructure.models.bugs import BUG
+
+
+def _breakdown(queryset, dimensions, project_ids):
+    """
+    One GROUP BY (project, *dimensions) over ``queryset``; the per-dimension
+    counts are folded from those cells in Python. Every choice is present,
+    zero-filled, so clients don't have to special-case missing keys.
+    """
+    def empty():
+        stats = {"total": 0}
+        for name, choices in dimensions.items():
+            stats[f"by_{name}"] = {value: 0 for value in choices.values}
+        return stats
+
+    result = {project_id: empty() for project_id in project_ids}
+
+    cells = queryset.filter(project_id__in=project_ids).values(
+        "project_id", *dimensions
+    ).annotate(count=Count("id")).order_by()
+
+    for cell in cells:
+        stats = result[cell["project_id"]]
+        stats["total"] += cell["count"]
+        for name in dimensions:
+            stats[f"by_{name}"][cell[name]] = (
+                stats[f"by_{name}"].get(cell[name], 0) + cell["count"]
+            )
+    return result
+
+
+def project_stats(project_ids):
+    """Task and bug counts for each project, two aggregate queries in total."""
+    project_ids = list(project_ids)
+    tasks = _breakdown(
+        TASK.objects.filter(is_deleted=False),
+        {"status": TASK.Status, "priority": TASK.Priority},
+        project_ids,
+    )
+    bugs = _breakdown(
+        BUG.objects.filter(deleted=False),
+        {"status": BUG.Status, "severity": BUG.Severity},
+        project_ids,
+    )
+    return [
+        {"project": project_id, "tasks": tasks[project_id], "bugs": bugs[project_id]}
+        for project_id in project_ids
+    ]
@@ -1,5 +1,8 @@
 from rest_framework import serializers
-from django.contrib.auth.models import User
+from django.contrib.auth.models import User, Group
+from django.db.models import Prefetch, Q
+from core.lean import LeanSerializer, Nested, Filled, Date
+from core.metrics import TimedSerializerMixin
 from ...infrastructure.models.projects import PROJECT
 
 
@@ -16,8 +19,10 @@ class SimpleUserSerializer(serializers.ModelSerializer):
         fields = ["id", "username", "name", "role"]
 
     def get_role(self, obj):
-        group = obj.groups.first()
-        return group.name if group else None
+        # Read through .all() so a prefetched "groups" cache is used;
+        # .first() would always issue its own query.
+        groups = list(obj.groups.all())
+        return groups[0].name if groups else None
 
 
 # =====================================================
@@ -114,7 +119,7 @@ class ProjectAssignSerializer(serializers.ModelSerializer):
 # LIST / READ PROJECT (ALL ROLES)
 # =====================================================
 
-class ProjectListSerializer(serializers.ModelSerializer):
+class ProjectListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     project_manager = SimpleUserSerializer(read_only=True)
     developers = SimpleUserSerializer(many=True, read_only=True)
     qas = SimpleUserSerializer(many=True, read_only=True)
@@ -131,4 +136,107 @@ class ProjectListSerializer(serializers.ModelSerializer):
             "project_manager",
             "developers",
             "qas",
+            "open_task_count",
+            "open_bug_count",
+            "critical_bug_count",
         ]
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Declared query plan for list views: the manager is joined in,
+        members and every user's groups are prefetched, so a page of
+        projects costs a fixed number of queries.
+        """
+        role_groups = Group.objects.order_by("id")
+        # members in id order, as ProjectListLeanSerializer lists them
+        members = User.objects.order_by("id").prefetch_related(
+            Prefetch("groups", queryset=role_groups)
+        )
+        return queryset.select_related("project_manager").prefetch_related(
+            Prefetch("project_manager__groups", queryset=role_groups),
+            Prefetch("developers", queryset=members),
+            Prefetch("qas", queryset=members),
+        )
+
+
+class ProjectListLeanSerializer(LeanSerializer):
+    """
+    ProjectListSerializer over values_list() rows, same output. The
+    manager is joined in; members and roles come from two flat queries on
+    the through tables per page instead of model prefetches.
+    """
+
+    fields = {
+        "id": "id",
+        "title": "title",
+        "project_description": "project_description",
+        "status": "status",
+        "start_date": Date("start_date"),
+        "due_date": Date("due_date"),
+        "project_manager": Nested("project_manager_id", {
+            "id": "project_manager_id",
+            "username": "project_manager__username",
+            "name": "project_manager__first_name",
+            "role": Filled(),
+        }),
+        "developers": Filled(),
+        "qas": Filled(),
+        "open_task_count": "open_task_count",
+        "open_bug_count": "open_bug_count",
+        "critical_bug_count": "critical_bug_count",
+    }
+
+    MEMBERS = {"developers": PROJECT.developers.through, "qas": PROJECT.qas.through}
+
+    @classmethod
+    def related_querysets(cls, rows):
+        # a sparse subset skips the member and role queries it has no use for
+        members = [name for name in cls.MEMBERS if name in cls.columns]
+        with_manager = "project_manager" in cls.columns
+        if not members and not with_manager:
+            return {}
+
+        project_ids = [row.id for row in rows]
+        related = {}
+        member_ids = Q()
+        if with_manager:
+            member_ids |= Q(user_id__in={row.project_manager_id for row in rows} - {None})
+        for name in members:
+            memberships = cls.MEMBERS[name].objects.filter(project_id__in=project_ids)
+            related[name] = memberships.order_by("user_id").values_list(
+                "project_id", "user_id", "user__username", "user__first_name"
+            )
+            member_ids |= Q(user_id__in=memberships.values("user_id"))
+        # ordered by group id: the first row per user is its role, as in
+        # SimpleUserSerializer.get_role()
+        related["roles"] = (
+            User.groups.through.objects.filter(member_ids)
+            .order_by("group_id")
+            .values_list("user_id", "group__name")
+        )
+        return related
+
+    @classmethod
+    def represent(cls, rows, related):
+        roles = {}
+        for user_id, role in related.get("roles", ()):
+            roles.setdefault(user_id, role)
+        members = {name: {} for name in cls.MEMBERS if name in related}
+        for name, by_project in members.items():
+            for project_id, user_id, username, first_name in related[name]:
+                by_project.setdefault(project_id, []).append({
+                    "id": user_id,
+                    "username": username,
+                    "name": first_name,
+                    "role": roles.get(user_id),
+                })
+
+        data = super().represent(rows, related)
+        for row, item in zip(rows, data):
+            manager = item.get("project_manager")
+            if manager is not None:
+                manager["role"] = roles.get(manager["id"])
+            for name, by_project in members.items():
+                item[name] = by_project.get(row.id, [])
+        return data
@@ -4,12 +4,27 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from django.shortcuts import get_object_or_404
+from django.db import transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Q
+from django.http import Http404, StreamingHttpResponse
+from rest_framework.negotiation import BaseContentNegotiation
 
+from authentication.authentication import StatelessJWTAuthentication
 from permissions.permissions import isProjectManager
+from pagination.pagination import CreatedAtCursorPagination
+from core.async_views import AsyncListAPIView
+from core.branches import branches, union_of
+from core.lean import SparseFieldsMixin
+from core.conditional import conditional_list
+from core.replicas import replica_reads
+from core.response_cache import cached_list
 from ...infrastructure.models.projects import PROJECT
+from ...infrastructure.stats import project_stats
+from ...infrastructure.export import ASYNC_STREAMS, MEDIA_TYPES, STREAMS
 from ..serializers.serializer import (
-    ProjectCreateSerializer, SimpleUserSerializer, ProjectAssignSerializer, ProjectListSerializer
-    
+    ProjectCreateSerializer, SimpleUserSerializer, ProjectAssignSerializer, ProjectListSerializer,
+    ProjectListLeanSerializer,
 )
 
 # ---------- CREATE PROJECT (PM) ----------
@@ -17,6 +32,7 @@ class ProjectCreateAPIView(APIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, isProjectManager]
     
+    @transaction.atomic
     def post(self, request):
         serializer = ProjectCreateSerializer(
             data = request.data,
@@ -35,6 +51,7 @@ class ProjectAssignAPIView(APIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, isProjectManager]
 
+    @transaction.atomic
     def patch(self, request, pk):
         project = get_object_or_404(PROJECT, pk=pk)
         serializer = ProjectAssignSerializer(
@@ -50,32 +67,172 @@ class ProjectAssignAPIView(APIView):
         )
         
 # ---------- LIST PROJECTS FOR PM ----------
-class PMProjectListAPIView(APIView):
-    authentication_classes = [JWTAuthentication]
+class PMProjectListAPIView(SparseFieldsMixin, APIView):
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated, isProjectManager]
+    serializer_class = ProjectListLeanSerializer
+
+    def get_scope(self):
+        return PROJECT.objects.filter(project_manager_id=self.request.user.id)
 
+    @replica_reads
+    @cached_list("projects")
+    @conditional_list
     def get(self, request):
-        projects = PROJECT.objects.filter(project_manager=request.user)
-        return Response(ProjectListSerializer(projects, many=True).data)
+        paginator = CreatedAtCursorPagination()
+        page = paginator.paginate_queryset(
+            self.get_queryset(), request, view=self
+        )
+        return paginator.get_paginated_response(
+            self.get_serializer_class().serialize(page)
+        )
     
 
 # ---------- LIST PROJECTS FOR DEV ----------
 
-class DeveloperProjectListAPIView(APIView):
-    authentication_classes = [JWTAuthentication]
+class DeveloperProjectListAPIView(SparseFieldsMixin, APIView):
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
+    serializer_class = ProjectListLeanSerializer
 
+    def get_scope(self):
+        return PROJECT.objects.filter(pk__in=self.member_of())
+
+    def member_of(self):
+        return PROJECT.developers.through.objects.filter(
+            user_id=self.request.user.id
+        ).values_list("project_id", flat=True)
+
+    def get_queryset(self):
+        # one single-row branch per project, merged in page order
+        projects = self.get_serializer_class().project(PROJECT.objects.all())
+        return union_of(branches(projects, "pk", self.member_of()))
+
+    @replica_reads
+    @cached_list("projects")
+    @conditional_list
     def get(self, request):
-        projects = PROJECT.objects.filter(developers=request.user)
-        return Response(ProjectListSerializer(projects, many=True).data)
+        paginator = CreatedAtCursorPagination()
+        page = paginator.paginate_queryset(
+            self.get_queryset(), request, view=self
+        )
+        return paginator.get_paginated_response(
+            self.get_serializer_class().serialize(page)
+        )
 
 
 # ---------- LIST PROJECTS FOR QA ----------
 
-class QAProjectListAPIView(APIView):
-    authentication_classes = [JWTAuthentication]
+class QAProjectListAPIView(SparseFieldsMixin, APIView):
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    serializer_class = ProjectListLeanSerializer
+
+    def get_scope(self):
+        return PROJECT.objects.filter(pk__in=self.member_of())
+
+    def member_of(self):
+        return PROJECT.qas.through.objects.filter(
+            user_id=self.request.user.id
+        ).values_list("project_id", flat=True)
+
+    def get_queryset(self):
+        # one single-row branch per project, merged in page order
+        projects = self.get_serializer_class().project(PROJECT.objects.all())
+        return union_of(branches(projects, "pk", self.member_of()))
+
+    @replica_reads
+    @cached_list("projects")
+    @conditional_list
+    def get(self, request):
+        paginator = CreatedAtCursorPagination()
+        page = paginator.paginate_queryset(
+            self.get_queryset(), request, view=self
+        )
+        return paginator.get_paginated_response(
+            self.get_serializer_class().serialize(page)
+        )
+
+
+# ---------- ASYNC LIST VIEWS (ASGI, settings.ASYNC_LIST_VIEWS) ----------
+
+class AsyncPMProjectListAPIView(AsyncListAPIView, PMProjectListAPIView):
+    cache_scope = "projects"
+
+
+class AsyncDeveloperProjectListAPIView(AsyncListAPIView, DeveloperProjectListAPIView):
+    cache_scope = "projects"
+
+
+class AsyncQAProjectListAPIView(AsyncListAPIView, QAProjectListAPIView):
+    cache_scope = "projects"
+
+
+# ---------- PROJECT STATS (PM / DEV / QA) ----------
+
+class ProjectStatsAPIView(APIView):
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
+    def get(self, request, pk):
+        user_id = request.user.id
+        is_member = PROJECT.objects.filter(pk=pk).filter(
+            Q(project_manager_id=user_id) |
+            Q(developers=user_id) |
+            Q(qas=user_id)
+        ).exists()
+        if not is_member:
+            raise Http404
+
+        return Response(project_stats([pk])[0])
+
+
+# ---------- STATS FOR ALL PM PROJECTS ----------
+
+class PMProjectStatsAPIView(APIView):
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated, isProjectManager]
+
     def get(self, request):
-        projects = PROJECT.objects.filter(qas=request.user)
-        return Response(ProjectListSerializer(projects, many=True).data)
+        project_ids = PROJECT.objects.filter(
+            project_manager_id=request.user.id
+        ).order_by("-created_at", "-id").values_list("id", flat=True)
+        return Response(project_stats(project_ids))
+
+
+# ---------- STREAMING EXPORT (PM) ----------
+
+class FirstRendererNegotiation(BaseContentNegotiation):
+    # the export format is in the path; only error bodies are rendered,
+    # whatever Accept header a download link sends
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+
+class ProjectExportAPIView(APIView):
+    """
+    GET <pk>/export/<tasks|bugs>.<csv|ndjson>: every live row of one of
+    the caller's projects, streamed chunk by chunk.
+    """
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated, isProjectManager]
+    content_negotiation_class = FirstRendererNegotiation
+
+    def get(self, request, pk, kind, fmt):
+        project = PROJECT.objects.filter(
+            pk=pk, project_manager_id=request.user.id
+        ).values("id", "project_code").first()
+        if project is None:
+            raise Http404
+
+        # ASGI streams an async iterator as it goes; WSGI needs a sync one
+        streams = ASYNC_STREAMS if isinstance(request._request, ASGIRequest) else STREAMS
+        response = StreamingHttpResponse(
+            streams[fmt](kind, project["id"]), content_type=MEDIA_TYPES[fmt]
+        )
+        filename = f"{project['project_code'] or project['id']}-{kind}.{fmt}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
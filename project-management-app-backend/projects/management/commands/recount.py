@@ -0,0 +1,84 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.signals import bulk_saved
+from projects.infrastructure.counters import COUNTER_FIELDS, expected_counters
+from projects.infrastructure.models.projects import PROJECT
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the denormalized open task/bug counters on every project "
+        "and report the ones that had drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=500,
+            help="Projects recounted per pair of GROUP BY queries.",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Report drift without writing the corrected counts.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        checked = drifted = 0
+        last_id = 0
+
+        while True:
+            # count and write under one transaction, with the batch locked
+            # where the backend supports it, so concurrent increments are
+            # not overwritten with a stale total
+            with transaction.atomic():
+                projects = list(
+                    PROJECT.objects.select_for_update()
+                    .filter(pk__gt=last_id)
+                    .order_by("pk")
+                    .only("pk", *COUNTER_FIELDS)[:batch_size]
+                )
+                if not projects:
+                    break
+                last_id = projects[-1].pk
+                checked += len(projects)
+                stale = self.find_drift(projects)
+                drifted += len(stale)
+
+                if stale and not options["dry_run"]:
+                    now = timezone.now()
+                    for project in stale:
+                        project.updated_at = now
+                    PROJECT.objects.bulk_update(
+                        stale, [*COUNTER_FIELDS, "updated_at"]
+                    )
+                    bulk_saved.send(sender=PROJECT, instances=stale, created=False)
+
+        verb = "would be corrected" if options["dry_run"] else "corrected"
+        self.stdout.write(
+            f"{checked} project(s) checked, {drifted} with drift {verb}."
+        )
+
+    def find_drift(self, projects):
+        """Report and correct (in memory) every project whose counters drifted."""
+        expected = expected_counters(project.pk for project in projects)
+        stale = []
+        for project in projects:
+            diff = {
+                field: (getattr(project, field), count)
+                for field, count in expected[project.pk].items()
+                if getattr(project, field) != count
+            }
+            if not diff:
+                continue
+            stale.append(project)
+            self.stdout.write(self.style.WARNING(
+                f"project {project.pk}: " + ", ".join(
+                    f"{field} {stored} -> {count}"
+                    for field, (stored, count) in diff.items()
+                )
+            ))
+            for field, (_, count) in diff.items():
+                setattr(project, field, count)
+        return stale
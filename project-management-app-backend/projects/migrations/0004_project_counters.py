@@ -0,0 +1,57 @@
+# Generated by Django 6.0.1 on 2026-10-18 13:10
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Project = apps.get_model("projects", "PROJECT")
+    Task = apps.get_model("tasks", "TASK")
+    Bug = apps.get_model("bugs", "BUG")
+
+    def count_of(queryset, **extra):
+        counted = (
+            queryset.filter(project=OuterRef("pk"), **extra)
+            .values("project")
+            .annotate(n=Count("id"))
+            .values("n")
+        )
+        return Coalesce(Subquery(counted), 0)
+
+    open_bugs = Bug.objects.filter(deleted=False, status__in=["NEW", "IN_PROGRESS"])
+    Project.objects.update(
+        open_task_count=count_of(
+            Task.objects.filter(is_deleted=False).exclude(status="DONE")
+        ),
+        open_bug_count=count_of(open_bugs),
+        critical_bug_count=count_of(open_bugs, severity="CRITICAL"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_updated_at'),
+        ('tasks', '0002_list_endpoint_indexes'),
+        ('bugs', '0002_list_endpoint_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='critical_bug_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='open_bug_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='open_task_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
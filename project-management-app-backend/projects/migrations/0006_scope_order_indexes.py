@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_live_order_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='project',
+            name='project_created_idx',
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from bugs.infrastructure.models.bugs import BUG
+from core.signals import bulk_saved
+from tasks.infrastructure.models.tasks import TASK
+
+from .infrastructure.counters import apply_deltas, counter_deltas, recount
+from .infrastructure.models.projects import PROJECT
+
+
+# -----------------------------
+# DENORMALIZED COUNTERS
+# -----------------------------
+def update_counters(model, instances, created=False, deleted=False):
+    deltas, unknown = counter_deltas(
+        model, instances, created=created, deleted=deleted
+    )
+    project_ids = apply_deltas(deltas) + recount(unknown)
+    if project_ids:
+        # queryset.update() skips post_save; cached project lists still
+        # have to learn about the new counts
+        bulk_saved.send(
+            sender=PROJECT,
+            instances=[PROJECT(pk=project_id) for project_id in project_ids],
+            created=False,
+        )
+
+
+@receiver(post_save, sender=TASK)
+@receiver(post_save, sender=BUG)
+def item_saved(sender, instance, created, **kwargs):
+    update_counters(sender, [instance], created=created)
+
+
+@receiver(post_delete, sender=TASK)
+@receiver(post_delete, sender=BUG)
+def item_deleted(sender, instance, **kwargs):
+    update_counters(sender, [instance], deleted=True)
+
+
+@receiver(bulk_saved, sender=TASK)
+@receiver(bulk_saved, sender=BUG)
+def items_bulk_saved(sender, instances, created, **kwargs):
+    update_counters(sender, instances, created=created)
@@ -0,0 +1,218 @@
+import csv
+import io
+import json
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.signals import bulk_saved
+from core.testing import LeanParityMixin, ListQueryCountMixin, client_for, make_user
+from projects.infrastructure.models.projects import PROJECT
+from tasks.infrastructure.models.tasks import TASK
+from bugs.infrastructure.models.bugs import BUG
+from projects.infrastructure import export
+from projects.interface.serializers.serializer import (
+    ProjectListLeanSerializer, ProjectListSerializer,
+)
+from user_management.infrastructure.tokens import RoleRefreshToken
+
+
+class ProjectListQueryCountTests(ListQueryCountMixin, TestCase):
+    def setUp(self):
+        self.pm = make_user("pm", "ProjectManager")
+        self.dev = make_user("dev", "Developer")
+        self.qa = make_user("qa", "QA")
+
+    def add_projects(self, count):
+        for n in range(count):
+            project = PROJECT.objects.create(
+                title=f"Project {n}", project_code="P", project_description="d",
+                project_manager=self.pm,
+            )
+            # members of their own, so the prefetches have rows to join
+            project.developers.add(self.dev, make_user(f"dev-{project.pk}", "Developer"))
+            project.qas.add(self.qa, make_user(f"qa-{project.pk}", "QA"))
+
+    def test_pm_list(self):
+        self.assertListQueriesConstant(client_for(self.pm), "/api/projects/pm/", self.add_projects)
+
+    def test_developer_list(self):
+        self.assertListQueriesConstant(client_for(self.dev), "/api/projects/dev/", self.add_projects)
+
+    def test_qa_list(self):
+        self.assertListQueriesConstant(client_for(self.qa), "/api/projects/qa/", self.add_projects)
+
+
+class ProjectLeanParityTests(LeanParityMixin, TestCase):
+    def test_same_json(self):
+        pm = make_user("pm", "ProjectManager")
+        devs = [make_user(f"dev-{n}", "Developer") for n in range(3)]
+        qa = make_user("qa", "QA")
+        # a second role: the member's first group by id is the one shown
+        devs[0].groups.add(qa.groups.get())
+        first = PROJECT.objects.create(
+            title="Projekt \u00e9", project_code="P", project_description="d",
+            project_manager=pm, due_date="2026-11-01",
+        )
+        first.developers.add(devs[2], devs[0])
+        first.qas.add(qa)
+        # no members at all
+        PROJECT.objects.create(
+            title="Empty", project_code="E", project_description="d", project_manager=pm,
+        )
+        self.assertLeanMatches(
+            ProjectListLeanSerializer, ProjectListSerializer, PROJECT.objects.all()
+        )
+
+
+class CounterTests(TestCase):
+    def setUp(self):
+        self.pm = make_user("pm", "ProjectManager")
+        self.project = PROJECT.objects.create(
+            title="Project", project_code="P", project_description="d", project_manager=self.pm,
+        )
+        self.task = TASK.objects.create(title="Task", project=self.project, created_by=self.pm)
+        self.bug = BUG.objects.create(
+            title="Bug", project=self.project, severity=BUG.Severity.CRITICAL,
+        )
+
+    def counters(self):
+        self.project.refresh_from_db()
+        return (
+            self.project.open_task_count,
+            self.project.open_bug_count,
+            self.project.critical_bug_count,
+        )
+
+    def test_deferred_status_is_recounted(self):
+        self.assertEqual(self.counters(), (1, 1, 1))
+        task = TASK.objects.only("id", "title").get(pk=self.task.pk)
+        task.status = TASK.Status.DONE
+        task.save()
+        bug = BUG.objects.defer("severity").get(pk=self.bug.pk)
+        bug.status = BUG.Status.CLOSED
+        bug.save()
+        self.assertEqual(self.counters(), (0, 0, 0))
+
+    def test_loaded_rows_use_deltas(self):
+        task = TASK.objects.get(pk=self.task.pk)
+        task.status = TASK.Status.DONE
+        with CaptureQueriesContext(connection) as queries:
+            task.save()
+        # an F() update, no recount
+        self.assertFalse([q for q in queries if "COUNT(" in q["sql"]])
+        self.assertEqual(self.counters(), (0, 1, 1))
+
+    def test_create_move_and_delete(self):
+        other = PROJECT.objects.create(
+            title="Other", project_code="O", project_description="d", project_manager=self.pm,
+        )
+        minor = BUG.objects.create(title="Minor", project=self.project)
+        self.assertEqual(self.counters(), (1, 2, 1))
+
+        # soft delete, move to another project, hard delete
+        self.task.is_deleted = True
+        self.task.save()
+        self.bug.project = other
+        self.bug.save()
+        minor.delete()
+        self.assertEqual(self.counters(), (0, 0, 0))
+        other.refresh_from_db()
+        self.assertEqual((other.open_bug_count, other.critical_bug_count), (1, 1))
+
+    def test_bulk_saved(self):
+        TASK.objects.bulk_create([
+            TASK(title=f"Task {n}", project=self.project, created_by=self.pm, rank=str(n))
+            for n in range(1, 3)
+        ])
+        tasks = list(TASK.objects.filter(project=self.project).order_by("pk"))
+        bulk_saved.send(sender=TASK, instances=tasks[1:], created=True)
+        self.assertEqual(self.counters(), (3, 1, 1))
+
+        for task in tasks:
+            task.status = TASK.Status.DONE
+        TASK.objects.bulk_update(tasks, ["status"])
+        bulk_saved.send(sender=TASK, instances=tasks, created=False)
+        self.assertEqual(self.counters(), (0, 1, 1))
+
+    def recount(self, *args):
+        out = io.StringIO()
+        call_command("recount", *args, "--batch-size", "1", stdout=out)
+        return out.getvalue()
+
+    def test_recount(self):
+        # drift: writes that bypass the signals
+        TASK.objects.filter(pk=self.task.pk).update(is_deleted=True)
+        PROJECT.objects.filter(pk=self.project.pk).update(critical_bug_count=5)
+        PROJECT.objects.create(
+            title="Clean", project_code="C", project_description="d", project_manager=self.pm,
+        )
+
+        out = self.recount("--dry-run")
+        self.assertIn(
+            f"project {self.project.pk}: open_task_count 1 -> 0, critical_bug_count 5 -> 1", out
+        )
+        self.assertIn("2 project(s) checked, 1 with drift would be corrected.", out)
+        self.assertEqual(self.counters(), (1, 1, 5))
+
+        self.assertIn("1 with drift corrected.", self.recount())
+        self.assertEqual(self.counters(), (0, 1, 1))
+        self.assertIn("0 with drift corrected.", self.recount())
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.pm = make_user("pm", "ProjectManager")
+        self.project = PROJECT.objects.create(
+            title="Project", project_code="P1", project_description="d", project_manager=self.pm,
+        )
+        self.tasks = [
+            TASK.objects.create(title=f"Task, {n}", project=self.project, created_by=self.pm)
+            for n in range(5)
+        ]
+        self.client = client_for(self.pm)
+
+    def test_csv(self):
+        response = self.client.get(f"/api/projects/{self.project.pk}/export/tasks.csv")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="P1-tasks.csv"')
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(rows[0], list(export.COLUMNS["tasks"]))
+        self.assertEqual([row[1] for row in rows[1:]], [task.title for task in self.tasks])
+
+    def test_ndjson(self):
+        response = self.client.get(f"/api/projects/{self.project.pk}/export/tasks.ndjson")
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([row["id"] for row in rows], [task.pk for task in self.tasks])
+        self.assertEqual(rows[0]["created_by"], "pm")
+
+    @mock.patch.object(export, "CHUNK_SIZE", 2)
+    def test_chunks(self):
+        response = self.client.get(f"/api/projects/{self.project.pk}/export/tasks.ndjson")
+        # the first row alone, then CHUNK_SIZE rows per write
+        self.assertEqual(
+            [chunk.count(b"\n") for chunk in response.streaming_content], [1, 2, 2],
+        )
+
+    @mock.patch.object(export, "CHUNK_SIZE", 2)
+    async def test_async_stream_under_asgi(self):
+        token = await sync_to_async(
+            lambda: str(RoleRefreshToken.for_user(self.pm).access_token)
+        )()
+        response = await AsyncClient().get(
+            f"/api/projects/{self.project.pk}/export/tasks.csv",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        # header, first row, then two rows per write
+        self.assertEqual([chunk.count(b"\n") for chunk in chunks], [1, 1, 2, 2])
+        expected = await sync_to_async(
+            lambda: "".join(export.stream_csv("tasks", self.project.pk))
+        )()
+        self.assertEqual(b"".join(chunks).decode(), expected)
@@ -1,16 +1,34 @@
-from django.urls import path
+from django.conf import settings
+from django.urls import path, re_path
 from .interface.views.view import (
     ProjectCreateAPIView,
     ProjectAssignAPIView,
     PMProjectListAPIView,
     DeveloperProjectListAPIView,
     QAProjectListAPIView,
+    AsyncPMProjectListAPIView,
+    AsyncDeveloperProjectListAPIView,
+    AsyncQAProjectListAPIView,
+    ProjectStatsAPIView,
+    PMProjectStatsAPIView,
+    ProjectExportAPIView,
 )
 
+if settings.ASYNC_LIST_VIEWS:
+    PMProjectListAPIView = AsyncPMProjectListAPIView
+    DeveloperProjectListAPIView = AsyncDeveloperProjectListAPIView
+    QAProjectListAPIView = AsyncQAProjectListAPIView
+
 urlpatterns = [
     path("create/", ProjectCreateAPIView.as_view()),              # POST (PM)
     path("pm/", PMProjectListAPIView.as_view()),                 # GET (PM)
+    path("pm/stats/", PMProjectStatsAPIView.as_view()),          # GET (PM)
+    path("<int:pk>/stats/", ProjectStatsAPIView.as_view()),      # GET (members)
     path("<int:pk>/assign/", ProjectAssignAPIView.as_view()),    # PATCH (PM)
+    re_path(                                                     # GET (PM), streamed
+        r"^(?P<pk>[0-9]+)/export/(?P<kind>tasks|bugs)\.(?P<fmt>csv|ndjson)$",
+        ProjectExportAPIView.as_view(),
+    ),
     path("dev/", DeveloperProjectListAPIView.as_view()),         # GET (DEV)
     path("qa/", QAProjectListAPIView.as_view()),                 # GET (QA)
 ]
@@ -0,0 +1,23 @@
+from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import post_migrate
+
+
+def install_triggers(sender, using, **kwargs):
+    # after search/0001, and again whenever a migration rebuilt tasks_task
+    # or bugs_bug (and dropped their triggers)
+    from .infrastructure import fts
+
+    connection = connections[using]
+    if (connection.vendor == "sqlite"
+            and fts.FTS_TABLE in connection.introspection.table_names()):
+        fts.ensure_triggers(connection)
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'search'
+
+    def ready(self):
+        # sent once per app with models; search has none, so take them all
+        post_migrate.connect(install_triggers, dispatch_uid="search_install_triggers")
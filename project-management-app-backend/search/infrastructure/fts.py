@@ -0,0 +1,196 @@
+import html
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from tasks.infrastructure.models.tasks import TASK
+from bugs.infrastructure.models.bugs import BUG
+
+# FTS5 table over the live (not soft-deleted) rows of TASK and BUG, kept in
+# step by triggers (installed by ensure_triggers() after every migrate), so
+# bulk_create, bulk_update and queryset.update() are covered too. rowid = id * 2 + kind, so a trigger
+# finds a row's entry by rowid.
+FTS_TABLE = "search_fts"
+
+KINDS = {"task": (0, TASK, "is_deleted"), "bug": (1, BUG, "deleted")}
+KIND_NAMES = {bit: name for name, (bit, _, _) in KINDS.items()}
+
+# title hits outrank description hits
+TITLE_WEIGHT, DESCRIPTION_WEIGHT = 10.0, 1.0
+
+# snippet() markers; the text is HTML-escaped and these become <mark>
+MARK_START, MARK_END = "\x02", "\x03"
+
+WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def is_available():
+    return connection.vendor == "sqlite"
+
+
+def populate_sql(kind, table):
+    bit, _, deleted = KINDS[kind]
+    return (
+        f"INSERT INTO {FTS_TABLE}(rowid, title, description, project_id) "
+        f"SELECT id * 2 + {bit}, title, description, project_id "
+        f"FROM {table} WHERE NOT {deleted}"
+    )
+
+
+def trigger_sql(kind, table):
+    """The triggers keeping ``kind`` rows indexed, by trigger name."""
+    bit, _, deleted = KINDS[kind]
+    insert = (
+        f"INSERT INTO {FTS_TABLE}(rowid, title, description, project_id) "
+        f"SELECT new.id * 2 + {bit}, new.title, new.description, new.project_id "
+        f"WHERE NOT new.{deleted};"
+    )
+    delete = f"DELETE FROM {FTS_TABLE} WHERE rowid = old.id * 2 + {bit};"
+    return {
+        f"search_{kind}_ai": (
+            f"CREATE TRIGGER IF NOT EXISTS search_{kind}_ai AFTER INSERT ON {table} "
+            f"BEGIN {insert} END"
+        ),
+        f"search_{kind}_ad": (
+            f"CREATE TRIGGER IF NOT EXISTS search_{kind}_ad AFTER DELETE ON {table} "
+            f"BEGIN {delete} END"
+        ),
+        # only when an indexed column changed: status updates skip the index
+        f"search_{kind}_au": (
+            f"CREATE TRIGGER IF NOT EXISTS search_{kind}_au AFTER UPDATE ON {table} "
+            "WHEN old.title IS NOT new.title "
+            "OR old.description IS NOT new.description "
+            "OR old.project_id IS NOT new.project_id "
+            f"OR old.{deleted} IS NOT new.{deleted} "
+            f"BEGIN {delete} {insert} END"
+        ),
+    }
+
+
+def ensure_triggers(db=connection):
+    """
+    Create missing triggers and, if any was missing, rebuild the index.
+    Runs after every migrate: on SQLite, Django rebuilds a table for most
+    AddField/AlterField migrations and the table's triggers go with it.
+    Returns the names of the created triggers.
+    """
+    with db.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        existing = {name for (name,) in cursor.fetchall()}
+        missing = []
+        for kind, (_, model, _) in KINDS.items():
+            for name, sql in trigger_sql(kind, model._meta.db_table).items():
+                if name not in existing:
+                    cursor.execute(sql)
+                    missing.append(name)
+    if missing:
+        rebuild(db)
+    return missing
+
+
+def rebuild(db=connection):
+    """Re-create every index entry from the tables; returns the row count."""
+    with db.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        for kind, (_, model, _) in KINDS.items():
+            cursor.execute(populate_sql(kind, model._meta.db_table))
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f"SELECT count(*) FROM {FTS_TABLE}")
+        return cursor.fetchone()[0]
+
+
+def match_expression(query):
+    """
+    Free text to an FTS5 MATCH expression: every word must match, the last
+    one as a prefix (search-as-you-type). Quoting each word keeps FTS5
+    operators and punctuation in user input from being interpreted.
+    """
+    words = WORD.findall(query)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _highlight(snippet):
+    return (
+        html.escape(snippet)
+        .replace(MARK_START, "<mark>")
+        .replace(MARK_END, "</mark>")
+    )
+
+
+def search(query, project_ids, limit=20):
+    """
+    Ranked hits in the given projects: dicts with type, id, project,
+    title, snippet (HTML-escaped, matches in <mark>) and rank (bm25,
+    lower is better).
+    """
+    expression = match_expression(query)
+    project_ids = [int(pk) for pk in project_ids]
+    if expression is None or not project_ids:
+        return []
+
+    placeholders = ", ".join(["%s"] * len(project_ids))
+    sql = (
+        f"SELECT rowid, project_id, title, "
+        f"snippet({FTS_TABLE}, -1, %s, %s, '…', 12), "
+        f"bm25({FTS_TABLE}, {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT}) AS rank "
+        f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+        f"AND project_id IN ({placeholders}) "
+        f"ORDER BY rank LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            sql, [MARK_START, MARK_END, expression, *project_ids, limit]
+        )
+        rows = cursor.fetchall()
+
+    return [
+        {
+            "type": KIND_NAMES[rowid & 1],
+            "id": rowid >> 1,
+            "project": project_id,
+            "title": title,
+            "snippet": _highlight(snippet),
+            "rank": rank,
+        }
+        for rowid, project_id, title, snippet, rank in rows
+    ]
+
+
+def like_search(query, project_ids, limit=20):
+    """
+    The same contract without the index: every word as a case-insensitive
+    substring of title or description, newest first. A full scan of both
+    tables; used where FTS5 is unavailable and as the benchmark baseline.
+    """
+    words = WORD.findall(query)
+    if not words:
+        return []
+
+    hits = []
+    for name, (_, model, deleted) in KINDS.items():
+        queryset = model.objects.filter(project_id__in=project_ids, **{deleted: False})
+        for word in words:
+            queryset = queryset.filter(
+                Q(title__icontains=word) | Q(description__icontains=word)
+            )
+        rows = queryset.order_by("-created_at", "-id").values_list(
+            "id", "project_id", "title", "created_at"
+        )[:limit]
+        hits.extend(
+            (created_at, {
+                "type": name,
+                "id": pk,
+                "project": project_id,
+                "title": title,
+                "snippet": html.escape(title),
+                "rank": None,
+            })
+            for pk, project_id, title, created_at in rows
+        )
+    hits.sort(key=lambda hit: hit[0], reverse=True)
+    return [hit for _, hit in hits[:limit]]
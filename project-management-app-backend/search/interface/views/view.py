@@ -0,0 +1,41 @@
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from authentication.authentication import StatelessJWTAuthentication
+from projects.infrastructure.models.projects import PROJECT
+
+from ...infrastructure import fts
+
+
+class SearchAPIView(APIView):
+    """
+    GET ?q=<text>[&limit=N]: ranked task and bug hits with highlighted
+    snippets, from the projects the caller manages or belongs to.
+    """
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 100
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": ["This query parameter is required."]})
+
+        try:
+            limit = int(request.query_params.get("limit", self.DEFAULT_LIMIT))
+        except ValueError:
+            raise ValidationError({"limit": ["A valid integer is required."]})
+        limit = max(1, min(limit, self.MAX_LIMIT))
+
+        user_id = request.user.id
+        project_ids = PROJECT.objects.filter(
+            Q(project_manager_id=user_id) | Q(developers=user_id) | Q(qas=user_id)
+        ).values_list("pk", flat=True).distinct()
+
+        search = fts.search if fts.is_available() else fts.like_search
+        return Response(search(query, list(project_ids), limit))
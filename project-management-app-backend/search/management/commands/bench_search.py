@@ -0,0 +1,95 @@
+import itertools
+import random
+import statistics
+import string
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from projects.infrastructure.models.projects import PROJECT
+from tasks.infrastructure.models.tasks import TASK
+from search.infrastructure import fts
+
+BATCH_SIZE = 10000
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill a throwaway project with synthetic tasks and compare the FTS5 "
+        "search against a LIKE scan. Everything is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--repeat", type=int, default=5,
+                            help="Timed runs per query; the median is reported.")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        if not fts.is_available():
+            raise CommandError("The full-text index only exists on SQLite.")
+
+        rng = random.Random(options["seed"])
+        # Zipf-like vocabulary: word i is drawn with weight 1 / (i + 1),
+        # so queries range from very common to rare terms
+        vocabulary = [
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+            for _ in range(20000)
+        ]
+        cum_weights = list(itertools.accumulate(
+            1 / (rank + 1) for rank in range(len(vocabulary))
+        ))
+        queries = [
+            vocabulary[0],
+            vocabulary[100],
+            vocabulary[5000],
+            f"{vocabulary[10]} {vocabulary[200]}",
+            vocabulary[300][:3],  # prefix
+        ]
+
+        try:
+            with transaction.atomic():
+                project = PROJECT.objects.create(
+                    title="search benchmark", project_code="BENCH",
+                    project_description="",
+                )
+                self.fill(project, options["rows"], rng, vocabulary, cum_weights)
+                for query in queries:
+                    self.compare(query, [project.pk], options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def fill(self, project, rows, rng, vocabulary, cum_weights):
+        started = time.perf_counter()
+        for offset in range(0, rows, BATCH_SIZE):
+            count = min(BATCH_SIZE, rows - offset)
+            TASK.objects.bulk_create(
+                TASK(
+                    project=project,
+                    title=" ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=6)),
+                    description=" ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=30)),
+                )
+                for _ in range(count)
+            )
+        self.stdout.write(
+            f"{rows} rows inserted and indexed in {time.perf_counter() - started:.1f}s"
+        )
+
+    def compare(self, query, project_ids, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"q={query!r}"))
+        for name, search in (("fts5", fts.search), ("like", fts.like_search)):
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                hits = search(query, project_ids)
+                timings.append(time.perf_counter() - started)
+            self.stdout.write(
+                f"  {name}: {statistics.median(timings) * 1000:9.1f} ms  "
+                f"({len(hits)} hits)"
+            )
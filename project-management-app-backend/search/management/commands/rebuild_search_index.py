@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from search.infrastructure import fts
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the full-text search index from the task and bug tables "
+        "and optimize it, re-creating any missing sync trigger first."
+    )
+
+    def handle(self, *args, **options):
+        if not fts.is_available():
+            raise CommandError("The full-text index only exists on SQLite.")
+        missing = fts.ensure_triggers()
+        if missing:
+            self.stdout.write(f"Re-created trigger(s): {', '.join(missing)}.")
+        self.stdout.write(f"{fts.rebuild()} row(s) indexed.")
@@ -0,0 +1,44 @@
+# Generated by Django 6.0.1 on 2026-10-18 14:05
+
+from django.db import migrations
+
+# The sync triggers and the backfill are not created here: the search
+# app's post_migrate handler (fts.ensure_triggers) installs any missing
+# trigger and rebuilds the index, after this migration and after every
+# later one that rebuilds the task or bug table on SQLite.
+TRIGGERS = [
+    f"search_{kind}_{event}"
+    for kind in ("task", "bug")
+    for event in ("ai", "ad", "au")
+]
+
+
+def create_index(apps, schema_editor):
+    # FTS5 is SQLite specific; other backends search with LIKE
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE search_fts USING fts5("
+        "title, description, project_id UNINDEXED, "
+        "tokenize = 'porter unicode61')"
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for name in TRIGGERS:
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {name}")
+    schema_editor.execute("DROP TABLE IF EXISTS search_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_list_endpoint_indexes'),
+        ('bugs', '0002_list_endpoint_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,70 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from core.testing import client_for, make_user
+from projects.infrastructure.models.projects import PROJECT
+from tasks.infrastructure.models.tasks import TASK
+from bugs.infrastructure.models.bugs import BUG
+from search.infrastructure import fts
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.pm = make_user("pm", "ProjectManager")
+        self.dev = make_user("dev", "Developer")
+        self.qa = make_user("qa", "QA")
+        self.project = PROJECT.objects.create(
+            title="Project", project_code="P", project_description="d", project_manager=self.pm,
+        )
+        self.project.developers.add(self.dev)
+        self.project.qas.add(self.qa)
+        other_pm = make_user("other-pm", "ProjectManager")
+        self.other = PROJECT.objects.create(
+            title="Other", project_code="O", project_description="d", project_manager=other_pm,
+        )
+
+        self.task = TASK.objects.create(
+            title="Login page crash", description="Blank screen after submit",
+            project=self.project, created_by=self.pm,
+        )
+        self.bug = BUG.objects.create(
+            title="Slow login", description="Takes a minute to load",
+            project=self.project, reported_by=self.qa,
+        )
+        TASK.objects.create(
+            title="Login redesign", project=self.other, created_by=other_pm,
+        )
+
+    def hits(self, user, query):
+        response = client_for(user).get("/api/search/", {"q": query})
+        self.assertEqual(response.status_code, 200, response.content)
+        return {(hit["type"], hit["id"]) for hit in response.json()}
+
+    def test_results_stay_in_scope(self):
+        expected = {("task", self.task.pk), ("bug", self.bug.pk)}
+        for user in (self.pm, self.dev, self.qa):
+            self.assertEqual(self.hits(user, "login"), expected)
+        self.assertEqual(self.hits(make_user("outsider", "Developer"), "login"), set())
+
+    def test_triggers_follow_updates_and_soft_deletes(self):
+        # queryset.update(): no signals, only the triggers see it
+        TASK.objects.filter(pk=self.task.pk).update(title="Signup page crash")
+        self.assertEqual(self.hits(self.dev, "signup"), {("task", self.task.pk)})
+        self.assertEqual(self.hits(self.dev, "login"), {("bug", self.bug.pk)})
+
+        TASK.objects.filter(pk=self.task.pk).update(is_deleted=True)
+        BUG.objects.filter(pk=self.bug.pk).update(deleted=True)
+        self.assertEqual(self.hits(self.dev, "signup"), set())
+        self.assertEqual(self.hits(self.dev, "login"), set())
+
+        TASK.objects.filter(pk=self.task.pk).update(is_deleted=False)
+        self.assertEqual(self.hits(self.dev, "signup"), {("task", self.task.pk)})
+
+    def test_like_search_fallback_matches(self):
+        queries = ["login", "login crash", "slow", "minute", "blank scr"]
+        indexed = {query: self.hits(self.dev, query) for query in queries}
+        with mock.patch.object(fts, "is_available", return_value=False):
+            for query in queries:
+                self.assertTrue(indexed[query], query)
+                self.assertEqual(self.hits(self.dev, query), indexed[query], query)
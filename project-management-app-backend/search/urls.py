@@ -0,0 +1,6 @@
+from django.urls import path
+from .interface.views.view import SearchAPIView
+
+urlpatterns = [
+    path("", SearchAPIView.as_view()),  # GET ?q= (members)
+]
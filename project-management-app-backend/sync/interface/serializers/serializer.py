@@ -0,0 +1,17 @@
+from core.lean import DateTime
+from tasks.interface.serializer.serializer import TaskListLeanSerializer
+from bugs.interface.serializers.serializer import BugListLeanSerializer
+
+
+# -----------------------------
+# CHANGED ROWS (list shape + updated_at)
+# -----------------------------
+class TaskSyncSerializer(TaskListLeanSerializer):
+    fields = {**TaskListLeanSerializer.fields, "updated_at": DateTime("updated_at")}
+    # the cursor and the tombstone split read these off each row
+    row_lookups = ("id", "updated_at", "is_deleted")
+
+
+class BugSyncSerializer(BugListLeanSerializer):
+    fields = {**BugListLeanSerializer.fields, "updated_at": DateTime("updated_at")}
+    row_lookups = ("id", "updated_at", "deleted")
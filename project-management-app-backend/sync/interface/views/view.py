@@ -0,0 +1,78 @@
+import datetime
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from authentication.authentication import StatelessJWTAuthentication
+
+from ...infrastructure.changes import (
+    KINDS, InvalidToken, changed, decode_token, encode_token,
+    member_project_ids, scope_digest,
+)
+from ..serializers.serializer import TaskSyncSerializer, BugSyncSerializer
+
+
+class SyncAPIView(APIView):
+    """
+    GET [?since=<token>][&limit=N]: the tasks and bugs of the caller's
+    projects created or updated since the token, plus the ids of those
+    soft-deleted since then, and the token for the next call.
+
+    Without a token, or when the caller's project set changed since it was
+    issued, the walk starts over and the first page says "reset": true
+    (drop local copies and rebuild from the pages that follow). Keep
+    calling with "next" while "has_more" is true. A token issued to
+    another user is refused.
+    """
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    SERIALIZERS = {"tasks": TaskSyncSerializer, "bugs": BugSyncSerializer}
+
+    def get(self, request):
+        config = settings.SYNC
+        try:
+            limit = int(request.query_params.get("limit", config["PAGE_SIZE"]))
+        except ValueError:
+            raise ValidationError({"limit": ["A valid integer is required."]})
+        limit = max(1, min(limit, config["MAX_PAGE_SIZE"]))
+
+        project_ids = member_project_ids(request.user.id)
+        scope = scope_digest(project_ids)
+        cursors, reset = dict.fromkeys(KINDS), True
+        token = request.query_params.get("since")
+        if token:
+            try:
+                token_user, token_scope, token_cursors = decode_token(token)
+            except InvalidToken:
+                raise ValidationError({"since": ["Invalid sync token."]})
+            if token_user != request.user.id:
+                raise ValidationError({"since": ["Invalid sync token."]})
+            if token_scope == scope:
+                cursors, reset = token_cursors, False
+
+        horizon = timezone.now() - datetime.timedelta(seconds=config["SETTLE_SECONDS"])
+        body, deleted, has_more = {"reset": reset}, {}, False
+        for kind, serializer in self.SERIALIZERS.items():
+            rows = list(
+                serializer.project(changed(kind, project_ids, cursors[kind], horizon))[:limit + 1]
+            )
+            if len(rows) > limit:
+                has_more, rows = True, rows[:limit]
+            if rows:
+                cursors[kind] = (rows[-1].updated_at, rows[-1].id)
+
+            _, flag = KINDS[kind]
+            body[kind] = serializer.serialize([row for row in rows if not getattr(row, flag)])
+            deleted[kind] = [row.id for row in rows if getattr(row, flag)]
+
+        body.update(
+            deleted=deleted,
+            has_more=has_more,
+            next=encode_token(request.user.id, scope, cursors),
+        )
+        return Response(body)
@@ -0,0 +1,118 @@
+import datetime
+from unittest import mock
+
+from django.utils import timezone
+from django.test import TestCase
+
+from core.testing import client_for, make_user
+from projects.infrastructure.models.projects import PROJECT
+from tasks.infrastructure.models.tasks import TASK
+from bugs.infrastructure.models.bugs import BUG
+
+
+class SyncTests(TestCase):
+    def setUp(self):
+        self.pm = make_user("pm", "ProjectManager")
+        self.dev = make_user("dev", "Developer")
+        self.project = PROJECT.objects.create(
+            title="Project", project_code="P", project_description="d", project_manager=self.pm,
+        )
+        self.project.developers.add(self.dev)
+        self.other = PROJECT.objects.create(
+            title="Other", project_code="O", project_description="d", project_manager=self.pm,
+        )
+        self.task = TASK.objects.create(title="Task", project=self.project, created_by=self.pm)
+        self.bug = BUG.objects.create(title="Bug", project=self.project, reported_by=self.pm)
+        TASK.objects.create(title="Other task", project=self.other, created_by=self.pm)
+        self.settle()
+        self.client = client_for(self.dev)
+
+    def settle(self, seconds=60):
+        # every row so far falls before the settle window
+        past = timezone.now() - datetime.timedelta(seconds=seconds)
+        TASK.objects.update(updated_at=past)
+        BUG.objects.update(updated_at=past)
+
+    def sync(self, since=None, client=None, **params):
+        if since:
+            params["since"] = since
+        response = (client or self.client).get("/api/sync/", params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def titles(self, body, kind):
+        return [row["title"] for row in body[kind]]
+
+    def test_round_trip(self):
+        first = self.sync()
+        self.assertTrue(first["reset"])
+        self.assertEqual(self.titles(first, "tasks"), ["Task"])
+        self.assertEqual(self.titles(first, "bugs"), ["Bug"])
+        self.assertFalse(first["has_more"])
+
+        unchanged = self.sync(first["next"])
+        self.assertFalse(unchanged["reset"])
+        self.assertEqual((unchanged["tasks"], unchanged["bugs"]), ([], []))
+
+        self.task.title = "Renamed"
+        self.task.save()
+        TASK.objects.create(title="Added", project=self.project, created_by=self.pm)
+        TASK.objects.filter(project=self.project).update(
+            updated_at=timezone.now() - datetime.timedelta(seconds=30)
+        )
+        page = self.sync(unchanged["next"], limit=1)
+        self.assertTrue(page["has_more"])
+        rest = self.sync(page["next"], limit=1)
+        self.assertFalse(rest["has_more"])
+        self.assertEqual(
+            sorted(self.titles(page, "tasks") + self.titles(rest, "tasks")), ["Added", "Renamed"]
+        )
+        self.assertEqual(self.sync(rest["next"])["tasks"], [])
+
+    def test_deleted_rows_are_tombstones(self):
+        token = self.sync()["next"]
+        TASK.objects.filter(pk=self.task.pk).update(is_deleted=True)
+        BUG.objects.filter(pk=self.bug.pk).update(deleted=True)
+        self.settle(30)
+
+        body = self.sync(token)
+        self.assertEqual((body["tasks"], body["bugs"]), ([], []))
+        self.assertEqual(body["deleted"], {"tasks": [self.task.pk], "bugs": [self.bug.pk]})
+
+    def test_token_of_another_user_is_rejected(self):
+        token = self.sync()["next"]
+        # same projects, so the same scope digest
+        other_dev = make_user("other-dev", "Developer")
+        self.project.developers.add(other_dev)
+        response = client_for(other_dev).get("/api/sync/", {"since": token})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get("/api/sync/", {"since": token[:-2] + "xx"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_token_of_another_scope_starts_over(self):
+        token = self.sync()["next"]
+        self.other.developers.add(self.dev)
+
+        body = self.sync(token)
+        self.assertTrue(body["reset"])
+        self.assertEqual(sorted(self.titles(body, "tasks")), ["Other task", "Task"])
+
+    def test_row_written_in_settle_window_is_not_skipped(self):
+        now = timezone.now()
+        token = self.sync()["next"]
+        # committed 0.3s ago, while another row from 0.5s ago is still
+        # in a transaction that has yet to commit
+        TASK.objects.filter(pk=self.task.pk).update(
+            title="Seen", updated_at=now - datetime.timedelta(seconds=0.3)
+        )
+        with mock.patch("django.utils.timezone.now", return_value=now):
+            body = self.sync(token)
+        self.assertEqual(body["tasks"], [])
+
+        late = TASK.objects.create(title="Late", project=self.project, created_by=self.pm)
+        TASK.objects.filter(pk=late.pk).update(updated_at=now - datetime.timedelta(seconds=0.5))
+        later = now + datetime.timedelta(seconds=5)
+        with mock.patch("django.utils.timezone.now", return_value=later):
+            body = self.sync(body["next"])
+        self.assertEqual(self.titles(body, "tasks"), ["Late", "Seen"])
@@ -0,0 +1,6 @@
+from django.urls import path
+from .interface.views.view import SyncAPIView
+
+urlpatterns = [
+    path("", SyncAPIView.as_view()),  # GET ?since= (members)
+]
@@ -2,9 +2,11 @@ from django.db import models
 from django.contrib.auth.models import User
 
 from projects.infrastructure.models.projects import PROJECT
+from core.infrastructure.models.tracking import LoadedStateMixin
+from core.infrastructure.models.versioning import VersionedMixin
 
 
-class TASK(models.Model):
+class TASK(LoadedStateMixin, VersionedMixin, models.Model):
     # -----------------------------
     # STATUS & PRIORITY CHOICES
     # -----------------------------
@@ -63,6 +65,10 @@ class TASK(models.Model):
         help_text="User who created the task (usually PM)",
     )
     is_deleted = models.BooleanField(default=False)
+    # bumped by every write; edits are conditional on it (optimistic locking)
+    version = models.PositiveIntegerField(default=1, editable=False)
+    # position in its status column on the board; see tasks.infrastructure.ranking
+    rank = models.CharField(max_length=64, blank=True, default="")
     # -----------------------------
     # DATES
     # -----------------------------
@@ -80,7 +86,34 @@ class TASK(models.Model):
             models.Index(fields=["status"]),
             models.Index(fields=["priority"]),
             models.Index(fields=["project"]),
+            # PMTaskListAPIView: created_by = ? AND NOT is_deleted
+            # ORDER BY -created_at, -id
+            models.Index(
+                fields=["created_by", "-created_at", "-id"],
+                condition=models.Q(is_deleted=False),
+                name="task_creator_live_idx",
+            ),
+            # SyncAPIView: project_id IN (...) AND (updated_at, id) > (?, ?)
+            # ORDER BY updated_at, id -- tombstones included
+            models.Index(
+                fields=["project", "updated_at", "id"],
+                name="task_project_changes_idx",
+            ),
+            # TaskBoardAPIView: project_id = ? AND status = ? AND NOT
+            # is_deleted ORDER BY rank, id
+            models.Index(
+                fields=["project", "status", "rank", "id"],
+                condition=models.Q(is_deleted=False),
+                name="task_board_idx",
+            ),
         ]
 
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.rank:
+            # at the bottom of its column, whichever code path creates it
+            from ..ranking import append
+            append([self])
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.title} ({self.status})"
@@ -0,0 +1,125 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from .models.tasks import TASK
+
+# Board order within a status column. A rank is a base-36 fraction
+# (".i" = 0.5) written without its leading point or trailing zeros, so
+# comparing ranks as strings compares the fractions. There is always room
+# between two ranks: moving a card rewrites its own rank only, at the
+# cost of ranks slowly growing longer until the column is rebalanced.
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# appended tasks are BASE ** -APPEND_SPACING apart, not halfway to the end
+APPEND_SPACING = 3
+# rebalancing spreads a column below this, keeping the rest for appends
+REBALANCE_CEILING = "i"
+# columns with longer ranks (or unranked tasks) are due a rebalance
+REBALANCE_LENGTH = 16
+
+
+def value(rank, width):
+    return int(rank.ljust(width, "0"), BASE) if rank else 0
+
+
+def render(number, width):
+    digits = []
+    for _ in range(width):
+        number, digit = divmod(number, BASE)
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits)).rstrip("0")
+
+
+def spread(low, high, count, spacing=None):
+    """
+    ``count`` ascending ranks strictly between ``low`` and ``high``, evenly
+    spaced and as short as that allows. ``""`` is the top of a column and
+    None its bottom; ``spacing`` caps the gap at BASE ** -spacing.
+    """
+    if high is not None and low >= high:
+        raise ValueError(f"No rank between {low!r} and {high!r}.")
+    width = max(len(low), len(high or ""), spacing or 0, 1)
+    while True:
+        start = value(low, width)
+        end = BASE ** width if high is None else value(high, width)
+        step = (end - start) // (count + 1)
+        if spacing is not None:
+            step = min(step, BASE ** (width - spacing))
+        if step:
+            return [render(start + step * n, width) for n in range(1, count + 1)]
+        width += 1
+
+
+# -----------------------------
+# COLUMNS
+# -----------------------------
+def column(project_id, status):
+    return TASK.objects.filter(project_id=project_id, status=status, is_deleted=False)
+
+
+def append(tasks):
+    """Give unsaved tasks ranks at the bottom of their columns, in order."""
+    columns = defaultdict(list)
+    for task in tasks:
+        columns[(task.project_id, task.status)].append(task)
+    for (project_id, status), members in columns.items():
+        last = column(project_id, status).order_by("-rank", "-id").values_list(
+            "rank", flat=True
+        ).first()
+        ranks = spread(last or "", None, len(members), spacing=APPEND_SPACING)
+        for task, rank in zip(members, ranks):
+            task.rank = rank
+
+
+class NoRoom(Exception):
+    """No rank fits between two neighbours until their column is rebalanced."""
+
+
+def place(task, status, above):
+    """
+    The rank that puts ``task`` in the ``status`` column right below the
+    task ``above``, or at the top for None. Reads at most the card below
+    the drop point and writes no other card: columns are renumbered by the
+    rebalance_ranks command, never inside a move.
+    """
+    low = "" if above is None else above.rank
+    # cards tied with the drop point (concurrent appends, unranked rows)
+    # leave no gap to split, so the card lands just past them
+    high = column(task.project_id, status).exclude(pk=task.pk).filter(
+        rank__gt=low
+    ).order_by("rank", "id").values_list("rank", flat=True).first()
+
+    rank = spread(low, high, 1)[0]
+    if len(rank) > TASK._meta.get_field("rank").max_length:
+        raise NoRoom(f"No rank left between {low!r} and {high!r}.")
+    return rank
+
+
+def rebalance(project_id, status, batch_size=500):
+    """
+    Respread a column's ranks evenly and short, keeping its order;
+    unranked tasks go last, oldest first. Returns the number of tasks.
+    """
+    # locked where the backend supports it, so a concurrent move does not
+    # land between two rows of the old layout
+    with transaction.atomic():
+        tasks = list(
+            column(project_id, status)
+            .select_for_update()
+            .order_by(
+                Case(When(rank="", then=Value(1)), default=Value(0),
+                     output_field=IntegerField()),
+                "rank", "created_at", "id",
+            )
+            .only("id", "rank")
+        )
+        if not tasks:
+            return 0
+        for task, rank in zip(tasks, spread("", REBALANCE_CEILING, len(tasks))):
+            task.rank = rank
+        # order and updated_at are unchanged: nothing to announce
+        TASK.objects.bulk_update(tasks, ["rank"], batch_size=batch_size)
+    return len(tasks)
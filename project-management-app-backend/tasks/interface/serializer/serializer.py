@@ -1,6 +1,15 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from rest_framework.settings import api_settings
+from core.signals import bulk_saved
+from core.infrastructure.models.versioning import StaleVersion, update_if_current
+from core.lean import LeanSerializer, Date, DateTime, lean_user
+from core.metrics import TimedSerializerMixin
 from ...infrastructure.models.tasks import TASK
+from ...infrastructure import ranking
 from projects.infrastructure.models.projects import PROJECT
 
 
@@ -18,14 +27,16 @@ class SimpleUserSerializer(serializers.ModelSerializer):
 # -----------------------------
 # CREATE TASK (PM)
 # -----------------------------
-class TaskCreateSerializer(serializers.ModelSerializer):
+class TaskCreateSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    ASSIGNEE_ROLES = ["Developer", "QA"]
+
     project = serializers.PrimaryKeyRelatedField(
         queryset=PROJECT.objects.none()
     )
 
     assignee = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.filter(
-            groups__name__in=["Developer", "QA"]
+            groups__name__in=ASSIGNEE_ROLES
         ),
         required=False,
         allow_null=True
@@ -42,6 +53,7 @@ class TaskCreateSerializer(serializers.ModelSerializer):
             "project",
             "assignee",
             "due_date",
+            "version",
         ]
 
     def __init__(self, *args, **kwargs):
@@ -57,17 +69,314 @@ class TaskCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         request = self.context["request"]
 
-        task = TASK.objects.create(
+        # TASK.save() ranks it at the bottom of its column
+        task = TASK(
             created_by=request.user,
             **validated_data
         )
+        task.save(force_insert=True)
         return task
 
 
+# -----------------------------
+# BULK CREATE TASKS (PM)
+# -----------------------------
+class TaskBulkCreateListSerializer(serializers.ListSerializer):
+    """
+    Validates a whole batch with one query for project ownership and one
+    for assignee eligibility, then inserts it with a single bulk_create.
+    Errors are reported per item, aligned with the submitted list.
+    """
+
+    def to_internal_value(self, data):
+        # Checked here rather than in validate() so every error, field or
+        # batch check, lands in one list aligned with the submitted items
+        # (ListSerializer itself keys field errors by index).
+        if not isinstance(data, list) or not data or (
+            self.max_length is not None and len(data) > self.max_length
+        ):
+            # not a list, empty or too long: ListSerializer's own errors
+            return super().to_internal_value(data)
+
+        items, errors = [], []
+        for raw in data:
+            try:
+                item, item_errors = self.run_child_validation(raw), {}
+            except serializers.ValidationError as exc:
+                item_errors = dict(exc.detail)
+                # the batch checks still cover whichever ids are well formed
+                item = {
+                    name: self.child.fields[name].run_validation(raw[name])
+                    for name in ("project", "assignee")
+                    if isinstance(raw, dict) and name in raw and name not in item_errors
+                }
+            items.append(item)
+            errors.append(item_errors)
+
+        request = self.context["request"]
+        does_not_exist = serializers.PrimaryKeyRelatedField.default_error_messages[
+            "does_not_exist"
+        ]
+
+        # 🔒 PM can only create tasks in their own projects
+        owned_projects = set(
+            PROJECT.objects.filter(
+                project_manager_id=request.user.id,
+                id__in={item["project"] for item in items if "project" in item},
+            ).values_list("id", flat=True)
+        )
+        eligible_assignees = set(
+            User.objects.filter(
+                id__in={item["assignee"] for item in items if item.get("assignee")},
+                groups__name__in=TaskCreateSerializer.ASSIGNEE_ROLES,
+            ).values_list("id", flat=True)
+        )
+
+        for item, item_errors in zip(items, errors):
+            project = item.get("project")
+            if project is not None and project not in owned_projects:
+                item_errors["project"] = [does_not_exist.format(pk_value=project)]
+            assignee = item.get("assignee")
+            if assignee is not None and assignee not in eligible_assignees:
+                item_errors["assignee"] = [does_not_exist.format(pk_value=assignee)]
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def create(self, validated_data):
+        request = self.context["request"]
+
+        tasks = [
+            TASK(
+                created_by_id=request.user.id,
+                project_id=item.pop("project"),
+                assignee_id=item.pop("assignee", None),
+                **item
+            )
+            for item in validated_data
+        ]
+        with transaction.atomic():
+            # at the bottom of their board columns, in the submitted order
+            ranking.append(tasks)
+            tasks = TASK.objects.bulk_create(tasks)
+        bulk_saved.send(sender=TASK, instances=tasks, created=True)
+        return tasks
+
+
+class TaskBulkCreateSerializer(serializers.ModelSerializer):
+    # plain ids: ownership/eligibility are checked for the whole batch
+    project = serializers.IntegerField()
+    assignee = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = TASK
+        fields = [
+            "title",
+            "description",
+            "status",
+            "priority",
+            "project",
+            "assignee",
+            "due_date",
+        ]
+        list_serializer_class = TaskBulkCreateListSerializer
+
+
+# -----------------------------
+# BULK UPDATE TASKS (PM / ASSIGNEE)
+# -----------------------------
+class TaskChangesSerializer(serializers.Serializer):
+    # the version the client last read; the write only applies to it
+    version = serializers.IntegerField(min_value=1)
+    status = serializers.ChoiceField(choices=TASK.Status.choices, required=False)
+    assignee = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        if attrs.keys() == {"version"}:
+            raise serializers.ValidationError("No changes given.")
+        return attrs
+
+
+class TaskBulkUpdateSerializer(serializers.Serializer):
+    """
+    Input: {"<task id>": {"version": ..., "status": ..., "assignee": ...}, ...}
+
+    The project manager of a task's project may change both fields, its
+    assignee only the status. Permissions for the whole set are checked
+    with one query, assignee eligibility with another, and the changes
+    are applied with a single UPDATE conditional on every task still
+    being at the version sent; save() raises StaleVersion, writing
+    nothing, when one has moved on. Errors are keyed by task id.
+    """
+    MAX_ITEMS = 200
+
+    def to_internal_value(self, data):
+        if not isinstance(data, dict):
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    "Expected an object mapping task ids to changes."
+                ]
+            })
+        if not data or len(data) > self.MAX_ITEMS:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f"Send between 1 and {self.MAX_ITEMS} tasks."
+                ]
+            })
+
+        changes, errors = {}, {}
+        for key, value in data.items():
+            item = TaskChangesSerializer(data=value)
+            if not str(key).isdigit():
+                errors[key] = {
+                    api_settings.NON_FIELD_ERRORS_KEY: ["Invalid task id."]
+                }
+            elif not item.is_valid():
+                errors[key] = item.errors
+            else:
+                changes[int(key)] = item.validated_data
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        user_id = self.context["request"].user.id
+        tasks = TASK.objects.filter(
+            pk__in=changes, is_deleted=False
+        ).annotate(
+            manager_id=F("project__project_manager_id")
+        ).filter(
+            Q(manager_id=user_id) | Q(assignee_id=user_id)
+        )
+        tasks = {task.pk: task for task in tasks}
+        eligible_assignees = set(
+            User.objects.filter(
+                id__in={
+                    change["assignee"] for change in changes.values()
+                    if change.get("assignee") is not None
+                },
+                groups__name__in=TaskCreateSerializer.ASSIGNEE_ROLES,
+            ).values_list("id", flat=True)
+        )
+
+        does_not_exist = serializers.PrimaryKeyRelatedField.default_error_messages[
+            "does_not_exist"
+        ]
+        for pk, change in changes.items():
+            task = tasks.get(pk)
+            if task is None:
+                errors[str(pk)] = {
+                    api_settings.NON_FIELD_ERRORS_KEY: ["Not found."]
+                }
+                continue
+            if "assignee" not in change:
+                continue
+            assignee = change["assignee"]
+            if task.manager_id != user_id:
+                errors[str(pk)] = {
+                    "assignee": ["Only the project manager can reassign a task."]
+                }
+            elif assignee is not None and assignee not in eligible_assignees:
+                errors[str(pk)] = {
+                    "assignee": [does_not_exist.format(pk_value=assignee)]
+                }
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return [(tasks[pk], change) for pk, change in changes.items()]
+
+    def save(self):
+        now = timezone.now()
+        fields = {"updated_at"}
+        tasks, moved = [], []
+
+        for task, change in self.validated_data:
+            task.version = change["version"]
+            if "status" in change:
+                if change["status"] != task.status:
+                    moved.append(task)
+                task.status = change["status"]
+                fields.add("status")
+            if "assignee" in change:
+                task.assignee_id = change["assignee"]
+                fields.add("assignee")
+            # queryset.update() skips auto_now
+            task.updated_at = now
+            tasks.append(task)
+
+        # moved tasks go to the bottom of their new column, in the order
+        # sent; ranked before the write, while that column is without them
+        ranking.append(moved)
+        update_if_current(tasks, sorted(fields))
+        # only the moved rows: a rebalance since they were read (which
+        # leaves versions alone) must not be undone for the rest
+        TASK.objects.bulk_update(moved, ["rank"])
+        bulk_saved.send(sender=TASK, instances=tasks, created=False)
+        return tasks
+
+
+# -----------------------------
+# EDIT ONE TASK (PM / ASSIGNEE)
+# -----------------------------
+class TaskUpdateSerializer(serializers.ModelSerializer):
+    """
+    PATCH one task. ``version`` is the one the client read: the save is
+    conditional on it and raises StaleVersion when the task has moved on.
+    The project manager may change every field, the assignee only the
+    status. Expects the instance annotated with ``manager_id``.
+    """
+    ASSIGNEE_FIELDS = {"status"}
+
+    version = serializers.IntegerField(min_value=1)
+    assignee = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.filter(
+            groups__name__in=TaskCreateSerializer.ASSIGNEE_ROLES
+        ),
+        required=False,
+        allow_null=True
+    )
+
+    class Meta:
+        model = TASK
+        fields = [
+            "title",
+            "description",
+            "status",
+            "priority",
+            "assignee",
+            "due_date",
+            "version",
+        ]
+
+    def validate(self, attrs):
+        # required even though the edit is partial
+        if "version" not in attrs:
+            raise serializers.ValidationError({
+                "version": [self.fields["version"].error_messages["required"]]
+            })
+        changes = attrs.keys() - {"version"}
+        if not changes:
+            raise serializers.ValidationError("No changes given.")
+        user_id = self.context["request"].user.id
+        if self.instance.manager_id != user_id and changes - self.ASSIGNEE_FIELDS:
+            raise serializers.ValidationError(
+                "The assignee can only change the status."
+            )
+        return attrs
+
+    def update(self, task, validated_data):
+        task.version = validated_data.pop("version")
+        status = validated_data.get("status", task.status)
+        if status != task.status:
+            # to the bottom of the new column, as TaskBulkUpdateSerializer does
+            task.status = status
+            ranking.append([task])
+        return super().update(task, validated_data)
+
+
 # -----------------------------
 # LIST TASKS (PM / DEV / QA)
 # -----------------------------
-class TaskListSerializer(serializers.ModelSerializer):
+class TaskListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     project = serializers.StringRelatedField()
     assignee = SimpleUserSerializer(read_only=True)
     created_by = SimpleUserSerializer(read_only=True)
@@ -85,4 +394,88 @@ class TaskListSerializer(serializers.ModelSerializer):
             "created_by",
             "due_date",
             "created_at",
+            "version",
         ]
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        # project / assignee / created_by are all to-one: one JOINed query
+        return queryset.select_related("project", "assignee", "created_by")
+
+
+class TaskListLeanSerializer(LeanSerializer):
+    """TaskListSerializer over values_list() rows, same output."""
+
+    fields = {
+        "id": "id",
+        "title": "title",
+        "description": "description",
+        "status": "status",
+        "priority": "priority",
+        # StringRelatedField: str(project) is its title
+        "project": "project__title",
+        "assignee": lean_user("assignee"),
+        "created_by": lean_user("created_by"),
+        "due_date": Date("due_date"),
+        "created_at": DateTime("created_at"),
+        "version": "version",
+    }
+
+
+# -----------------------------
+# BOARD (PROJECT MEMBERS)
+# -----------------------------
+class TaskBoardLeanSerializer(LeanSerializer):
+    """A card in a board column; the column gives its status."""
+
+    fields = {
+        "id": "id",
+        "title": "title",
+        "priority": "priority",
+        "assignee": lean_user("assignee"),
+        "due_date": Date("due_date"),
+        "rank": "rank",
+        "version": "version",
+    }
+    # the column paginator orders by rank, id
+    row_lookups = ("id", "rank")
+
+
+class TaskMoveSerializer(serializers.Serializer):
+    """
+    Drop a task into a board column right below the task ``after``, or
+    at the top of it when ``after`` is null. Only the moved task changes,
+    and only if it is still at ``version`` (else StaleVersion).
+    """
+    version = serializers.IntegerField(min_value=1)
+    status = serializers.ChoiceField(choices=TASK.Status.choices, required=False)
+    after = serializers.IntegerField(allow_null=True)
+
+    def validate(self, attrs):
+        task = self.instance
+        attrs.setdefault("status", task.status)
+        after = attrs["after"]
+        if after is None:
+            return attrs
+        if after == task.pk:
+            raise serializers.ValidationError({"after": ["A task cannot follow itself."]})
+        # the card above the drop point must already be in the target column
+        attrs["after"] = ranking.column(task.project_id, attrs["status"]).filter(
+            pk=after
+        ).only("id", "rank").first()
+        if attrs["after"] is None:
+            raise serializers.ValidationError({"after": [
+                f"Task {after} is not in the {attrs['status']} column of this project."
+            ]})
+        return attrs
+
+    def update(self, task, validated_data):
+        if task.version != validated_data["version"]:
+            raise StaleVersion([task.pk])
+        status = validated_data["status"]
+        task.rank = ranking.place(task, status, validated_data["after"])
+        task.status = status
+        task.updated_at = timezone.now()
+        update_if_current([task], ["status", "rank", "updated_at"])
+        bulk_saved.send(sender=TASK, instances=[task], created=False)
+        return task
@@ -3,15 +3,41 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.http import Http404
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import replace_query_param
+from authentication.authentication import StatelessJWTAuthentication
 from permissions.permissions import isProjectManager
-from ..serializer.serializer import TaskCreateSerializer, TaskListSerializer
+from pagination.pagination import CreatedAtCursorPagination, RankCursorPagination
+from core.async_views import AsyncListAPIView
+from core.conflicts import conflict_response
+from core.infrastructure.models.versioning import StaleVersion
+from core.lean import SparseFieldsMixin
+from core.conditional import conditional_list
+from core.replicas import replica_reads
+from core.response_cache import cached_list
+from ..serializer.serializer import (
+    TaskCreateSerializer,
+    TaskBulkCreateSerializer,
+    TaskBulkUpdateSerializer,
+    TaskUpdateSerializer,
+    TaskListSerializer,
+    TaskListLeanSerializer,
+    TaskBoardLeanSerializer,
+    TaskMoveSerializer,
+)
 from ...infrastructure.models.tasks import TASK
+from ...infrastructure import ranking
+from projects.infrastructure.models.projects import PROJECT
 
 
 class TaskCreateAPIView(APIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, isProjectManager]
 
+    @transaction.atomic
     def post(self, request):
         serializer = TaskCreateSerializer(
             data=request.data,
@@ -24,18 +50,126 @@ class TaskCreateAPIView(APIView):
             status=status.HTTP_201_CREATED,
         )
 
-class PMTaskListAPIView(APIView):
-    authentication_classes=[JWTAuthentication]
+class TaskBulkCreateAPIView(APIView):
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated, isProjectManager]
+
+    MAX_TASKS = 500
+
+    @transaction.atomic
+    def post(self, request):
+        serializer = TaskBulkCreateSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=self.MAX_TASKS,
+            context={"request": request},
+        )
+        serializer.is_valid(raise_exception=True)
+        tasks = serializer.save()
+
+        created = TaskListSerializer.setup_eager_loading(
+            TASK.objects.filter(pk__in=[task.pk for task in tasks])
+        ).order_by("id")
+        return Response(
+            TaskListSerializer(created, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+class TaskBulkUpdateAPIView(APIView):
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @transaction.atomic
+    def patch(self, request):
+        serializer = TaskBulkUpdateSerializer(
+            data=request.data,
+            context={"request": request},
+        )
+        serializer.is_valid(raise_exception=True)
+        try:
+            tasks = serializer.save()
+        except StaleVersion as stale:
+            return conflict_response(
+                TaskListSerializer, TASK.objects.filter(is_deleted=False), stale.pks
+            )
+
+        updated = TaskListSerializer.setup_eager_loading(
+            TASK.objects.filter(pk__in=[task.pk for task in tasks])
+        ).order_by("id")
+        return Response(
+            TaskListSerializer(updated, many=True).data,
+            status=status.HTTP_200_OK,
+        )
+
+class TaskUpdateAPIView(APIView):
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @transaction.atomic
+    def patch(self, request, pk):
+        # like bulk-update: the project manager or the assignee
+        user_id = request.user.id
+        task = TASK.objects.filter(pk=pk, is_deleted=False).annotate(
+            manager_id=F("project__project_manager_id")
+        ).filter(
+            Q(manager_id=user_id) | Q(assignee_id=user_id)
+        ).first()
+        if task is None:
+            return Response(
+                {"detail": "Task not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        serializer = TaskUpdateSerializer(
+            task,
+            data=request.data,
+            partial=True,
+            context={"request": request},
+        )
+        serializer.is_valid(raise_exception=True)
+        try:
+            task = serializer.save()
+        except StaleVersion as stale:
+            return conflict_response(
+                TaskListSerializer, TASK.objects.filter(is_deleted=False), stale.pks
+            )
+
+        updated = TaskListSerializer.setup_eager_loading(
+            TASK.objects.filter(pk=task.pk)
+        ).get()
+        return Response(
+            TaskListSerializer(updated).data,
+            status=status.HTTP_200_OK,
+        )
+
+class PMTaskListAPIView(SparseFieldsMixin, APIView):
+    authentication_classes=[StatelessJWTAuthentication]
     permission_classes=[IsAuthenticated,isProjectManager]
+    serializer_class = TaskListLeanSerializer
     
+    def get_scope(self):
+        return TASK.objects.filter(created_by_id=self.request.user.id, is_deleted=False)
+
+    @replica_reads
+    @cached_list("tasks")
+    @conditional_list
     def get(self, request):
-        tasks = TASK.objects.filter(created_by=request.user, is_deleted=False)
-        return Response(TaskListSerializer(tasks, many=True).data,
-                        )
+        paginator = CreatedAtCursorPagination()
+        page = paginator.paginate_queryset(
+            self.get_queryset(), request, view=self
+        )
+        return paginator.get_paginated_response(
+            self.get_serializer_class().serialize(page)
+        )
+
+class AsyncPMTaskListAPIView(AsyncListAPIView, PMTaskListAPIView):
+    cache_scope = "tasks"
+
 class TaskSoftDeleteAPIView(APIView):
     authentication_classes=[JWTAuthentication]
     permission_classes=[IsAuthenticated, isProjectManager]
 
+    @transaction.atomic
     def delete(self, request, pk):
         try:
             task = TASK.objects.get(
@@ -49,9 +183,108 @@ class TaskSoftDeleteAPIView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         task.is_deleted = True
-        task.save(update_fields=["is_deleted",])        
+        try:
+            # updated_at is listed so the change reaches list validators
+            task.save(update_fields=["is_deleted", "updated_at"])
+        except StaleVersion as stale:
+            return conflict_response(
+                TaskListSerializer, TASK.objects.filter(is_deleted=False), stale.pks
+            )
 
         return Response(
             {"detail": "Task marked as completed"},
             status=status.HTTP_200_OK
-        )
\ No newline at end of file
+        )
+
+
+# ---------- BOARD (PROJECT MEMBERS) ----------
+
+class TaskBoardAPIView(APIView):
+    """
+    A project's live tasks as one column per status, each in rank order
+    and paginated on its own: ``?status=<STATUS>&cursor=...`` (the
+    column's ``next`` link) returns the following page of one column.
+    """
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, project_id):
+        user_id = request.user.id
+        is_member = PROJECT.objects.filter(pk=project_id).filter(
+            Q(project_manager_id=user_id) |
+            Q(developers=user_id) |
+            Q(qas=user_id)
+        ).exists()
+        if not is_member:
+            raise Http404
+
+        status_param = request.query_params.get("status")
+        if status_param is not None and status_param not in TASK.Status.values:
+            raise ValidationError({"status": [f"Unknown status: {status_param}."]})
+        if status_param is None and "cursor" in request.query_params:
+            raise ValidationError({"status": ["A cursor pages through one column."]})
+        statuses = [status_param] if status_param else TASK.Status.values
+
+        counts = dict(
+            TASK.objects.filter(
+                project_id=project_id, status__in=statuses, is_deleted=False
+            ).order_by().values_list("status").annotate(Count("id"))
+        )
+        columns = [
+            self.column(request, project_id, status, counts.get(status, 0))
+            for status in statuses
+        ]
+        return Response(columns[0] if status_param else columns)
+
+    def column(self, request, project_id, status, count):
+        paginator = RankCursorPagination()
+        rows = paginator.paginate_queryset(
+            TaskBoardLeanSerializer.project(ranking.column(project_id, status)),
+            request, view=self,
+        )
+        # a column's links page through that column alone
+        paginator.base_url = replace_query_param(paginator.base_url, "status", status)
+        return {
+            "status": status,
+            "label": TASK.Status(status).label,
+            "count": count,
+            "tasks": TaskBoardLeanSerializer.serialize(rows),
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
+        }
+
+
+class TaskMoveAPIView(APIView):
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @transaction.atomic
+    def patch(self, request, pk):
+        # like bulk-update: the project manager or the assignee
+        user_id = request.user.id
+        task = TASK.objects.filter(pk=pk, is_deleted=False).filter(
+            Q(project__project_manager_id=user_id) | Q(assignee_id=user_id)
+        ).first()
+        if task is None:
+            return Response(
+                {"detail": "Task not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        serializer = TaskMoveSerializer(task, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            task = serializer.save()
+        except StaleVersion as stale:
+            return conflict_response(
+                TaskListSerializer, TASK.objects.filter(is_deleted=False), stale.pks
+            )
+        except ranking.NoRoom:
+            # until rebalance_ranks renumbers the column
+            return Response(
+                {"detail": "No room left at this position; drop the task elsewhere."},
+                status=status.HTTP_409_CONFLICT
+            )
+        return Response(
+            {"id": task.pk, "status": task.status, "rank": task.rank, "version": task.version},
+            status=status.HTTP_200_OK,
+        )
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Max, Q
+from django.db.models.functions import Length
+
+from tasks.infrastructure import ranking
+from tasks.infrastructure.models.tasks import TASK
+
+
+class Command(BaseCommand):
+    help = (
+        "Respread the board ranks of columns whose ranks grew longer than "
+        "--max-length or that hold unranked or tied tasks. Each column is "
+        "rewritten in its own short transaction; meant to run periodically "
+        "(cron), as moves never renumber a column themselves."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-length", type=int, default=ranking.REBALANCE_LENGTH,
+            help="Rebalance columns with a longer rank.",
+        )
+        parser.add_argument("--all", action="store_true",
+                            help="Rebalance every column, however short its ranks.")
+        parser.add_argument("--batch-size", type=int, default=500,
+                            help="Rows per UPDATE batch.")
+
+    def handle(self, *args, **options):
+        columns = (
+            TASK.objects.filter(is_deleted=False)
+            .order_by("project_id", "status")
+            .values("project_id", "status")
+            .annotate(
+                longest=Max(Length("rank")),
+                unranked=Count("id", filter=Q(rank="")),
+                # concurrent appends can hand out the same rank
+                tied=Count("id") - Count("rank", distinct=True),
+            )
+        )
+        if not options["all"]:
+            columns = columns.filter(
+                Q(longest__gt=options["max_length"]) | Q(unranked__gt=0) | Q(tied__gt=0)
+            )
+
+        rebalanced = tasks = 0
+        for column in list(columns):
+            tasks += ranking.rebalance(
+                column["project_id"], column["status"], batch_size=options["batch_size"]
+            )
+            rebalanced += 1
+        self.stdout.write(f"Rebalanced {rebalanced} columns ({tasks} tasks).")
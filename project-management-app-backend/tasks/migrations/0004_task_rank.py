@@ -0,0 +1,64 @@
+# Generated by Django 6.0.1 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+# frozen copies of tasks.infrastructure.ranking as of this migration
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+REBALANCE_CEILING = "i"
+
+
+def value(rank, width):
+    return int(rank.ljust(width, "0"), BASE) if rank else 0
+
+
+def render(number, width):
+    digits = []
+    for _ in range(width):
+        number, digit = divmod(number, BASE)
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits)).rstrip("0")
+
+
+def spread(low, high, count):
+    width = max(len(low), len(high), 1)
+    while True:
+        start, end = value(low, width), value(high, width)
+        step = (end - start) // (count + 1)
+        if step:
+            return [render(start + step * n, width) for n in range(1, count + 1)]
+        width += 1
+
+
+def rank_existing_tasks(apps, schema_editor):
+    # each column in creation order, the way rebalance_ranks lays it out
+    TASK = apps.get_model("tasks", "TASK")
+    columns = {}
+    for task in TASK.objects.filter(is_deleted=False).order_by("created_at", "id").only(
+        "id", "project_id", "status"
+    ):
+        columns.setdefault((task.project_id, task.status), []).append(task)
+    for tasks in columns.values():
+        for task, rank in zip(tasks, spread("", REBALANCE_CEILING, len(tasks))):
+            task.rank = rank
+        TASK.objects.bulk_update(tasks, ["rank"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_sync_changes_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.RunPython(rank_existing_tasks, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['project', 'status', 'rank', 'id'], name='task_board_idx'),
+        ),
+    ]
@@ -0,0 +1,335 @@
+import re
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db.models import F
+from django.utils import timezone
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from core.infrastructure.models.versioning import StaleVersion
+from core.testing import (
+    LeanParityMixin, ListQueryCountMixin, clear_caches, client_for, make_user,
+)
+from projects.infrastructure.models.projects import PROJECT
+from tasks.infrastructure import ranking
+from tasks.infrastructure.models.tasks import TASK
+from tasks.interface.serializer.serializer import TaskListLeanSerializer, TaskListSerializer
+
+
+class TaskListQueryCountTests(ListQueryCountMixin, TestCase):
+    def setUp(self):
+        self.pm = make_user("pm", "ProjectManager")
+        self.project = PROJECT.objects.create(
+            title="Project", project_code="P", project_description="d", project_manager=self.pm,
+        )
+
+    def add_tasks(self, count):
+        for n in range(count):
+            TASK.objects.create(
+                title=f"Task {n}", project=self.project, created_by=self.pm,
+                assignee=make_user(f"dev-{TASK.objects.count()}", "Developer"),
+            )
+
+    def test_pm_list(self):
+        self.assertListQueriesConstant(client_for(self.pm), "/api/tasks/list/", self.add_tasks)
+
+
+class TaskLeanParityTests(LeanParityMixin, TestCase):
+    def test_same_json(self):
+        pm = make_user("pm", "ProjectManager")
+        project = PROJECT.objects.create(
+            title="Projekt \u00e9", project_code="P", project_description="d", project_manager=pm,
+        )
+        TASK.objects.create(
+            title='Quoted "task"', description="line\nbreak", project=project, created_by=pm,
+            assignee=make_user("dev", "Developer"), due_date="2026-11-01",
+        )
+        # no assignee, and a creator without a role
+        TASK.objects.create(
+            title="Unassigned", project=project,
+            created_by=User.objects.create_user(username="plain"),
+        )
+        self.assertLeanMatches(TaskListLeanSerializer, TaskListSerializer, TASK.objects.all())
+
+
+class TaskPaginationTests(TestCase):
+    def setUp(self):
+        self.pm = make_user("pm", "ProjectManager")
+        self.project = PROJECT.objects.create(
+            title="Project", project_code="P", project_description="d", project_manager=self.pm,
+        )
+        self.tasks = [
+            TASK.objects.create(title=f"Task {n}", project=self.project, created_by=self.pm)
+            for n in range(8)
+        ]
+        self.client = client_for(self.pm)
+
+    def link(self, response, rel):
+        match = re.search(rf'<([^>]+)>; rel="{rel}"', response.get("Link", ""))
+        return match and match.group(1)
+
+    def walk(self, url, next_of, items_of):
+        """Every page from ``url`` on: (ids in order, the last response)."""
+        ids = []
+        while url:
+            clear_caches()
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            ids += [row["id"] for row in items_of(response)]
+            url, last = next_of(response), response
+        return ids, last
+
+    def test_created_at_ties(self):
+        # two runs of equal created_at, straddling the page boundaries
+        now = timezone.now()
+        TASK.objects.filter(pk__in=[t.pk for t in self.tasks[:3]]).update(created_at=now)
+        TASK.objects.filter(pk__in=[t.pk for t in self.tasks[3:]]).update(
+            created_at=now - timezone.timedelta(seconds=1)
+        )
+        expected = [t.pk for t in reversed(self.tasks)]
+        expected = expected[5:] + expected[:5]  # -created_at, then -id
+
+        ids, last = self.walk(
+            "/api/tasks/list/?page_size=3",
+            lambda response: self.link(response, "next"), lambda response: response.json(),
+        )
+        self.assertEqual(ids, expected)
+
+        first_page = self.link(last, "prev")
+        back, _ = self.walk(
+            first_page, lambda response: self.link(response, "prev"),
+            lambda response: reversed(response.json()),
+        )
+        self.assertEqual(back, list(reversed(expected))[len(last.json()):])
+
+    def test_rank_ties(self):
+        # a tie at the top, unranked rows and a tie at the bottom
+        ranks = ["", "", "4", "4", "4", "i", "z", "z"]
+        for task, rank in zip(self.tasks, ranks):
+            TASK.objects.filter(pk=task.pk).update(rank=rank)
+        expected = [t.pk for t in self.tasks]  # (rank, id)
+        status = self.tasks[0].status
+
+        def tasks(response):
+            return response.json()["tasks"]
+
+        ids, last = self.walk(
+            f"/api/tasks/board/{self.project.pk}/?status={status}&page_size=3",
+            lambda response: response.json()["next"], tasks,
+        )
+        self.assertEqual(ids, expected)
+
+        back, _ = self.walk(
+            last.json()["previous"], lambda response: response.json()["previous"],
+            lambda response: reversed(tasks(response)),
+        )
+        self.assertEqual(back, list(reversed(expected))[len(tasks(last)):])
+
+
+class TaskBulkCreateTests(TestCase):
+    def setUp(self):
+        self.pm = make_user("pm", "ProjectManager")
+        self.project = PROJECT.objects.create(
+            title="Project", project_code="P", project_description="d", project_manager=self.pm,
+        )
+        self.other = PROJECT.objects.create(
+            title="Other", project_code="O", project_description="d",
+            project_manager=make_user("other-pm", "ProjectManager"),
+        )
+        self.client = client_for(self.pm)
+
+    def test_errors_aligned_with_items(self):
+        response = self.client.post("/api/tasks/bulk-create/", [
+            {"title": "Fine", "project": self.project.pk},
+            {"project": self.other.pk},
+            {"title": "Bad assignee", "project": self.project.pk, "assignee": self.pm.pk},
+        ], format="json")
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(errors[0], {})
+        # field errors and ownership errors side by side on one item
+        self.assertEqual(set(errors[1]), {"title", "project"})
+        self.assertEqual(set(errors[2]), {"assignee"})
+        self.assertFalse(TASK.objects.exists())
+
+    def test_empty(self):
+        response = self.client.post("/api/tasks/bulk-create/", [], format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class TaskStatusRankTests(TestCase):
+    def setUp(self):
+        self.pm = make_user("pm", "ProjectManager")
+        self.project = PROJECT.objects.create(
+            title="Project", project_code="P", project_description="d", project_manager=self.pm,
+        )
+        self.done = self.add_tasks("DONE", 2)
+        self.backlog = self.add_tasks("BACKLOG", 2)
+        self.client = client_for(self.pm)
+
+    def add_tasks(self, status, count):
+        tasks = [
+            TASK(title=f"{status} {n}", status=status, project=self.project, created_by=self.pm)
+            for n in range(count)
+        ]
+        ranking.append(tasks)
+        for task in tasks:
+            task.save()
+        return tasks
+
+    def done_column(self):
+        return list(ranking.column(self.project.pk, "DONE").order_by("rank", "id"))
+
+    def test_bulk_update(self):
+        first, second = self.backlog
+        response = self.client.patch("/api/tasks/bulk-update/", {
+            str(second.pk): {"version": 1, "status": "DONE"},
+            str(first.pk): {"version": 1, "status": "DONE", "assignee": None},
+        }, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        # below the cards already there, in the order sent
+        self.assertEqual(self.done_column(), [*self.done, second, first])
+
+    def test_edit(self):
+        task = self.backlog[0]
+        response = self.client.patch(
+            f"/api/tasks/{task.pk}/update/", {"version": 1, "status": "DONE"}, format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.done_column(), [*self.done, task])
+
+    def test_created_anywhere_is_ranked(self):
+        task = TASK.objects.create(
+            title="Late", status="DONE", project=self.project, created_by=self.pm,
+        )
+        self.assertEqual(self.done_column(), [*self.done, task])
+
+    def test_same_status_keeps_rank(self):
+        task = self.backlog[1]
+        response = self.client.patch(
+            f"/api/tasks/{task.pk}/update/", {"version": 1, "status": "BACKLOG"}, format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(TASK.objects.get(pk=task.pk).rank, task.rank)
+
+
+class TaskVersionConflictTests(TestCase):
+    def setUp(self):
+        self.pm = make_user("pm", "ProjectManager")
+        self.dev = make_user("dev", "Developer")
+        self.project = PROJECT.objects.create(
+            title="Project", project_code="P", project_description="d", project_manager=self.pm,
+        )
+        self.task = TASK.objects.create(
+            title="Task", project=self.project, created_by=self.pm, assignee=self.dev,
+        )
+        self.client = client_for(self.pm)
+
+    def test_edit(self):
+        response = self.client.patch(
+            f"/api/tasks/{self.task.pk}/update/", {"version": 1, "title": "First"}, format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["version"], 2)
+
+        response = self.client.patch(
+            f"/api/tasks/{self.task.pk}/update/", {"version": 1, "title": "Second"}, format="json",
+        )
+        self.assertEqual(response.status_code, 409)
+        current = response.json()["current"][str(self.task.pk)]
+        self.assertEqual((current["title"], current["version"]), ("First", 2))
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.title, self.task.version), ("First", 2))
+
+    def test_edit_needs_version(self):
+        response = self.client.patch(
+            f"/api/tasks/{self.task.pk}/update/", {"title": "First"}, format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("version", response.json())
+
+    def test_plain_save_is_conditional(self):
+        first, second = TASK.objects.get(pk=self.task.pk), TASK.objects.get(pk=self.task.pk)
+        first.title = "First"
+        first.save()
+        second.title = "Second"
+        with self.assertRaises(StaleVersion):
+            second.save(update_fields=["title"])
+        self.assertEqual(second.version, 1)
+        self.assertEqual(TASK.objects.get(pk=self.task.pk).title, "First")
+
+    def test_soft_delete(self):
+        with mock.patch.object(TASK.objects, "get", side_effect=self.stale_get):
+            response = self.client.delete(f"/api/tasks/{self.task.pk}/delete/")
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(TASK.objects.get(pk=self.task.pk).is_deleted)
+
+    def stale_get(self, **kwargs):
+        # loaded, then written by someone else before the delete saves
+        task = TASK.objects.filter(**kwargs).get()
+        TASK.objects.filter(pk=task.pk).update(version=F("version") + 1)
+        return task
+
+    def test_bulk_update(self):
+        other = TASK.objects.create(title="Other", project=self.project, created_by=self.pm)
+        TASK.objects.filter(pk=other.pk).update(version=3)
+        response = self.client.patch("/api/tasks/bulk-update/", {
+            str(self.task.pk): {"version": 1, "status": "DONE"},
+            str(other.pk): {"version": 2, "status": "DONE"},
+        }, format="json")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(list(response.json()["current"]), [str(other.pk)])
+        # all or nothing: the current task was not written either
+        self.assertEqual(
+            set(TASK.objects.values_list("status", "version")),
+            {("BACKLOG", 1), ("BACKLOG", 3)},
+        )
+
+    def test_move(self):
+        response = self.client.patch(
+            f"/api/tasks/{self.task.pk}/move/",
+            {"version": 2, "status": "DONE", "after": None}, format="json",
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(TASK.objects.get(pk=self.task.pk).status, "BACKLOG")
+
+    def test_move_never_renumbers_column(self):
+        done = [
+            TASK.objects.create(title=f"Done {n}", project=self.project, created_by=self.pm,
+                                status="DONE")
+            for n in range(2)
+        ]
+        # tied (unranked) cards leave no gap; rebalance_ranks fixes them later
+        TASK.objects.filter(pk__in=[task.pk for task in done]).update(rank="")
+        response = self.client.patch(
+            f"/api/tasks/{self.task.pk}/move/",
+            {"version": 1, "status": "DONE", "after": None}, format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertGreater(response.json()["rank"], "")
+        self.assertEqual(
+            list(TASK.objects.filter(pk__in=[task.pk for task in done])
+                 .values_list("rank", flat=True)),
+            ["", ""],
+        )
+
+        call_command("rebalance_ranks", stdout=StringIO())
+        self.assertNotIn("", TASK.objects.values_list("rank", flat=True))
+
+    def test_move_without_room(self):
+        above = TASK.objects.create(title="Above", project=self.project, created_by=self.pm,
+                                    status="DONE")
+        below = TASK.objects.create(title="Below", project=self.project, created_by=self.pm,
+                                    status="DONE")
+        # adjacent at the longest rank the column can store
+        TASK.objects.filter(pk=above.pk).update(rank="h" * 64)
+        TASK.objects.filter(pk=below.pk).update(rank="h" * 63 + "i")
+        response = self.client.patch(
+            f"/api/tasks/{self.task.pk}/move/",
+            {"version": 1, "status": "DONE", "after": above.pk}, format="json",
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(TASK.objects.get(pk=self.task.pk).status, "BACKLOG")
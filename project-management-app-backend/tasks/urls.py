@@ -1,8 +1,27 @@
+from django.conf import settings
 from django.urls import path
-from .interface.views.view import TaskCreateAPIView, PMTaskListAPIView, TaskSoftDeleteAPIView
+from .interface.views.view import (
+    TaskCreateAPIView,
+    TaskBulkCreateAPIView,
+    TaskBulkUpdateAPIView,
+    TaskUpdateAPIView,
+    PMTaskListAPIView,
+    AsyncPMTaskListAPIView,
+    TaskSoftDeleteAPIView,
+    TaskBoardAPIView,
+    TaskMoveAPIView,
+)
+
+if settings.ASYNC_LIST_VIEWS:
+    PMTaskListAPIView = AsyncPMTaskListAPIView
 
 urlpatterns = [
     path("create/", TaskCreateAPIView.as_view()),
+    path("bulk-create/", TaskBulkCreateAPIView.as_view()),
+    path("bulk-update/", TaskBulkUpdateAPIView.as_view()),
     path("list/", PMTaskListAPIView.as_view()),
-    path("<int:pk>/delete/", TaskSoftDeleteAPIView.as_view())
+    path("<int:pk>/update/", TaskUpdateAPIView.as_view()),
+    path("<int:pk>/delete/", TaskSoftDeleteAPIView.as_view()),
+    path("<int:pk>/move/", TaskMoveAPIView.as_view()),
+    path("board/<int:project_id>/", TaskBoardAPIView.as_view()),
 ]
@@ -0,0 +1,35 @@
+from django.contrib.auth.models import Group
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from permissions.permissions import ROLES_CLAIM
+
+
+def role_names(user_id):
+    return sorted(
+        Group.objects.filter(user__id=user_id).values_list("name", flat=True)
+    )
+
+
+class RoleRefreshToken(RefreshToken):
+    """
+    Refresh token whose access tokens embed the user's group names.
+
+    Roles are re-read each time an access token is minted, so a refresh
+    always picks up the current membership.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token["username"] = user.get_username()
+        token[ROLES_CLAIM] = role_names(user.pk)
+        return token
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        user_id = self.payload.get(jwt_settings.USER_ID_CLAIM)
+        if user_id is not None:
+            access[ROLES_CLAIM] = role_names(user_id)
+        return access
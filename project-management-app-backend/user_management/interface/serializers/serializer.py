@@ -1,5 +1,10 @@
 from django.contrib.auth.models import User, Group
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer, TokenRefreshSerializer
+)
+from core.metrics import TimedSerializerMixin
+from ...infrastructure.tokens import RoleRefreshToken
 
 
 class RegisterSerializer(serializers.Serializer):
@@ -19,7 +24,7 @@ class RegisterSerializer(serializers.Serializer):
         name = validated_data.pop("name")
         user = User.objects.create_user(
             username=validated_data["username"],
-            email=validated_data["email"],
+            email=validated_data.get("email", ""),
             password=validated_data["password"],
         )
         user.first_name = name
@@ -29,7 +34,7 @@ class RegisterSerializer(serializers.Serializer):
         return user
     
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     role = serializers.SerializerMethodField()
     # name is not the part of user model, must explicitly tell where it comes from
     name = serializers.SerializerMethodField(source="first_name")
@@ -44,3 +49,10 @@ class UserSerializer(serializers.ModelSerializer):
         group = obj.groups.first()
         return group.name if group else None
 
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    # access token carries the "roles" claim read by permissions.permissions
+    token_class = RoleRefreshToken
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RoleRefreshToken
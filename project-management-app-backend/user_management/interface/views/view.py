@@ -3,6 +3,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework import status
 from django.contrib.auth.models import User
+from django.db import transaction
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from permissions.permissions import isProjectManager
 from ..serializers.serializer import RegisterSerializer, UserSerializer
@@ -11,6 +12,7 @@ from ..serializers.serializer import RegisterSerializer, UserSerializer
 class RegisterAPIView(APIView):
     permission_classes = [AllowAny]
 
+    @transaction.atomic
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
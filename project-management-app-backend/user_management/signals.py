@@ -0,0 +1,42 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from permissions.permissions import current_roles_key, role_cache
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def refresh_cached_roles(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Cache the new roles of every user whose groups changed, so permission
+    checks stop trusting the "roles" claim of tokens issued earlier. The
+    entry only has to outlive the access tokens it overrides.
+    """
+    if reverse and action == "pre_clear":
+        # group.user_set.clear() does not report which users it removes
+        instance._cleared_user_ids = list(
+            instance.user_set.values_list("pk", flat=True)
+        )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        user_ids = [instance.pk]
+    elif action == "post_clear":
+        user_ids = instance.__dict__.pop("_cleared_user_ids", [])
+    else:
+        user_ids = list(pk_set)
+
+    roles = {user_id: [] for user_id in user_ids}
+    memberships = sender.objects.filter(
+        user_id__in=user_ids
+    ).values_list("user_id", "group__name").order_by("group__name")
+    for user_id, name in memberships:
+        roles[user_id].append(name)
+
+    role_cache().set_many(
+        {current_roles_key(user_id): names for user_id, names in roles.items()},
+        timeout=jwt_settings.ACCESS_TOKEN_LIFETIME.total_seconds(),
+    )
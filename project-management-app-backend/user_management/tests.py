@@ -0,0 +1,101 @@
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from authentication.authentication import StatelessJWTAuthentication
+from core.testing import clear_caches, client_for, make_user
+from permissions.permissions import (
+    ROLE_CACHE, claims_trusted, isProjectManager, isQA, role_cache,
+)
+from user_management.infrastructure.tokens import RoleRefreshToken
+
+
+class RoleRevocationTests(TestCase):
+    """Removing a user's group locks them out at once, token or not."""
+
+    def setUp(self):
+        clear_caches()
+        self.pm = make_user("pm", "ProjectManager")
+        # issued while the user was still a project manager
+        self.client = client_for(self.pm)
+
+    def revoke(self):
+        self.assertEqual(self.client.get("/api/projects/pm/").status_code, 200)
+        self.pm.groups.remove(Group.objects.get(name="ProjectManager"))
+
+    def test_process_local_role_cache_fails_closed(self):
+        local = {
+            ROLE_CACHE: {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        }
+        with self.settings(CACHES={**settings.CACHES, **local}):
+            self.assertFalse(claims_trusted())
+            self.revoke()
+            # another worker never saw the change: nothing cached there
+            role_cache().clear()
+            self.assertEqual(self.client.get("/api/projects/pm/").status_code, 403)
+
+    def test_shared_role_cache(self):
+        # the default "roles" cache is file-based, shared by the workers
+        self.assertTrue(claims_trusted())
+        self.revoke()
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/projects/pm/")
+        self.assertEqual(response.status_code, 403)
+
+
+class RoleClaimTests(TestCase):
+    def test_role_check_needs_no_query(self):
+        clear_caches()
+        pm = make_user("pm", "ProjectManager")
+        token = RoleRefreshToken.for_user(pm).access_token
+        request = Request(
+            APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}"),
+            authenticators=[StatelessJWTAuthentication()],
+        )
+        with self.assertNumQueries(0):
+            self.assertTrue(isProjectManager().has_permission(request, None))
+            self.assertFalse(isQA().has_permission(request, None))
+
+
+class LazyUserTests(TestCase):
+    """An authenticated request reads the user row only when it needs it."""
+
+    def setUp(self):
+        clear_caches()
+        self.pm = make_user("pm", "ProjectManager")
+
+    def user_queries(self, queries):
+        return [q["sql"] for q in queries.captured_queries if 'FROM "auth_user"' in q["sql"]]
+
+    def test_claims_need_no_query(self):
+        token = RoleRefreshToken.for_user(self.pm).access_token
+        request = Request(
+            APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}"),
+            authenticators=[StatelessJWTAuthentication()],
+        )
+        with self.assertNumQueries(0):
+            user = request.user
+            self.assertEqual(user.id, self.pm.id)
+            self.assertEqual(user.username, "pm")
+            self.assertEqual(user.roles, ["ProjectManager"])
+            self.assertTrue(user.is_authenticated)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(user.first_name, "pm")
+            self.assertFalse(user.is_staff)
+        self.assertEqual(len(self.user_queries(queries)), 1)
+
+    def test_list_request_reads_no_user_row(self):
+        client = client_for(self.pm)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(client.get("/api/tasks/list/").status_code, 200)
+        self.assertEqual(self.user_queries(queries), [])
+
+        # a view reading the profile does load it
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(client.get("/api/users/me/").status_code, 200)
+        self.assertTrue(self.user_queries(queries))